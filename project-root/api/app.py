@@ -2,103 +2,421 @@
 
 import os
 import json
-import shutil
-import uuid
+import time
+import asyncio
 import io
+import zipfile
+from collections import Counter
 import numpy as np
-import tensorflow as tf
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, File, UploadFile
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from typing import List
 from tempfile import NamedTemporaryFile
-from PIL import Image
 
-from src.config import IMG_SIZE
-from src.model import build_base_model, build_classification_model
+from src.config import (
+    IMG_SIZE,
+    MODEL_PATH,
+    STUDENT_MODEL_PATH,
+    MODEL_VARIANT,
+    MAX_BATCH_SIZE,
+    MAX_BATCH_WAIT_MS,
+    INFERENCE_THREADS,
+    PDF_EXECUTOR,
+    PDF_WORKERS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_IMAGES_PER_BATCH,
+    MAX_ZIP_ENTRY_BYTES,
+    INFERENCE_BACKEND,
+    TFLITE_MODEL_PATH,
+    TFLITE_THREADS,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL,
+    PREDICTION_CACHE_DB,
+    PDF_CACHE_DIR,
+    PDF_CACHE_MAX_MB,
+    PDF_CACHE_MAX_AGE,
+    PDF_CACHE_JANITOR_INTERVAL
+)
+from src.batching import BatchScheduler
+from src.executors import ExecutorLayer, ConcurrencyLimiter, ServerBusyError
+from src.image_decode import decode_pixels, store_pixels, allocate_batch
+from src.metrics import (
+    MetricsRegistry,
+    MetricsMiddleware,
+    CONTENT_TYPE,
+    SIZE_BUCKETS,
+    BATCH_SIZE_BUCKETS
+)
+from src.prediction_cache import PredictionCache, SQLiteCacheBackend, make_cache_key
 from src.disease_guide_hi import get_disease_guide_hindi
-from src.report_generator import generate_disease_report_pdf
+from src.report_generator import render_report_pdf
+from src.pdf_cache import PDFDiskCache, run_janitor
 
 # --------------------------------------------------
-# FastAPI App Initialization
+# Paths
 # --------------------------------------------------
 
-app = FastAPI(
-    title="Cotton Plant Disease Detection API",
-    description="Deep Learning based Cotton Plant Disease Classification using MobileNetV2",
-    version="2.0.0"
+MODEL_WEIGHTS_PATH = "artifacts/cotton_disease_finetuned.weights.h5"
+CLASS_NAMES_PATH = "artifacts/class_names.json"
+
+# --------------------------------------------------
+# Model state (filled in by the lifespan hook)
+# --------------------------------------------------
+
+inference_model = None
+class_names = []
+NUM_CLASSES = 0
+model_status = {
+    "state": "loading",
+    "error": None,
+    "load_seconds": None,
+    "model_version": None
+}
+
+# --------------------------------------------------
+# Build & load model (backend selected by INFERENCE_BACKEND)
+# --------------------------------------------------
+
+def load_class_names():
+    with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_inference_model():
+    """
+    Returns (inference_model, class_names, model_version); the model is
+    already warmed up.
+    """
+    if INFERENCE_BACKEND == "tflite":
+        # TensorFlow itself is never imported when LiteRT is installed
+        from src.tflite_inference import TFLiteInferenceModel
+        artifact_path = TFLITE_MODEL_PATH
+        loaded = TFLiteInferenceModel(artifact_path, num_threads=TFLITE_THREADS)
+        names = load_class_names()
+
+    elif INFERENCE_BACKEND == "keras":
+        from src.inference import InferenceModel, load_classifier
+
+        if MODEL_VARIANT == "student":
+            # Smaller distilled model; its input size comes from the graph
+            artifact_path = STUDENT_MODEL_PATH
+            model, names = load_classifier(artifact_path)
+        elif os.path.exists(MODEL_PATH):
+            artifact_path = MODEL_PATH
+            model, names = load_classifier(artifact_path)
+        else:
+            # Legacy weights-only artifact: rebuild the graph, skipping
+            # the ImageNet download since every weight is overwritten
+            from src.model import build_base_model, build_classification_model
+
+            artifact_path = MODEL_WEIGHTS_PATH
+            names = load_class_names()
+            model = build_classification_model(
+                img_size=IMG_SIZE,
+                num_classes=len(names),
+                base_model=build_base_model(IMG_SIZE, weights=None),
+                data_augmentation=None
+            )
+            model.load_weights(artifact_path)
+
+        # Traced forward pass (replaces model.predict)
+        loaded = InferenceModel(model)
+
+    else:
+        raise ValueError(f"Unknown INFERENCE_BACKEND: {INFERENCE_BACKEND}")
+
+    loaded.warmup()
+
+    # Cached predictions are only valid for the exact artifact
+    model_version = (
+        f"{INFERENCE_BACKEND}:{os.path.basename(artifact_path)}:"
+        f"{int(os.path.getmtime(artifact_path))}"
+    )
+    return loaded, names, model_version
+
+
+async def load_model_in_background():
+    global inference_model, class_names, NUM_CLASSES
+
+    start = time.perf_counter()
+    try:
+        loaded, names, model_version = await executors.run_inference(
+            load_inference_model
+        )
+    except Exception as e:
+        model_status.update(state="failed", error=str(e))
+        return
+
+    class_names = names
+    NUM_CLASSES = len(names)
+    inference_model = loaded
+    model_status.update(
+        state="ready",
+        model_version=model_version,
+        load_seconds=round(time.perf_counter() - start, 3)
+    )
+
+
+def predict_batch(images: np.ndarray) -> np.ndarray:
+    batch_size_histogram.observe(len(images))
+    with stage_seconds.time("inference"):
+        return inference_model.predict_batch(images)
+
+# --------------------------------------------------
+# Executors & concurrency limit (keep CPU work off the event loop)
+# --------------------------------------------------
+
+executors = ExecutorLayer(
+    inference_workers=INFERENCE_THREADS,
+    pdf_kind=PDF_EXECUTOR,
+    pdf_workers=PDF_WORKERS
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+request_limiter = ConcurrencyLimiter(MAX_CONCURRENT_REQUESTS)
+
+
+def server_busy_response():
+    request_errors.inc("busy")
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "1"},
+        content={"error": "सर्वर व्यस्त है। कृपया कुछ देर बाद पुनः प्रयास करें।"}
+    )
+
+
+def model_not_ready_response():
+    request_errors.inc("model_not_ready")
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": "5"},
+        content={"error": "मॉडल लोड हो रहा है। कृपया कुछ देर बाद पुनः प्रयास करें।"}
+    )
+
+# --------------------------------------------------
+# Prediction cache (re-uploads and /export/pdf skip decode + inference)
+# --------------------------------------------------
+
+prediction_cache = PredictionCache(
+    max_entries=PREDICTION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL,
+    backend=SQLiteCacheBackend(PREDICTION_CACHE_DB) if PREDICTION_CACHE_DB else None
 )
 
 # --------------------------------------------------
-# Paths
+# PDF report cache (optional, bounded; reports are otherwise rendered
+# in memory and never touch the disk)
 # --------------------------------------------------
 
-MODEL_WEIGHTS_PATH = "artifacts/cotton_disease_finetuned.weights.h5"
-CLASS_NAMES_PATH = "artifacts/class_names.json"
-TEMP_REPORT_DIR = "temp_reports"
+pdf_cache = (
+    PDFDiskCache(
+        PDF_CACHE_DIR,
+        max_bytes=int(PDF_CACHE_MAX_MB * 1024 * 1024),
+        max_age_seconds=PDF_CACHE_MAX_AGE
+    )
+    if PDF_CACHE_DIR else None
+)
+
+# --------------------------------------------------
+# Metrics (Prometheus text format on /metrics)
+# --------------------------------------------------
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "cotton_http_requests_total",
+    "HTTP requests by method, route and status code.",
+    ("method", "route", "status")
+)
+http_latency = metrics.histogram(
+    "cotton_http_request_duration_seconds",
+    "End-to-end request latency.",
+    labelnames=("method", "route")
+)
+requests_in_flight = metrics.gauge(
+    "cotton_http_requests_in_flight",
+    "Requests currently being handled."
+)
+request_errors = metrics.counter(
+    "cotton_request_errors_total",
+    "Rejected or failed requests by reason.",
+    ("reason",)
+)
+upload_bytes = metrics.histogram(
+    "cotton_upload_bytes",
+    "Size of uploaded files.",
+    buckets=SIZE_BUCKETS,
+    labelnames=("endpoint",)
+)
+stage_seconds = metrics.histogram(
+    "cotton_stage_duration_seconds",
+    "Time per processing stage (read, decode, preprocess, inference, "
+    "guide_lookup, pdf_render).",
+    labelnames=("stage",)
+)
+batch_size_histogram = metrics.histogram(
+    "cotton_inference_batch_size",
+    "Images per forward pass.",
+    buckets=BATCH_SIZE_BUCKETS
+)
+cache_lookups = metrics.gauge(
+    "cotton_prediction_cache_lookups",
+    "Prediction cache lookups since startup by result.",
+    ("result",)
+)
+cache_hit_ratio = metrics.gauge(
+    "cotton_prediction_cache_hit_ratio",
+    "Prediction cache hits / lookups since startup."
+)
+cache_entries = metrics.gauge(
+    "cotton_prediction_cache_entries",
+    "Entries in the in-memory prediction cache."
+)
+model_ready = metrics.gauge(
+    "cotton_model_ready",
+    "1 once the model is loaded and warmed up."
+)
+pdf_cache_bytes = metrics.gauge(
+    "cotton_pdf_cache_bytes",
+    "Bytes of rendered PDF reports kept on disk."
+)
+pdf_cache_evictions = metrics.gauge(
+    "cotton_pdf_cache_evictions",
+    "PDF reports removed from disk by the size/age limits."
+)
+
+
+def collect_state_metrics():
+    # Refreshed on scrape, so the hot path never touches these gauges
+    stats = prediction_cache.stats()
+    cache_lookups.set(stats["hits"], "hit")
+    cache_lookups.set(stats["misses"], "miss")
+    cache_hit_ratio.set(stats["hit_ratio"])
+    cache_entries.set(stats["entries"])
+    model_ready.set(1 if model_status["state"] == "ready" else 0)
+    if pdf_cache:
+        stats = pdf_cache.stats()
+        pdf_cache_bytes.set(stats["bytes"])
+        pdf_cache_evictions.set(stats["evictions"])
 
-os.makedirs(TEMP_REPORT_DIR, exist_ok=True)
+
+metrics.add_collector(collect_state_metrics)
 
 # --------------------------------------------------
-# Load class names
+# Micro-batching (concurrent requests share one forward pass)
 # --------------------------------------------------
 
-with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
-    class_names = json.load(f)
+batch_scheduler = BatchScheduler(
+    predict_batch,
+    max_batch_size=MAX_BATCH_SIZE,
+    max_wait_ms=MAX_BATCH_WAIT_MS,
+    executor=executors.inference
+)
+
+# --------------------------------------------------
+# Lifespan: load the model without blocking startup
+# --------------------------------------------------
 
-NUM_CLASSES = len(class_names)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The server accepts connections (and answers "/") while the model
+    # loads; "/ready" reports when predictions can be served.
+    loader = asyncio.create_task(load_model_in_background())
+    janitor = (
+        asyncio.create_task(run_janitor(pdf_cache, PDF_CACHE_JANITOR_INTERVAL))
+        if pdf_cache else None
+    )
+    yield
+    loader.cancel()
+    if janitor:
+        janitor.cancel()
+    await batch_scheduler.stop()
+    executors.shutdown(wait=False)
+    prediction_cache.close()
 
 # --------------------------------------------------
-# Build & load model
+# FastAPI App Initialization
 # --------------------------------------------------
 
-base_model = build_base_model(IMG_SIZE)
+app = FastAPI(
+    title="Cotton Plant Disease Detection API",
+    description="Deep Learning based Cotton Plant Disease Classification using MobileNetV2",
+    version="2.0.0",
+    lifespan=lifespan
+)
 
-model = build_classification_model(
-    img_size=IMG_SIZE,
-    num_classes=NUM_CLASSES,
-    base_model=base_model,
-    data_augmentation=None
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
 )
 
-model.load_weights(MODEL_WEIGHTS_PATH)
+app.add_middleware(
+    MetricsMiddleware,
+    requests=http_requests,
+    latency=http_latency,
+    in_flight=requests_in_flight
+)
 
 # --------------------------------------------------
 # Image preprocessing (UPDATED)
 # --------------------------------------------------
 
-def preprocess_image(image_bytes: bytes):
-    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    image = image.resize((IMG_SIZE, IMG_SIZE))
-    img_array = np.array(image).astype("float32")
+def decode_into(image_bytes: bytes, img_size: int, out: np.ndarray):
+    # Shared decoder (src.image_decode): draft-mode JPEG decode + EXIF
+    # orientation, normalized in place unless the model takes uint8
+    with stage_seconds.time("decode"):
+        pixels = decode_pixels(image_bytes, img_size)
+    with stage_seconds.time("preprocess"):
+        return store_pixels(pixels, out)
 
-    # Same normalization used in training
-    img_array = img_array / 127.5 - 1.0
 
-    return np.expand_dims(img_array, axis=0)
+def preprocess_image(
+    image_bytes: bytes,
+    img_size: int = IMG_SIZE,
+    dtype=np.float32
+):
+    batch = allocate_batch(1, img_size, dtype)
+    decode_into(image_bytes, img_size, batch[0])
+    return batch
 
 # --------------------------------------------------
 # Core prediction logic (shared)
 # --------------------------------------------------
 
-def predict_from_bytes(image_bytes: bytes):
-    img = preprocess_image(image_bytes)
+async def predict_from_bytes(image_bytes: bytes):
+    cache_key = make_cache_key(image_bytes, model_status["model_version"])
+    # SQLite-backed lookups (and writes) stay off the event loop
+    cached = await asyncio.to_thread(prediction_cache.get, cache_key)
+    if cached is not None:
+        return cached
+
+    img = await executors.run_inference(
+        preprocess_image,
+        image_bytes,
+        inference_model.img_size,
+        inference_model.input_dtype
+    )
+
+    preds = await batch_scheduler.submit(img[0])
+    result = build_prediction_result(preds)
+
+    await asyncio.to_thread(prediction_cache.set, cache_key, result)
+    return result
 
-    preds = model.predict(img, verbose=0)[0]
+
+def build_prediction_result(preds: np.ndarray):
     top_idx = int(np.argmax(preds))
 
     confidence = float(preds[top_idx])
     predicted_class = class_names[top_idx]
 
-    guide_hi = get_disease_guide_hindi(predicted_class)
+    with stage_seconds.time("guide_lookup"):
+        guide_hi = get_disease_guide_hindi(predicted_class)
 
     return {
         "disease": predicted_class,
@@ -111,18 +429,48 @@ def predict_from_bytes(image_bytes: bytes):
         }
     }
 
+
+def add_confidence_warning(result: dict):
+    if result["confidence"] < 60:
+        result["warning"] = "कम विश्वसनीयता: कृपया कृषि विशेषज्ञ से सलाह लें।"
+    else:
+        result["warning"] = None
+    return result
+
 # --------------------------------------------------
 # Health check
 # --------------------------------------------------
 
 @app.get("/")
 def health_check():
+    # Liveness: answers as soon as the process is up
     return {
         "status": "API is running",
+        "model_state": model_status["state"],
         "num_classes": NUM_CLASSES,
         "classes": class_names
     }
 
+
+@app.get("/ready")
+def readiness_check():
+    # Readiness: 200 only once the model is loaded and warmed up
+    status_code = 200 if model_status["state"] == "ready" else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "backend": INFERENCE_BACKEND,
+            **model_status,
+            "cache": prediction_cache.stats(),
+            "pdf_cache": pdf_cache.stats() if pdf_cache else None
+        }
+    )
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
 # --------------------------------------------------
 # 🔥 MAIN ENDPOINT FOR MOBILE APP
 # --------------------------------------------------
@@ -131,23 +479,30 @@ def health_check():
 async def detect_disease(image: UploadFile = File(...)):
 
     if image.content_type not in ["image/jpeg", "image/png", "image/jpg"]:
+        request_errors.inc("invalid_input")
         return JSONResponse(
             status_code=400,
             content={"error": "Invalid image type. JPG या PNG छवि अपलोड करें।"}
         )
 
+    if inference_model is None:
+        return model_not_ready_response()
+
     try:
-        image_bytes = await image.read()
-        result = predict_from_bytes(image_bytes)
+        with stage_seconds.time("read"):
+            image_bytes = await image.read()
+        upload_bytes.observe(len(image_bytes), "detect")
 
-        if result["confidence"] < 60:
-            result["warning"] = "कम विश्वसनीयता: कृपया कृषि विशेषज्ञ से सलाह लें।"
-        else:
-            result["warning"] = None
+        with request_limiter:
+            result = await predict_from_bytes(image_bytes)
 
-        return result
+        return add_confidence_warning(result)
+
+    except ServerBusyError:
+        return server_busy_response()
 
     except Exception as e:
+        request_errors.inc("internal")
         return JSONResponse(
             status_code=500,
             content={
@@ -156,6 +511,223 @@ async def detect_disease(image: UploadFile = File(...)):
             }
         )
 
+# --------------------------------------------------
+# Batch detection (many photos from one plot)
+# --------------------------------------------------
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def read_zip_images(archive_bytes: bytes):
+    """
+    Returns [(filename, bytes)] for the image entries of a zip archive.
+    """
+    images = []
+
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+        for entry in archive.infolist():
+            name = entry.filename
+            if (
+                entry.is_dir()
+                or name.startswith("__MACOSX/")
+                or not name.lower().endswith(IMAGE_EXTENSIONS)
+            ):
+                continue
+
+            if entry.file_size > MAX_ZIP_ENTRY_BYTES:
+                raise ValueError(f"{name} is larger than {MAX_ZIP_ENTRY_BYTES} bytes")
+
+            if len(images) >= MAX_IMAGES_PER_BATCH:
+                raise ValueError(f"Archive has more than {MAX_IMAGES_PER_BATCH} images")
+
+            images.append((name, archive.read(entry)))
+
+    return images
+
+
+def aggregate_plot_results(results: list):
+    """
+    Plot-level summary over the successfully classified images.
+    """
+    ok = [r for r in results if "error" not in r]
+    if not ok:
+        return None
+
+    counts = Counter(r["disease"] for r in ok)
+    majority_disease, majority_count = counts.most_common(1)[0]
+    guide_hi = get_disease_guide_hindi(majority_disease)
+
+    return {
+        "majority_disease": majority_disease,
+        "majority_disease_hi": guide_hi["disease_name_hi"],
+        "majority_fraction": round(majority_count / len(ok), 3),
+        "mean_confidence": round(float(np.mean([r["confidence"] for r in ok])), 2),
+        "disease_counts": dict(counts),
+        "num_images": len(results),
+        "num_failed": len(results) - len(ok)
+    }
+
+
+async def predict_many(named_images: list):
+    """
+    Decodes all uncached images in parallel, then classifies them with
+    batched forward passes. Undecodable images are reported per image.
+    """
+    results = [None] * len(named_images)
+    cache_keys = [
+        make_cache_key(image_bytes, model_status["model_version"])
+        for _, image_bytes in named_images
+    ]
+
+    # One thread hop for all lookups (SQLite-backed when configured)
+    cached_results = await asyncio.to_thread(
+        lambda: [prediction_cache.get(key) for key in cache_keys]
+    )
+
+    pending = []
+    for i, (name, _) in enumerate(named_images):
+        cached = cached_results[i]
+        if cached is not None:
+            results[i] = {"filename": name, **add_confidence_warning(cached)}
+        else:
+            pending.append(i)
+
+    # Every image is decoded straight into its row of one batch buffer
+    batch = allocate_batch(
+        len(pending), inference_model.img_size, inference_model.input_dtype
+    )
+    decoded = await asyncio.gather(
+        *(
+            executors.run_inference(
+                decode_into,
+                named_images[i][1],
+                inference_model.img_size,
+                batch[row]
+            )
+            for row, i in enumerate(pending)
+        ),
+        return_exceptions=True
+    )
+
+    valid, valid_rows = [], []
+    for row, (i, img) in enumerate(zip(pending, decoded)):
+        if isinstance(img, Exception):
+            results[i] = {
+                "filename": named_images[i][0],
+                "error": f"छवि पढ़ी नहीं जा सकी: {img}"
+            }
+        else:
+            valid.append(i)
+            valid_rows.append(row)
+
+    if valid:
+        if len(valid_rows) < len(batch):
+            batch = batch[valid_rows]
+        preds = await executors.run_inference(predict_batch, batch)
+
+        new_entries = []
+        for i, pred in zip(valid, preds):
+            result = build_prediction_result(pred)
+            new_entries.append((cache_keys[i], result))
+            results[i] = {
+                "filename": named_images[i][0],
+                **add_confidence_warning(dict(result))
+            }
+
+        await asyncio.to_thread(
+            lambda: [prediction_cache.set(key, result) for key, result in new_entries]
+        )
+
+    return {"results": results, "plot_summary": aggregate_plot_results(results)}
+
+
+def batch_error_response(status_code: int, message: str, debug_message=None):
+    request_errors.inc("internal" if status_code >= 500 else "invalid_input")
+    content = {"error": message}
+    if debug_message is not None:
+        content["debug_message"] = debug_message
+    return JSONResponse(status_code=status_code, content=content)
+
+
+@app.post("/detect/batch")
+async def detect_disease_batch(images: List[UploadFile] = File(...)):
+
+    if len(images) > MAX_IMAGES_PER_BATCH:
+        return batch_error_response(
+            413, f"एक बार में अधिकतम {MAX_IMAGES_PER_BATCH} छवियाँ अपलोड करें।"
+        )
+
+    if any(
+        image.content_type not in ["image/jpeg", "image/png", "image/jpg"]
+        for image in images
+    ):
+        return batch_error_response(
+            400, "Invalid image type. JPG या PNG छवि अपलोड करें।"
+        )
+
+    if inference_model is None:
+        return model_not_ready_response()
+
+    try:
+        with stage_seconds.time("read"):
+            named_images = [(image.filename, await image.read()) for image in images]
+        for _, image_bytes in named_images:
+            upload_bytes.observe(len(image_bytes), "detect_batch")
+
+        with request_limiter:
+            return await predict_many(named_images)
+
+    except ServerBusyError:
+        return server_busy_response()
+
+    except Exception as e:
+        return batch_error_response(500, "छवियों को संसाधित करने में समस्या आई।", str(e))
+
+
+ZIP_CONTENT_TYPES = [
+    "application/zip",
+    "application/x-zip-compressed",
+    "application/x-zip",
+    "multipart/x-zip",
+]
+
+
+@app.post("/detect/batch/zip")
+async def detect_disease_zip(archive: UploadFile = File(...)):
+
+    # Generic uploads (e.g. curl's default) are accepted by extension only
+    if archive.content_type not in ZIP_CONTENT_TYPES and not (
+        archive.content_type == "application/octet-stream"
+        and (archive.filename or "").lower().endswith(".zip")
+    ):
+        return batch_error_response(400, "Invalid file type. ZIP फ़ाइल अपलोड करें।")
+
+    if inference_model is None:
+        return model_not_ready_response()
+
+    try:
+        # Reading and decompressing the archive are the expensive part,
+        # so they count against the limit too
+        with request_limiter:
+            try:
+                with stage_seconds.time("read"):
+                    archive_bytes = await archive.read()
+                upload_bytes.observe(len(archive_bytes), "detect_batch_zip")
+                named_images = await executors.run_inference(read_zip_images, archive_bytes)
+            except (zipfile.BadZipFile, ValueError) as e:
+                return batch_error_response(400, "अमान्य ZIP फ़ाइल।", str(e))
+
+            if not named_images:
+                return batch_error_response(400, "ZIP में कोई JPG या PNG छवि नहीं मिली।")
+
+            return await predict_many(named_images)
+
+    except ServerBusyError:
+        return server_busy_response()
+
+    except Exception as e:
+        return batch_error_response(500, "छवियों को संसाधित करने में समस्या आई।", str(e))
+
 # --------------------------------------------------
 # Prediction (legacy / web)
 # --------------------------------------------------
@@ -172,34 +744,54 @@ async def predict(file: UploadFile = File(...)):
 async def export_pdf(file: UploadFile = File(...)):
 
     if file.content_type not in ["image/jpeg", "image/png", "image/jpg"]:
+        request_errors.inc("invalid_input")
         return JSONResponse(
             status_code=400,
             content={"error": "Invalid image type. JPG या PNG छवि अपलोड करें।"}
         )
 
-    try:
-        image_bytes = await file.read()
-        result = predict_from_bytes(image_bytes)
-
-        pdf_path = os.path.join(
-            TEMP_REPORT_DIR,
-            f"cotton_disease_report_{uuid.uuid4().hex}.pdf"
-        )
-
-        generate_disease_report_pdf(
-            file_path=pdf_path,
-            predicted_class=result["disease"],
-            confidence=result["confidence"],
-            disease_info_hi=result["disease_info_hi"]
-        )
+    if inference_model is None:
+        return model_not_ready_response()
 
-        return FileResponse(
-            path=pdf_path,
+    try:
+        with stage_seconds.time("read"):
+            image_bytes = await file.read()
+        upload_bytes.observe(len(image_bytes), "export_pdf")
+
+        with request_limiter:
+            pdf_key = make_cache_key(image_bytes, model_status["model_version"])
+            pdf_bytes = (
+                await asyncio.to_thread(pdf_cache.get, pdf_key) if pdf_cache else None
+            )
+
+            if pdf_bytes is None:
+                result = await predict_from_bytes(image_bytes)
+
+                # Rendered in memory; includes queueing for a PDF worker
+                with stage_seconds.time("pdf_render"):
+                    pdf_bytes = await executors.run_pdf(
+                        render_report_pdf,
+                        result["disease"],
+                        result["confidence"] / 100,
+                        result["disease_info_hi"]
+                    )
+
+                if pdf_cache:
+                    await asyncio.to_thread(pdf_cache.put, pdf_key, pdf_bytes)
+
+        return Response(
+            content=pdf_bytes,
             media_type="application/pdf",
-            filename="cotton_disease_report.pdf"
+            headers={
+                "Content-Disposition": 'attachment; filename="cotton_disease_report.pdf"'
+            }
         )
 
+    except ServerBusyError:
+        return server_busy_response()
+
     except Exception as e:
+        request_errors.inc("internal")
         return JSONResponse(
             status_code=500,
             content={
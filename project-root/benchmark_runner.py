@@ -0,0 +1,181 @@
+# benchmark_runner.py
+#
+# Accuracy and speed report for one or more model artifacts (.keras,
+# .npz, .tflite, .weights.h5): confusion matrix and per-class metrics on
+# the held-out test split, single-image latency percentiles, throughput
+# per batch size, load time and peak RSS. Every (artifact, thread count)
+# runs in a fresh process so load time and memory are not shared; the
+# accuracy pass (whose prefetched decode buffers would inflate peak RSS)
+# gets a process of its own.
+# Examples (from project-root):
+#   python benchmark_runner.py --model artifacts/cotton_disease.keras \
+#       --model artifacts/cotton_disease_int8.tflite --threads 1 4
+#   python benchmark_runner.py --model artifacts/cotton_disease.keras \
+#       --baseline artifacts/benchmarks/previous.json
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from src.executors import create_executor
+
+
+def measure_artifact(
+    model_path: str,
+    class_names_path: str,
+    threads: int,
+    test_paths: list,
+    batch_sizes: tuple,
+    latency_repeats: int
+) -> dict:
+    """
+    Runs in a fresh spawned process: load, then time.
+    """
+    from src.benchmarking import current_rss_mb, peak_rss_mb
+    from src.bulk_inference import load_artifact
+    from src.evaluation import batch_throughput, sample_images, single_image_latency
+
+    rss_start = current_rss_mb()
+    start = time.perf_counter()
+    model, class_names = load_artifact(model_path, class_names_path, threads)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = current_rss_mb()
+
+    images = sample_images(model, test_paths, max(batch_sizes))
+
+    run = {
+        "artifact": model_path,
+        "threads": threads,
+        "disk_mb": round(os.path.getsize(model_path) / 2**20, 2),
+        "input_shape": list(model.input_shape),
+        "input_dtype": str(model.input_dtype),
+        "load_seconds": round(load_seconds, 3),
+        "rss_after_load_mb": round(rss_loaded, 1),
+        "rss_load_delta_mb": round(rss_loaded - rss_start, 1),
+        "latency_batch1": single_image_latency(model, images[0], latency_repeats),
+        "throughput": batch_throughput(model, images, batch_sizes),
+    }
+    run["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return run
+
+
+def evaluate_artifact(
+    model_path: str,
+    class_names_path: str,
+    test_paths: list,
+    test_labels: list
+) -> dict:
+    """
+    Runs in a fresh spawned process: accuracy on the held-out split.
+    """
+    from src.benchmarking import peak_rss_mb
+    from src.bulk_inference import load_artifact
+    from src.evaluation import evaluate
+
+    model, class_names = load_artifact(model_path, class_names_path)
+    report = evaluate(model, class_names, test_paths, test_labels)
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return report
+
+
+if __name__ == "__main__":
+    from src.config import (
+        MODEL_PATH,
+        SPLITS_DIR,
+        VAL_FRACTION,
+        TEST_FRACTION,
+        SPLIT_SEED
+    )
+    from src.evaluation import compare_runs
+    from src.splits import get_or_create_splits, load_split
+
+    parser = argparse.ArgumentParser(description="Accuracy / latency / throughput benchmark")
+    parser.add_argument("--model", action="append",
+                        help="artifact to measure (repeatable)")
+    parser.add_argument("--class-names", default="artifacts/class_names.json",
+                        help="used by .tflite and .weights.h5 artifacts")
+    parser.add_argument("--data-dir", default="data/cotton_disease")
+    parser.add_argument("--split", choices=["val", "test"], default="test")
+    parser.add_argument("--threads", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="intra-op inference thread counts to compare")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency-repeats", type=int, default=200)
+    parser.add_argument("--output", default="artifacts/benchmarks/latest.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    get_or_create_splits(
+        args.data_dir,
+        SPLITS_DIR,
+        val_fraction=VAL_FRACTION,
+        test_fraction=TEST_FRACTION,
+        seed=SPLIT_SEED
+    )
+    paths, labels, _ = load_split(SPLITS_DIR, args.split)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "split": args.split,
+        "num_images": len(paths),
+        "evaluations": {},
+        "runs": [],
+    }
+
+    for model_path in args.model or [MODEL_PATH]:
+        # Accuracy does not depend on the thread count: one pass per artifact
+        print(f"Evaluating {model_path} on the {args.split} split...")
+        with create_executor("process", 1, "evaluate") as pool:
+            evaluation = pool.submit(
+                evaluate_artifact, model_path, args.class_names, paths, labels
+            ).result()
+        report["evaluations"][model_path] = evaluation
+        print(
+            f"  accuracy={evaluation['accuracy']}  macro_f1={evaluation['macro']['f1']}  "
+            f"{evaluation['end_to_end_images_per_sec']} img/s end to end"
+        )
+
+        for threads in args.threads:
+            print(f"Measuring {model_path} with {threads} thread(s)...")
+
+            with create_executor("process", 1, "measure") as pool:
+                run = pool.submit(
+                    measure_artifact,
+                    model_path,
+                    args.class_names,
+                    threads,
+                    paths,
+                    tuple(args.batch_sizes),
+                    args.latency_repeats
+                ).result()
+            report["runs"].append(run)
+
+            throughput = ", ".join(
+                f"bs{bs}={row['images_per_sec']}/s" for bs, row in run["throughput"].items()
+            )
+            print(
+                f"  load={run['load_seconds']}s  peak_rss={run['peak_rss_mb']} MB  "
+                f"p50={run['latency_batch1']['p50_ms']} ms  "
+                f"p99={run['latency_batch1']['p99_ms']} ms  {throughput}"
+            )
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["comparison"] = compare_runs(json.load(f), report)
+
+        for run_name, changes in report["comparison"].items():
+            print(f"vs baseline {run_name}:")
+            for metric, change in changes.items():
+                print(f"  {metric:<24} {change:+}" if change is not None else f"  {metric:<24} n/a")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Report written to:", args.output)
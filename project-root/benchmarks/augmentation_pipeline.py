@@ -0,0 +1,69 @@
+# benchmarks/augmentation_pipeline.py
+#
+# Step time and CPU utilization with augmentation inside the model
+# graph (old main.py) versus as a parallel tf.data stage.
+# Run from project-root:  python -m benchmarks.augmentation_pipeline
+
+import json
+import os
+import time
+
+from tensorflow import keras
+
+from src.config import IMG_SIZE, BATCH_SIZE, LEARNING_RATE
+from src.data_loader import load_image_dataset, prepare_dataset
+from src.model import build_base_model, build_classification_model
+from src.preprocessing import get_data_augmentation, get_normalization_layer
+from src.train import compile_model
+
+DATA_DIR = "data/cotton_disease"
+EPOCHS = 3
+POLICY = "standard"
+
+
+def run(train_ds, augmentation_in_graph) -> dict:
+    keras.backend.clear_session()
+
+    # In-graph variant: the old layer order (augment the [0, 255]
+    # images, then normalize) wrapped in front of the classifier
+    model = build_classification_model(
+        IMG_SIZE, len(class_names), build_base_model(IMG_SIZE, weights=None)
+    )
+    if augmentation_in_graph is not None:
+        inputs = keras.Input((IMG_SIZE, IMG_SIZE, 3))
+        x = augmentation_in_graph(inputs)
+        model = keras.Model(inputs, model(get_normalization_layer()(x)))
+    compile_model(model, LEARNING_RATE)
+
+    steps_per_epoch = sum(1 for _ in train_ds)
+    model.fit(train_ds.take(1), epochs=1, verbose=0)     # trace
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    model.fit(train_ds, epochs=EPOCHS, verbose=0)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+
+    return {
+        "ms_per_step": round(wall / (steps_per_epoch * EPOCHS) * 1000.0, 2),
+        "cpu_utilization": round(cpu / wall / (os.cpu_count() or 1), 3),
+    }
+
+
+raw_ds, class_names = load_image_dataset(DATA_DIR, IMG_SIZE, BATCH_SIZE, seed=0)
+raw_ds = raw_ds.cache()
+
+results = {
+    "augmentation_in_model": run(
+        prepare_dataset(raw_ds, normalize=False).map(
+            lambda x, y: (keras.ops.cast(x, "float32"), y)
+        ),
+        get_data_augmentation(POLICY)
+    ),
+    "augmentation_in_tf_data": run(
+        prepare_dataset(raw_ds, augmentation_policy=POLICY),
+        None
+    ),
+}
+
+print(json.dumps(results, indent=2))
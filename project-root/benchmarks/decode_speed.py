@@ -0,0 +1,77 @@
+# benchmarks/decode_speed.py
+#
+# Compares the original PIL preprocessing with the draft-mode decode
+# path (src/image_decode.py) on dataset photos and on a synthetic 12MP
+# phone-sized JPEG, and checks numeric parity.
+# Run from project-root:  python -m benchmarks.decode_speed
+
+import glob
+import io
+import json
+import numpy as np
+from PIL import Image
+
+from src.config import IMG_SIZE
+from src.image_decode import decode_image, allocate_batch
+from src.benchmarking import time_calls, latency_summary
+
+DATA_DIR = "data/cotton_disease"
+NUM_IMAGES = 50
+REPEATS = 20
+
+# Mean absolute difference allowed between the two paths, in the
+# normalized [-1, 1] range (draft decoding averages 8x8 DCT blocks,
+# so individual pixels can differ more than the mean).
+MEAN_ABS_TOLERANCE = 0.03
+
+
+def original_preprocess(image_bytes: bytes, img_size: int):
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    image = image.resize((img_size, img_size))
+    img_array = np.array(image).astype("float32")
+    img_array = img_array / 127.5 - 1.0
+    return np.expand_dims(img_array, axis=0)
+
+
+def new_preprocess(image_bytes: bytes, img_size: int):
+    batch = allocate_batch(1, img_size)
+    decode_image(image_bytes, img_size, out=batch[0])
+    return batch
+
+
+def load_samples():
+    paths = sorted(glob.glob(f"{DATA_DIR}/*/*.jpg"))[:NUM_IMAGES]
+    samples = {"dataset": [open(p, "rb").read() for p in paths]}
+
+    # Upscale one photo to phone-camera resolution (4000x3000)
+    large = Image.open(paths[0]).convert("RGB").resize((4000, 3000))
+    buffer = io.BytesIO()
+    large.save(buffer, format="JPEG", quality=90)
+    samples["12mp"] = [buffer.getvalue()]
+
+    return samples
+
+
+results = {}
+for name, images in load_samples().items():
+    diffs = [
+        np.abs(original_preprocess(b, IMG_SIZE) - new_preprocess(b, IMG_SIZE))
+        for b in images
+    ]
+    mean_abs = float(np.mean([d.mean() for d in diffs]))
+
+    def run(fn):
+        for image_bytes in images:
+            fn(image_bytes, IMG_SIZE)
+
+    results[name] = {
+        "images": len(images),
+        "original": latency_summary(time_calls(run, original_preprocess, repeats=REPEATS)),
+        "draft_decode": latency_summary(time_calls(run, new_preprocess, repeats=REPEATS)),
+        "mean_abs_diff": round(mean_abs, 5),
+        "max_abs_diff": round(float(max(d.max() for d in diffs)), 5),
+    }
+
+    assert mean_abs < MEAN_ABS_TOLERANCE, f"{name}: parity check failed ({mean_abs})"
+
+print(json.dumps(results, indent=2))
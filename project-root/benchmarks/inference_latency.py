@@ -0,0 +1,57 @@
+# benchmarks/inference_latency.py
+#
+# Compares Keras `model.predict` with the traced InferenceModel path.
+# Run from project-root:  python -m benchmarks.inference_latency
+
+import json
+import os
+import numpy as np
+
+from src.config import IMG_SIZE, DEFAULT_MODEL_DIR
+from src.model import build_base_model, build_classification_model
+from src.inference import InferenceModel
+from src.benchmarking import time_calls, latency_summary
+
+WEIGHTS_PATH = os.path.join(DEFAULT_MODEL_DIR, "cotton_disease_finetuned.weights.h5")
+CLASS_NAMES_PATH = os.path.join(DEFAULT_MODEL_DIR, "class_names.json")
+REPEATS = 200
+
+with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
+    class_names = json.load(f)
+
+# Latency does not depend on the weight values, so random weights are
+# fine when no trained artifact is present.
+model = build_classification_model(
+    img_size=IMG_SIZE,
+    num_classes=len(class_names),
+    base_model=build_base_model(IMG_SIZE, weights=None)
+)
+if os.path.exists(WEIGHTS_PATH):
+    model.load_weights(WEIGHTS_PATH)
+
+inference_model = InferenceModel(model)
+inference_model.warmup()
+
+results = {}
+for batch_size in (1, 8, 16):
+    images = np.random.uniform(
+        -1.0, 1.0, (batch_size, IMG_SIZE, IMG_SIZE, 3)
+    ).astype("float32")
+
+    before = time_calls(
+        lambda x: model.predict(x, verbose=0), images, repeats=REPEATS
+    )
+    after = time_calls(inference_model.predict_batch, images, repeats=REPEATS)
+
+    np.testing.assert_allclose(
+        model.predict(images, verbose=0),
+        inference_model.predict_batch(images),
+        atol=1e-5
+    )
+
+    results[f"batch_{batch_size}"] = {
+        "model.predict": latency_summary(before),
+        "predict_batch": latency_summary(after),
+    }
+
+print(json.dumps(results, indent=2))
@@ -0,0 +1,39 @@
+# benchmarks/input_pipeline.py
+#
+# Images/sec delivered by the training input pipeline, reading JPEGs
+# every epoch versus the TFRecord cache (build_dataset_cache.py first).
+# Run from project-root:  python -m benchmarks.input_pipeline
+
+import json
+import time
+
+from src.config import IMG_SIZE, BATCH_SIZE, DATASET_CACHE_DIR, DATASET_CACHE_SHARDS
+from src.data_loader import load_image_dataset, prepare_dataset
+from src.dataset_cache import build_tfrecord_cache, load_cached_dataset
+
+DATA_DIR = "data/cotton_disease"
+EPOCHS = 3
+
+
+def measure(dataset) -> list:
+    per_epoch = []
+    for _ in range(EPOCHS):
+        count = 0
+        start = time.perf_counter()
+        for images, _ in dataset:
+            count += int(images.shape[0])
+        per_epoch.append(round(count / (time.perf_counter() - start), 1))
+    return per_epoch
+
+
+build_tfrecord_cache(DATA_DIR, DATASET_CACHE_DIR, IMG_SIZE, DATASET_CACHE_SHARDS)
+
+jpeg_ds, _ = load_image_dataset(DATA_DIR, IMG_SIZE, BATCH_SIZE, shuffle=True)
+cached_ds, _ = load_cached_dataset(DATASET_CACHE_DIR, BATCH_SIZE, shuffle=True)
+
+results = {
+    "jpeg_img_per_s_by_epoch": measure(prepare_dataset(jpeg_ds)),
+    "tfrecord_cache_img_per_s_by_epoch": measure(prepare_dataset(cached_ds)),
+}
+
+print(json.dumps(results, indent=2))
@@ -0,0 +1,98 @@
+# benchmarks/pdf_disk_usage.py
+#
+# Load test for the /export/pdf disk footprint: concurrent workers render
+# distinct reports in memory and store them in a bounded PDFDiskCache
+# while the janitor runs. Directory size is sampled throughout and must
+# stay flat at the configured limit (plus in-flight writes), unlike the old
+# `temp_reports/` files which were never deleted.
+# Run from project-root:  python -m benchmarks.pdf_disk_usage
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from src.disease_guide_hi import DISEASE_GUIDE_HI, get_disease_guide_hindi
+from src.pdf_cache import PDFDiskCache, run_janitor
+from src.report_generator import render_report_pdf
+
+REQUESTS = 600
+CONCURRENCY = 8
+MAX_MB = 2
+MAX_AGE_SECONDS = 3600
+JANITOR_INTERVAL = 0.5
+SAMPLE_INTERVAL = 0.25
+
+
+def disease_info(class_name: str) -> dict:
+    # Same shape the API passes to the PDF generator
+    guide = get_disease_guide_hindi(class_name)
+    return {
+        "नाम": guide["disease_name_hi"],
+        "विवरण": guide["description_hi"],
+        "उपचार_कदम": guide["treatment_steps_hi"],
+        "अनुशंसित_कीटनाशक": guide["recommended_pesticides_hi"],
+    }
+
+
+def directory_bytes(directory: str) -> int:
+    with os.scandir(directory) as entries:
+        return sum(e.stat().st_size for e in entries if e.is_file())
+
+
+async def sample_disk_usage(directory: str, samples: list):
+    start = time.perf_counter()
+    while True:
+        samples.append((round(time.perf_counter() - start, 2), directory_bytes(directory)))
+        await asyncio.sleep(SAMPLE_INTERVAL)
+
+
+async def main(directory: str) -> dict:
+    cache = PDFDiskCache(directory, MAX_MB * 1024 * 1024, MAX_AGE_SECONDS)
+    classes = list(DISEASE_GUIDE_HI)
+    infos = {name: disease_info(name) for name in classes}
+    queue = list(range(REQUESTS))
+
+    async def worker():
+        while queue:
+            i = queue.pop()
+            name = classes[i % len(classes)]
+            # Every request is a distinct upload, so every report is a miss
+            key = f"bench:{i}"
+            if await asyncio.to_thread(cache.get, key) is None:
+                pdf = await asyncio.to_thread(render_report_pdf, name, 0.9, infos[name])
+                await asyncio.to_thread(cache.put, key, pdf)
+
+    samples = []
+    janitor = asyncio.create_task(run_janitor(cache, JANITOR_INTERVAL))
+    sampler = asyncio.create_task(sample_disk_usage(directory, samples))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+
+    janitor.cancel()
+    sampler.cancel()
+    samples.append((round(elapsed, 2), directory_bytes(directory)))
+
+    # Over the run's second half the footprint should not grow
+    second_half = [size for t, size in samples if t >= elapsed / 2]
+    return {
+        "requests": REQUESTS,
+        "concurrency": CONCURRENCY,
+        "reports_per_sec": round(REQUESTS / elapsed, 2),
+        "limit_bytes": cache.max_bytes,
+        "peak_disk_bytes": max(size for _, size in samples),
+        "final_disk_bytes": samples[-1][1],
+        "second_half_growth_bytes": max(second_half) - min(second_half),
+        "files_on_disk": len(os.listdir(directory)),
+        "cache": cache.stats(),
+        "samples": samples[:: max(len(samples) // 20, 1)],
+    }
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    results = asyncio.run(main(tmp))
+
+print(json.dumps(results, indent=2))
@@ -0,0 +1,79 @@
+# benchmarks/pdf_reports.py
+#
+# Reports/sec of the original `generate_disease_report_pdf` (styles and
+# flowables rebuilt per call, written to disk) against ReportEngine
+# (fonts/styles built once, rendered in memory), single
+# reports and one multi-page batch PDF.
+# Run from project-root:  python -m benchmarks.pdf_reports
+
+import json
+import os
+import tempfile
+import time
+
+from src.disease_guide_hi import DISEASE_GUIDE_HI, get_disease_guide_hindi
+from src.report_generator import ReportEngine, generate_disease_report_pdf
+
+REPORTS = 60
+BATCH_SIZE = 30
+
+
+def disease_info(class_name: str) -> dict:
+    # Same shape the API passes to the PDF generator
+    guide = get_disease_guide_hindi(class_name)
+    return {
+        "नाम": guide["disease_name_hi"],
+        "विवरण": guide["description_hi"],
+        "उपचार_कदम": guide["treatment_steps_hi"],
+        "अनुशंसित_कीटनाशक": guide["recommended_pesticides_hi"],
+    }
+
+
+def reports_per_second(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn(count)
+    return round(count / (time.perf_counter() - start), 2)
+
+
+classes = list(DISEASE_GUIDE_HI)
+infos = {name: disease_info(name) for name in classes}
+cases = [(classes[i % len(classes)], 0.9) for i in range(REPORTS)]
+
+engine = ReportEngine()
+
+
+def run_original(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, confidence) in enumerate(cases[:count]):
+            path = os.path.join(tmp, f"{i}.pdf")
+            generate_disease_report_pdf(path, name, confidence, infos[name])
+
+
+def run_engine(count):
+    for name, confidence in cases[:count]:
+        engine.render(name, confidence, infos[name])
+
+
+def run_engine_batch(count):
+    for start in range(0, count, BATCH_SIZE):
+        engine.render_batch([
+            {"predicted_class": name, "confidence": confidence, "disease_info_hi": infos[name]}
+            for name, confidence in cases[start:start + BATCH_SIZE]
+        ])
+
+
+# Warm both paths (font registration, first-time section builds)
+run_original(len(classes))
+run_engine(len(classes))
+
+results = {
+    "original_reports_per_sec": reports_per_second(run_original, REPORTS),
+    "engine_reports_per_sec": reports_per_second(run_engine, REPORTS),
+    "engine_batch_reports_per_sec": reports_per_second(run_engine_batch, REPORTS),
+    "batch_size": BATCH_SIZE,
+}
+results["engine_speedup"] = round(
+    results["engine_reports_per_sec"] / results["original_reports_per_sec"], 2
+)
+
+print(json.dumps(results, indent=2))
@@ -0,0 +1,88 @@
+# benchmarks/preprocessing_parity.py
+#
+# Checks that the NumPy batch path, the tf.data path and in-graph
+# normalization produce identical model inputs, and reports the
+# throughput of each path. Both paths decode with the same PIL decoder,
+# so normalization is also checked on its own: each path against a
+# Rescaling layer written out independently of src.preprocessing's
+# constants, on the same uint8 batch.
+# Run from project-root:  python -m benchmarks.preprocessing_parity
+
+import json
+import time
+import numpy as np
+import tensorflow as tf
+
+from src.config import IMG_SIZE, BATCH_SIZE
+from src.data_loader import list_image_files, load_image_dataset, prepare_dataset
+from src.preprocessing import preprocess_batch, get_normalization_layer
+
+DATA_DIR = "data/cotton_disease"
+NUM_IMAGES = 128
+
+file_paths, _, _ = list_image_files(DATA_DIR)
+file_paths = file_paths[:NUM_IMAGES]
+encoded = [open(p, "rb").read() for p in file_paths]
+
+# --------------------------------------------------
+# Parity
+# --------------------------------------------------
+
+numpy_float = preprocess_batch(encoded, IMG_SIZE)
+numpy_uint8 = preprocess_batch(encoded, IMG_SIZE, dtype=np.uint8)
+
+dataset, _ = load_image_dataset(DATA_DIR, IMG_SIZE, BATCH_SIZE, shuffle=False)
+dataset = prepare_dataset(dataset.unbatch().take(NUM_IMAGES).batch(BATCH_SIZE), training=False)
+tf_float = np.concatenate([images.numpy() for images, _ in dataset])
+
+in_graph = get_normalization_layer()(numpy_uint8).numpy()
+
+# Reference: MobileNetV2's [0, 255] -> [-1, 1]
+reference = tf.keras.layers.Rescaling(scale=1.0 / 127.5, offset=-1.0)(numpy_uint8).numpy()
+
+# tf.data normalization alone, on the already decoded pixels
+uint8_dataset = tf.data.Dataset.from_tensor_slices(
+    (numpy_uint8, np.zeros(len(numpy_uint8), dtype=np.int32))
+).batch(BATCH_SIZE)
+tf_normalized = np.concatenate(
+    [images.numpy() for images, _ in prepare_dataset(uint8_dataset, training=False)]
+)
+
+np.testing.assert_allclose(tf_float, numpy_float, atol=1e-6)
+np.testing.assert_allclose(in_graph, numpy_float, atol=1e-6)
+np.testing.assert_allclose(numpy_float, reference, atol=1e-6)
+np.testing.assert_allclose(tf_normalized, reference, atol=1e-6)
+
+# --------------------------------------------------
+# Throughput
+# --------------------------------------------------
+
+
+def images_per_second(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return round(NUM_IMAGES / (time.perf_counter() - start), 1)
+
+
+def run_tf_data():
+    ds, _ = load_image_dataset(DATA_DIR, IMG_SIZE, BATCH_SIZE, shuffle=False)
+    ds = prepare_dataset(ds.unbatch().take(NUM_IMAGES).batch(BATCH_SIZE), training=False)
+    for _ in ds:
+        pass
+
+
+results = {
+    "parity": "ok",
+    "images": NUM_IMAGES,
+    "numpy_float32_img_per_s": images_per_second(
+        lambda: preprocess_batch(encoded, IMG_SIZE)
+    ),
+    "numpy_uint8_img_per_s": images_per_second(
+        lambda: preprocess_batch(encoded, IMG_SIZE, dtype=np.uint8)
+    ),
+    "tf_data_img_per_s": images_per_second(run_tf_data),
+    "input_bytes_float32": int(numpy_float.nbytes),
+    "input_bytes_uint8": int(numpy_uint8.nbytes),
+}
+
+print(json.dumps(results, indent=2))
@@ -0,0 +1,61 @@
+# benchmarks/startup_time.py
+#
+# Measures cold-start stages: TensorFlow import, model load and first
+# inference, for the self-contained `.keras` artifact and the legacy
+# rebuild-then-load-weights path.
+# Run each variant in a fresh process so imports are really cold:
+#   python -m benchmarks.startup_time keras
+#   python -m benchmarks.startup_time legacy
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from src.config import IMG_SIZE, MODEL_PATH, DEFAULT_MODEL_DIR
+
+WEIGHTS_PATH = os.path.join(DEFAULT_MODEL_DIR, "cotton_disease_finetuned.weights.h5")
+CLASS_NAMES_PATH = os.path.join(DEFAULT_MODEL_DIR, "class_names.json")
+
+variant = sys.argv[1] if len(sys.argv) > 1 else "keras"
+timings = {"variant": variant}
+
+start = time.perf_counter()
+import tensorflow as tf  # noqa: E402
+timings["import_s"] = round(time.perf_counter() - start, 3)
+
+start = time.perf_counter()
+if variant == "keras":
+    from src.inference import load_classifier
+    model, class_names = load_classifier(MODEL_PATH)
+elif variant == "legacy":
+    from src.model import build_base_model, build_classification_model
+    with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
+        class_names = json.load(f)
+    model = build_classification_model(
+        img_size=IMG_SIZE,
+        num_classes=len(class_names),
+        base_model=build_base_model(IMG_SIZE),
+        data_augmentation=None
+    )
+    model.load_weights(WEIGHTS_PATH)
+else:
+    raise SystemExit(f"Unknown variant: {variant} (use 'keras' or 'legacy')")
+timings["load_s"] = round(time.perf_counter() - start, 3)
+
+from src.inference import InferenceModel  # noqa: E402
+
+start = time.perf_counter()
+inference_model = InferenceModel(model)
+inference_model.predict_batch(
+    np.zeros((1, *inference_model.input_shape), dtype=np.float32)
+)
+timings["first_inference_s"] = round(time.perf_counter() - start, 3)
+
+timings["total_s"] = round(
+    timings["import_s"] + timings["load_s"] + timings["first_inference_s"], 3
+)
+
+print(json.dumps(timings, indent=2))
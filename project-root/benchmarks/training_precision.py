@@ -0,0 +1,68 @@
+# benchmarks/training_precision.py
+#
+# Step time and accuracy of fine-tuning under float32 / mixed precision,
+# with and without XLA. Each configuration trains from the same ImageNet
+# backbone for a few epochs.
+# Run from project-root:  python -m benchmarks.training_precision
+
+import json
+import time
+
+from tensorflow import keras
+
+from src.config import IMG_SIZE, BATCH_SIZE, LEARNING_RATE, FINE_TUNE_AT
+from src.data_loader import load_image_dataset, prepare_dataset
+from src.model import build_base_model, build_classification_model, enable_fine_tuning
+from src.train import configure_precision, recompile_for_finetuning
+from src.benchmarking import latency_summary
+
+DATA_DIR = "data/cotton_disease"
+EPOCHS = 3
+
+CONFIGURATIONS = [
+    ("float32", False),
+    ("float32", True),
+    ("mixed_bfloat16", False),
+    ("mixed_bfloat16", True),
+]
+
+
+class StepTimer(keras.callbacks.Callback):
+    def __init__(self):
+        super().__init__()
+        self.step_ms = []
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_ms.append((time.perf_counter() - self._start) * 1000.0)
+
+
+train_ds, class_names = load_image_dataset(DATA_DIR, IMG_SIZE, BATCH_SIZE, seed=0)
+train_ds = prepare_dataset(train_ds).cache()
+
+results = {}
+for policy, jit_compile in CONFIGURATIONS:
+    keras.backend.clear_session()
+    configure_precision(policy)
+
+    base_model = build_base_model(IMG_SIZE)
+    model = build_classification_model(IMG_SIZE, len(class_names), base_model)
+    enable_fine_tuning(base_model, FINE_TUNE_AT)
+    recompile_for_finetuning(model, LEARNING_RATE / 10, jit_compile=jit_compile)
+
+    timer = StepTimer()
+    history = model.fit(train_ds, epochs=EPOCHS, callbacks=[timer], verbose=0)
+
+    # Skip the first epoch: it includes tracing / XLA compilation
+    steady = timer.step_ms[len(timer.step_ms) // EPOCHS:]
+
+    results[f"{policy}{'+xla' if jit_compile else ''}"] = {
+        "step_time": latency_summary(steady),
+        "final_accuracy": round(float(history.history["accuracy"][-1]), 4),
+        "final_loss": round(float(history.history["loss"][-1]), 4),
+    }
+
+configure_precision(None)
+print(json.dumps(results, indent=2))
@@ -0,0 +1,41 @@
+# build_dataset_cache.py
+
+from src.config import (
+    IMG_SIZE,
+    DATASET_CACHE_DIR,
+    DATASET_CACHE_SHARDS,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED
+)
+from src.dataset_cache import build_tfrecord_cache
+from src.splits import SPLITS, get_or_create_splits, load_split
+
+DATA_DIR = "data/cotton_disease"
+
+get_or_create_splits(
+    DATA_DIR,
+    SPLITS_DIR,
+    val_fraction=VAL_FRACTION,
+    test_fraction=TEST_FRACTION,
+    seed=SPLIT_SEED
+)
+
+print("Decoding dataset splits into sharded TFRecords...")
+
+for split in SPLITS:
+    manifest = build_tfrecord_cache(
+        DATA_DIR,
+        f"{DATASET_CACHE_DIR}/{split}",
+        IMG_SIZE,
+        num_shards=DATASET_CACHE_SHARDS,
+        files=load_split(SPLITS_DIR, split)
+    )
+
+    print(
+        f"{split}: {manifest['num_examples']} examples, "
+        f"{len(manifest['shards'])} shards, fingerprint {manifest['fingerprint']}"
+    )
+
+print("Cache written to:", DATASET_CACHE_DIR)
@@ -0,0 +1,62 @@
+# bulk_inference_runner.py
+#
+# Scores a directory tree (or a manifest of image paths) offline and
+# streams one row per image to CSV, JSONL or Parquet. Re-running the
+# same command after an interruption resumes where it stopped.
+# Examples (from project-root):
+#   python bulk_inference_runner.py data/cotton_disease --output scores.csv
+#   python bulk_inference_runner.py survey_manifest.txt --output scores_parquet \
+#       --format parquet --model artifacts/cotton_disease_int8.tflite --threads 4
+
+import argparse
+import os
+import time
+
+from tqdm import tqdm
+
+from src.bulk_inference import create_writer, iter_inputs, load_artifact, score_images
+from src.config import MODEL_PATH
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline bulk image scoring")
+    parser.add_argument("source", help="image directory, or .txt / .csv manifest")
+    parser.add_argument("--output", required=True,
+                        help=".csv / .jsonl file, or a directory of Parquet parts")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"],
+                        help="defaults to the output extension")
+    parser.add_argument("--model", default=MODEL_PATH,
+                        help=".keras, .npz, .tflite or .weights.h5 artifact")
+    parser.add_argument("--class-names", default="artifacts/class_names.json",
+                        help="used by .tflite and .weights.h5 artifacts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--decode-workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--prefetch", type=int, default=4,
+                        help="batches decoded ahead of the model")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="intra-op inference threads")
+    args = parser.parse_args()
+
+    model, class_names = load_artifact(args.model, args.class_names, args.threads)
+    writer = create_writer(args.output, args.format)
+
+    start = time.perf_counter()
+    with tqdm(unit="img", desc="Scoring") as progress:
+        stats = score_images(
+            model,
+            class_names,
+            iter_inputs(args.source),
+            writer,
+            batch_size=args.batch_size,
+            workers=args.decode_workers,
+            prefetch=args.prefetch,
+            progress=progress.update
+        )
+    elapsed = time.perf_counter() - start
+
+    processed = stats["scored"] + stats["failed"]
+    print(
+        f"Scored {stats['scored']}, failed {stats['failed']}, "
+        f"skipped {stats['skipped']} already done "
+        f"({processed / elapsed:.1f} img/s)"
+    )
+    print("Results written to:", args.output)
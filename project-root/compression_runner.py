@@ -0,0 +1,212 @@
+# compression_runner.py
+#
+# Prunes and clusters the trained classifier during a short fine-tune,
+# exports a compressed artifact and compares it with the baseline
+# `.weights.h5` on disk size, resident memory after load, CPU latency
+# and test accuracy. Each artifact is measured in a fresh process so
+# RSS figures are not polluted by the others.
+# Example (from project-root):
+#   python compression_runner.py --sparsity 0.5 --clusters 16
+# Serve the result with MODEL_PATH=artifacts/cotton_disease_compressed.npz
+
+import argparse
+import json
+import math
+import os
+
+from src.executors import create_executor
+
+DATA_DIR = "data/cotton_disease"
+ARTIFACTS_DIR = "artifacts"
+WEIGHTS_PATH = f"{ARTIFACTS_DIR}/cotton_disease_finetuned.weights.h5"
+CLASS_NAMES_PATH = f"{ARTIFACTS_DIR}/class_names.json"
+
+
+def rebuild_from_weights(weights_path: str, class_names: list):
+    from src.config import IMG_SIZE
+    from src.model import build_base_model, build_classification_model
+
+    model = build_classification_model(
+        img_size=IMG_SIZE,
+        num_classes=len(class_names),
+        base_model=build_base_model(IMG_SIZE, weights=None),
+        data_augmentation=None
+    )
+    model.load_weights(weights_path)
+    return model
+
+
+def measure_artifact(path: str, test_paths: list, test_labels: list) -> dict:
+    """
+    Runs in a fresh spawned process: load, warm up, time, evaluate.
+    """
+    import numpy as np
+
+    from src.benchmarking import current_rss_mb, latency_summary, peak_rss_mb, time_calls
+    from src.inference import InferenceModel, load_classifier, predict_files
+
+    rss_start = current_rss_mb()
+    if path.endswith(".weights.h5"):
+        with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
+            model = rebuild_from_weights(path, json.load(f))
+    else:
+        model, _ = load_classifier(path)
+
+    inference_model = InferenceModel(model)
+    inference_model.warmup()
+    rss_loaded = current_rss_mb()
+
+    image = np.zeros((1, *inference_model.input_shape), dtype=inference_model.input_dtype)
+    latency = latency_summary(time_calls(inference_model.predict_batch, image))
+    probs = predict_files(inference_model, test_paths)
+
+    return {
+        "artifact": path,
+        "disk_mb": round(os.path.getsize(path) / 2**20, 2),
+        "rss_after_load_mb": round(rss_loaded, 1),
+        "rss_load_delta_mb": round(rss_loaded - rss_start, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "latency_batch1": latency,
+        "test_accuracy": round(float(np.mean(np.argmax(probs, axis=1) == np.asarray(test_labels))), 4),
+    }
+
+
+if __name__ == "__main__":
+    from tensorflow import keras
+
+    from src.compression import (
+        ClusteringCallback,
+        PruningCallback,
+        kernel_layers,
+        model_sparsity,
+        save_compressed
+    )
+    from src.config import (
+        IMG_SIZE,
+        BATCH_SIZE,
+        EVAL_BATCH_SIZE,
+        LEARNING_RATE,
+        EARLY_STOPPING_PATIENCE,
+        AUGMENTATION_POLICY,
+        SPLITS_DIR,
+        DATASET_CACHE_DIR,
+        VAL_FRACTION,
+        TEST_FRACTION,
+        SPLIT_SEED
+    )
+    from src.data_loader import prepare_dataset
+    from src.model import enable_fine_tuning
+    from src.splits import get_or_create_splits, load_split, load_split_dataset
+    from src.train import recompile_for_finetuning, train_model
+
+    parser = argparse.ArgumentParser(description="Prune + cluster the classifier")
+    parser.add_argument("--weights", default=WEIGHTS_PATH)
+    parser.add_argument("--sparsity", type=float, default=0.5)
+    parser.add_argument("--structure", choices=["unstructured", "channel"],
+                        default="unstructured")
+    parser.add_argument("--clusters", type=int, default=16,
+                        help="distinct values per kernel (<= 256)")
+    parser.add_argument("--prune-epochs", type=int, default=3)
+    parser.add_argument("--cluster-epochs", type=int, default=2)
+    parser.add_argument("--output", default=f"{ARTIFACTS_DIR}/cotton_disease_compressed.npz")
+    args = parser.parse_args()
+
+    get_or_create_splits(
+        DATA_DIR,
+        SPLITS_DIR,
+        val_fraction=VAL_FRACTION,
+        test_fraction=TEST_FRACTION,
+        seed=SPLIT_SEED
+    )
+
+    with open(CLASS_NAMES_PATH, "r", encoding="utf-8") as f:
+        class_names = json.load(f)
+
+    model = rebuild_from_weights(args.weights, class_names)
+
+    train_ds, _, _ = load_split_dataset(
+        SPLITS_DIR, "train", IMG_SIZE, BATCH_SIZE, shuffle=True, cache_dir=DATASET_CACHE_DIR
+    )
+    train_ds = prepare_dataset(train_ds, augmentation_policy=AUGMENTATION_POLICY)
+    val_ds, _, _ = load_split_dataset(
+        SPLITS_DIR, "val", IMG_SIZE, EVAL_BATCH_SIZE, shuffle=False, cache_dir=DATASET_CACHE_DIR
+    )
+    val_ds = prepare_dataset(val_ds, training=False, cache=True)
+
+    # Every kernel is compressed, so the whole backbone fine-tunes
+    # (BatchNorm stays in inference mode: the backbone is called with
+    # training=False)
+    base_model = next(layer for layer in model.layers if isinstance(layer, keras.Model))
+    enable_fine_tuning(base_model, 0)
+
+    steps_per_epoch = math.ceil(len(load_split(SPLITS_DIR, "train")[0]) / BATCH_SIZE)
+
+    # --------------------------------------------------
+    # Pruning
+    # --------------------------------------------------
+
+    print(f"Pruning to {args.sparsity:.0%} sparsity ({args.structure})...")
+
+    recompile_for_finetuning(model, LEARNING_RATE / 10)
+    pruning = PruningCallback(
+        kernel_layers(model, args.structure),
+        final_sparsity=args.sparsity,
+        # Reach the target one epoch early and recover at full sparsity
+        end_step=max(args.prune_epochs - 1, 1) * steps_per_epoch,
+        structure=args.structure
+    )
+    train_model(
+        model, train_ds, args.prune_epochs, EARLY_STOPPING_PATIENCE,
+        callbacks=[pruning], val_ds=val_ds
+    )
+    print(f"Kernel sparsity: {model_sparsity(model):.3f}")
+
+    # --------------------------------------------------
+    # Clustering (pruned weights stay zero)
+    # --------------------------------------------------
+
+    print(f"Clustering kernels into {args.clusters} values...")
+
+    recompile_for_finetuning(model, LEARNING_RATE / 10)
+    train_model(
+        model, train_ds, args.cluster_epochs, EARLY_STOPPING_PATIENCE,
+        callbacks=[ClusteringCallback(kernel_layers(model), args.clusters)],
+        val_ds=val_ds
+    )
+    print(f"Kernel sparsity after clustering: {model_sparsity(model):.3f}")
+
+    save_compressed(model, args.output, class_names)
+    del model
+
+    # --------------------------------------------------
+    # Measure (fresh process per artifact)
+    # --------------------------------------------------
+
+    test_paths, test_labels, _ = load_split(SPLITS_DIR, "test")
+
+    report = {}
+    for name, path in (("baseline", args.weights), ("compressed", args.output)):
+        with create_executor("process", 1, "measure") as pool:
+            report[name] = pool.submit(measure_artifact, path, test_paths, test_labels).result()
+
+    report["settings"] = {
+        "sparsity": args.sparsity,
+        "structure": args.structure,
+        "clusters": args.clusters,
+        "prune_epochs": args.prune_epochs,
+        "cluster_epochs": args.cluster_epochs,
+    }
+
+    report_path = f"{ARTIFACTS_DIR}/compression_report.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for name in ("baseline", "compressed"):
+        row = report[name]
+        print(
+            f"{name:<11} disk={row['disk_mb']:>7} MB  "
+            f"rss={row['rss_after_load_mb']:>7} MB  "
+            f"p50={row['latency_batch1']['p50_ms']:>7} ms  "
+            f"test_accuracy={row['test_accuracy']}"
+        )
+    print("Report written to:", report_path)
@@ -0,0 +1,145 @@
+# distill_runner.py
+#
+# Distils the fine-tuned classifier into smaller MobileNetV2 students
+# and reports the accuracy / latency / memory tradeoff on the test split.
+# Example (from project-root):
+#   python distill_runner.py --student 0.35:96 --student 0.5:128
+# Serve a student with MODEL_VARIANT=student STUDENT_MODEL_PATH=<path>.
+
+import argparse
+import gc
+import json
+import os
+
+import numpy as np
+
+from src.benchmarking import current_rss_mb, latency_summary, time_calls
+from src.config import (
+    MODEL_PATH,
+    BATCH_SIZE,
+    EVAL_BATCH_SIZE,
+    LEARNING_RATE,
+    EPOCHS,
+    EARLY_STOPPING_PATIENCE,
+    FINE_TUNE_AT,
+    FOLD_NORMALIZATION,
+    AUGMENTATION_POLICY,
+    FEATURE_CACHE_DIR,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED
+)
+from src.distillation import train_student
+from src.inference import InferenceModel, load_classifier, predict_files
+from src.splits import get_or_create_splits, load_split
+from src.train import save_full_model
+
+parser = argparse.ArgumentParser(description="Knowledge distillation")
+parser.add_argument("--teacher", default=MODEL_PATH)
+parser.add_argument("--student", action="append", default=None,
+                    help="alpha:img_size, e.g. 0.35:96 (repeatable)")
+parser.add_argument("--temperature", type=float, default=4.0)
+parser.add_argument("--hard-weight", type=float, default=0.1,
+                    help="weight of the hard-label loss (rest: soft targets)")
+parser.add_argument("--epochs", type=int, default=EPOCHS)
+parser.add_argument("--data-dir", default="data/cotton_disease")
+parser.add_argument("--artifacts-dir", default="artifacts")
+args = parser.parse_args()
+
+students = args.student or ["0.35:96", "0.5:128"]
+
+get_or_create_splits(
+    args.data_dir,
+    SPLITS_DIR,
+    val_fraction=VAL_FRACTION,
+    test_fraction=TEST_FRACTION,
+    seed=SPLIT_SEED
+)
+
+# --------------------------------------------------
+# Train students
+# --------------------------------------------------
+
+teacher, class_names = load_classifier(args.teacher)
+artifact_paths = {"teacher": args.teacher}
+
+for spec in students:
+    alpha, img_size = spec.split(":")
+    alpha, img_size = float(alpha), int(img_size)
+    print(f"Distilling into MobileNetV2 alpha={alpha} @ {img_size}px...")
+
+    student = train_student(
+        teacher,
+        args.teacher,
+        SPLITS_DIR,
+        FEATURE_CACHE_DIR,
+        num_classes=len(class_names),
+        alpha=alpha,
+        img_size=img_size,
+        learning_rate=LEARNING_RATE,
+        batch_size=BATCH_SIZE,
+        eval_batch_size=EVAL_BATCH_SIZE,
+        epochs=args.epochs,
+        early_stopping_patience=EARLY_STOPPING_PATIENCE,
+        fine_tune_at=FINE_TUNE_AT,
+        temperature=args.temperature,
+        hard_weight=args.hard_weight,
+        augmentation_policy=AUGMENTATION_POLICY,
+        include_normalization=FOLD_NORMALIZATION
+    )
+
+    artifact_paths[f"student_a{alpha}_{img_size}"] = save_full_model(
+        student,
+        args.artifacts_dir,
+        f"cotton_disease_student_a{alpha}_{img_size}.keras",
+        class_names
+    )
+
+del teacher, student
+gc.collect()
+
+# --------------------------------------------------
+# Tradeoff table (test split)
+# --------------------------------------------------
+
+test_paths, test_labels, _ = load_split(SPLITS_DIR, "test")
+
+# rss_delta_mb is approximate: memory freed by earlier models is not
+# always returned to the OS
+report = {}
+for name, path in artifact_paths.items():
+    rss_before = current_rss_mb()
+    model, _ = load_classifier(path)
+    inference_model = InferenceModel(model)
+    inference_model.warmup()
+    rss_after = current_rss_mb()
+
+    probs = predict_files(inference_model, test_paths, batch_size=EVAL_BATCH_SIZE)
+    image = np.zeros((1, *inference_model.input_shape), dtype=inference_model.input_dtype)
+
+    report[name] = {
+        "artifact": path,
+        "img_size": inference_model.img_size,
+        "params": int(model.count_params()),
+        "file_mb": round(os.path.getsize(path) / 2**20, 2),
+        "rss_delta_mb": round(rss_after - rss_before, 1),
+        "test_accuracy": round(float(np.mean(np.argmax(probs, axis=1) == np.asarray(test_labels))), 4),
+        "latency_batch1": latency_summary(time_calls(inference_model.predict_batch, image)),
+    }
+
+    del model, inference_model
+    gc.collect()
+
+report_path = os.path.join(args.artifacts_dir, "distillation_report.json")
+with open(report_path, "w", encoding="utf-8") as f:
+    json.dump(report, f, indent=2)
+
+print(f"\n{'model':<22}{'size':>6}{'params':>11}{'file MB':>9}{'RSS MB':>8}{'test acc':>10}{'p50 ms':>9}")
+for name, row in report.items():
+    print(
+        f"{name:<22}{row['img_size']:>6}{row['params']:>11,}{row['file_mb']:>9}"
+        f"{row['rss_delta_mb']:>8}{row['test_accuracy']:>10}"
+        f"{row['latency_batch1']['p50_ms']:>9}"
+    )
+print("Report written to:", report_path)
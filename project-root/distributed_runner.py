@@ -0,0 +1,116 @@
+# distributed_runner.py
+#
+# Examples (from project-root):
+#   python distributed_runner.py --strategy mirrored --cpu-devices 4
+#   python distributed_runner.py --workers 3         # local multi-worker
+#   TF_CONFIG=... python distributed_runner.py --strategy multi_worker
+
+import argparse
+import json
+import os
+
+from src.config import (
+    IMG_SIZE,
+    BATCH_SIZE,
+    LEARNING_RATE,
+    EPOCHS,
+    EARLY_STOPPING_PATIENCE,
+    FINE_TUNE_AT,
+    AUGMENTATION_POLICY,
+    DATASET_CACHE_DIR,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED
+)
+from src.distributed import (
+    STRATEGIES,
+    create_strategy,
+    is_chief,
+    worker_output_dir,
+    train_distributed,
+    launch_local_workers
+)
+from src.splits import get_or_create_splits
+from src.train import save_model_weights, save_full_model
+
+parser = argparse.ArgumentParser(description="Distributed cotton disease training")
+parser.add_argument("--strategy", choices=STRATEGIES, default="mirrored")
+parser.add_argument("--cpu-devices", type=int, default=1,
+                    help="logical CPU devices for the mirrored strategy")
+parser.add_argument("--workers", type=int, default=1,
+                    help="spawn this many local multi-worker processes")
+parser.add_argument("--data-dir", default="data/cotton_disease")
+parser.add_argument("--artifacts-dir", default="artifacts")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                    help="per-replica batch size")
+parser.add_argument("--epochs", type=int, default=EPOCHS)
+parser.add_argument("--shard-policy", default="DATA",
+                    choices=["AUTO", "FILE", "DATA", "OFF"],
+                    help="FILE / AUTO need a cache shard count divisible by the workers")
+args = parser.parse_args()
+
+# --------------------------------------------------
+# Local launcher: re-run this script once per worker
+# --------------------------------------------------
+
+# Split manifests are written once, before any worker starts reading them
+get_or_create_splits(
+    args.data_dir,
+    SPLITS_DIR,
+    val_fraction=VAL_FRACTION,
+    test_fraction=TEST_FRACTION,
+    seed=SPLIT_SEED
+)
+
+if args.workers > 1 and "TF_CONFIG" not in os.environ:
+    worker_argv = [
+        __file__,
+        "--strategy", "multi_worker",
+        "--data-dir", args.data_dir,
+        "--artifacts-dir", args.artifacts_dir,
+        "--batch-size", str(args.batch_size),
+        "--epochs", str(args.epochs),
+        "--shard-policy", args.shard_policy,
+    ]
+    raise SystemExit(launch_local_workers(args.workers, worker_argv))
+
+# --------------------------------------------------
+# Train
+# --------------------------------------------------
+
+strategy = create_strategy(args.strategy, args.cpu_devices)
+print("Replicas in sync:", strategy.num_replicas_in_sync)
+
+model, class_names = train_distributed(
+    strategy,
+    data_dir=args.data_dir,
+    splits_dir=SPLITS_DIR,
+    cache_dir=DATASET_CACHE_DIR,
+    img_size=IMG_SIZE,
+    per_replica_batch_size=args.batch_size,
+    learning_rate=LEARNING_RATE,
+    epochs=args.epochs,
+    early_stopping_patience=EARLY_STOPPING_PATIENCE,
+    fine_tune_at=FINE_TUNE_AT,
+    augmentation_policy=AUGMENTATION_POLICY,
+    shard_policy=args.shard_policy
+)
+
+# --------------------------------------------------
+# Save artifacts (every worker saves, only the chief's are kept)
+# --------------------------------------------------
+
+with worker_output_dir(args.artifacts_dir, strategy) as output_dir:
+    weights_path = save_model_weights(model, output_dir, "cotton_disease_clean.weights.h5")
+    model_path = save_full_model(
+        model, output_dir, "cotton_disease_classifier.keras", class_names
+    )
+
+if is_chief(strategy):
+    with open(os.path.join(args.artifacts_dir, "class_names.json"), "w") as f:
+        json.dump(class_names, f)
+
+    print("Training complete.")
+    print("Weights saved at:", weights_path)
+    print("Full model saved at:", model_path)
@@ -0,0 +1,99 @@
+# export_runner.py
+
+import json
+import os
+import numpy as np
+
+from src.config import (
+    IMG_SIZE,
+    CALIBRATION_SAMPLES,
+    DRIFT_EVAL_SAMPLES,
+    FOLD_NORMALIZATION,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED
+)
+from src.model import build_base_model, build_classification_model
+from src.export import load_split_images, export_tflite, measure_drift
+from src.splits import get_or_create_splits
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+
+DATA_DIR = "data/cotton_disease"
+ARTIFACTS_DIR = "artifacts"
+WEIGHTS_PATH = f"{ARTIFACTS_DIR}/cotton_disease_finetuned.weights.h5"
+
+# --------------------------------------------------
+# Load trained Keras model
+# --------------------------------------------------
+
+with open(f"{ARTIFACTS_DIR}/class_names.json", "r", encoding="utf-8") as f:
+    class_names = json.load(f)
+
+model = build_classification_model(
+    img_size=IMG_SIZE,
+    num_classes=len(class_names),
+    base_model=build_base_model(IMG_SIZE, weights=None),
+    data_augmentation=None,
+    include_normalization=FOLD_NORMALIZATION
+)
+model.load_weights(WEIGHTS_PATH)
+
+# --------------------------------------------------
+# Calibration & evaluation data
+# --------------------------------------------------
+
+print("Loading calibration and evaluation images...")
+
+get_or_create_splits(
+    DATA_DIR,
+    SPLITS_DIR,
+    val_fraction=VAL_FRACTION,
+    test_fraction=TEST_FRACTION,
+    seed=SPLIT_SEED
+)
+
+# Calibrate on training images only; measure drift on a bounded
+# sample of the held-out test split.
+# Raw uint8 pixels when normalization is folded into the graph
+calibration_images, _ = load_split_images(
+    SPLITS_DIR, "train", IMG_SIZE, CALIBRATION_SAMPLES,
+    normalize=not FOLD_NORMALIZATION, seed=SPLIT_SEED
+)
+eval_images, eval_labels = load_split_images(
+    SPLITS_DIR, "test", IMG_SIZE, DRIFT_EVAL_SAMPLES,
+    normalize=not FOLD_NORMALIZATION, seed=SPLIT_SEED
+)
+
+keras_probs = model.predict(eval_images, verbose=0)
+
+report = {
+    "keras": {
+        "size_mb": round(os.path.getsize(WEIGHTS_PATH) / 1e6, 3),
+        "accuracy": float(np.mean(np.argmax(keras_probs, axis=1) == eval_labels)),
+    }
+}
+
+# --------------------------------------------------
+# Export float16 and full-int8 models
+# --------------------------------------------------
+
+for quantization in ("float16", "int8"):
+    print(f"Exporting {quantization} TFLite model...")
+
+    path = export_tflite(
+        model,
+        f"{ARTIFACTS_DIR}/cotton_disease_{quantization}.tflite",
+        quantization=quantization,
+        calibration_images=calibration_images
+    )
+    report[quantization] = measure_drift(keras_probs, path, eval_images, eval_labels)
+
+with open(f"{ARTIFACTS_DIR}/tflite_export_report.json", "w") as f:
+    json.dump(report, f, indent=2)
+
+print(json.dumps(report, indent=2))
+print("Export complete.")
@@ -0,0 +1,162 @@
+# load_test_runner.py
+#
+# Replays real JPEG / PNG uploads against /detect, /predict and
+# /export/pdf and reports throughput, latency percentiles and
+# histograms, error rates, server CPU / RSS and the change of every
+# server-side metric on /metrics over the run.
+# Examples (from project-root):
+#   # In-process (ASGI, no sockets); --env applies settings before the app is imported
+#   python load_test_runner.py --concurrency 32 --env MAX_BATCH_SIZE=16 --label batch16
+#   # Against uvicorn (pass its PID to sample the master and its workers)
+#   uvicorn api.app:app --port 8000 --workers 2 &
+#   python load_test_runner.py --target http://127.0.0.1:8000 --server-pid $! \
+#       --rate 40 --duration 60 --label workers2
+# With several uvicorn workers, /metrics reflects whichever worker answers.
+# In-process, server CPU / RSS also include the load generator itself
+# (reported as "includes_client": true).
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from src.load_testing import (
+    ASGITransport,
+    HTTPTransport,
+    ResourceSampler,
+    load_payloads,
+    metrics_delta,
+    parse_mix,
+    run_load,
+    scrape_metrics,
+    wait_until_ready
+)
+
+
+def create_transport(target: str, concurrency: int, env: list):
+    if target == "inprocess":
+        for setting in env:
+            key, _, value = setting.partition("=")
+            os.environ[key] = value
+
+        # Imported late so --env reaches src.config
+        from api.app import app
+        return ASGITransport(app), os.getpid()
+
+    if env:
+        raise SystemExit("--env only applies to --target inprocess")
+
+    url = urlparse(target)
+    return HTTPTransport(url.hostname, url.port or 80, concurrency), None
+
+
+async def main(args) -> dict:
+    transport, server_pid = create_transport(args.target, args.concurrency, args.env)
+    server_pid = args.server_pid or server_pid
+
+    payloads = load_payloads(args.images, limit=args.payloads)
+    mix = parse_mix(args.mix)
+
+    await transport.startup()
+    try:
+        print("Waiting for /ready...")
+        await wait_until_ready(transport)
+
+        if args.warmup > 0:
+            print(f"Warming up for {args.warmup}s...")
+            await run_load(transport, payloads, mix, args.concurrency, args.warmup, args.rate)
+
+        sampler = ResourceSampler(server_pid) if server_pid else None
+        sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+        metrics_before = await scrape_metrics(transport)
+
+        print(
+            f"Running {args.duration}s at concurrency {args.concurrency}"
+            + (f", {args.rate} req/s" if args.rate else " (closed loop)")
+            + "..."
+        )
+        results = await run_load(
+            transport, payloads, mix, args.concurrency, args.duration, args.rate
+        )
+
+        metrics_after = await scrape_metrics(transport)
+        if sampler_task:
+            sampler_task.cancel()
+    finally:
+        await transport.shutdown()
+
+    return {
+        "label": args.label,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": {
+            "target": args.target,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration": args.duration,
+            "payloads": len(payloads),
+            "env": args.env,
+        },
+        **results,
+        "server_resources": (
+            {
+                **sampler.summary(),
+                # In-process, the sampled process also runs the load generator
+                "includes_client": args.target == "inprocess" and not args.server_pid,
+            }
+            if sampler else None
+        ),
+        "server_metrics": metrics_delta(metrics_before, metrics_after),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP load test for the API")
+    parser.add_argument("--target", default="inprocess",
+                        help='"inprocess" or a server URL such as http://127.0.0.1:8000')
+    parser.add_argument("--images", default="data/cotton_disease",
+                        help="directory of JPEG / PNG files to upload")
+    parser.add_argument("--payloads", type=int, default=200,
+                        help="distinct images to cycle through")
+    parser.add_argument("--mix", default="/detect=8,/predict=1,/export/pdf=1",
+                        help="endpoint weights")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="max requests in flight")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="target requests/sec (open loop); default: closed loop")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=5.0,
+                        help="seconds of unrecorded load first")
+    parser.add_argument("--env", action="append", default=[],
+                        help="KEY=VALUE server setting (in-process only, repeatable)")
+    parser.add_argument("--server-pid", type=int, default=None,
+                        help="uvicorn PID for CPU / RSS sampling")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", default=None,
+                        help="default: artifacts/load_tests/<label>.json")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+
+    overall = report["overall"]
+    print(
+        f"{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+        f"error rate {overall['error_rate']:.2%}"
+    )
+    for path, row in report["endpoints"].items():
+        latency = row["latency_ms"]
+        print(
+            f"  {path:<12} {row['throughput_rps']:>8} req/s  "
+            f"p50={latency['p50']} ms  p90={latency['p90']} ms  p99={latency['p99']} ms  "
+            f"errors={row['error_rate']:.2%}  {row['status_codes']}"
+        )
+    if report["server_resources"]:
+        print("  server:", report["server_resources"])
+
+    output = args.output or f"artifacts/load_tests/{args.label}.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Report written to:", output)
@@ -4,10 +4,10 @@ from src.config import (
     LEARNING_RATE,
     EPOCHS,
     EARLY_STOPPING_PATIENCE,
-    FINE_TUNE_AT
+    FINE_TUNE_AT,
+    AUGMENTATION_POLICY
 )
 from src.data_loader import load_image_dataset, prepare_dataset
-from src.preprocessing import get_data_augmentation
 from src.model import (
     build_base_model,
     build_classification_model,
@@ -27,17 +27,16 @@ MODEL_DIR = "artifacts"
 train_ds, class_names = load_image_dataset(
     DATA_DIR, IMG_SIZE, BATCH_SIZE
 )
-train_ds = prepare_dataset(train_ds)
+# Augmentation runs in the input pipeline, not in the model graph
+train_ds = prepare_dataset(train_ds, augmentation_policy=AUGMENTATION_POLICY)
 
 # Build model
 base_model = build_base_model(IMG_SIZE)
-augmentation = get_data_augmentation()
 
 model = build_classification_model(
     IMG_SIZE,
     len(class_names),
-    base_model,
-    augmentation
+    base_model
 )
 
 # Initial training
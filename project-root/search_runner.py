@@ -0,0 +1,74 @@
+# search_runner.py
+#
+# Hyperparameter search over learning rate, batch size, dropout,
+# fine-tune depth and input size (see src.hparam_search.SEARCH_SPACE).
+# Example (from project-root):
+#   python search_runner.py --trials 18 --workers 3 --max-epochs 9 --eta 3
+
+import argparse
+
+from src.config import (
+    EARLY_STOPPING_PATIENCE,
+    DATASET_CACHE_DIR,
+    FEATURE_CACHE_DIR,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED
+)
+from src.hparam_search import SEARCH_SPACE, sample_configs, successive_halving
+from src.splits import get_or_create_splits
+
+if __name__ == "__main__":
+    # Guarded: spawned trial workers re-import this module
+    parser = argparse.ArgumentParser(description="Hyperparameter search")
+    parser.add_argument("--data-dir", default="data/cotton_disease")
+    parser.add_argument("--output-dir", default="artifacts/hparam_search")
+    parser.add_argument("--trials", type=int, default=18)
+    parser.add_argument("--workers", type=int, default=2,
+                        help="trials trained concurrently")
+    parser.add_argument("--min-epochs", type=int, default=1,
+                        help="fine-tuning epochs in the first rung")
+    parser.add_argument("--max-epochs", type=int, default=9,
+                        help="fine-tuning epochs of the surviving trials")
+    parser.add_argument("--eta", type=int, default=3,
+                        help="keep the best 1/eta trials at every rung")
+    parser.add_argument("--head-epochs", type=int, default=10,
+                        help="frozen-backbone epochs on cached features")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    get_or_create_splits(
+        args.data_dir,
+        SPLITS_DIR,
+        val_fraction=VAL_FRACTION,
+        test_fraction=TEST_FRACTION,
+        seed=SPLIT_SEED
+    )
+
+    configs = sample_configs(SEARCH_SPACE, args.trials, seed=args.seed)
+    print(f"Searching {len(configs)} configurations with {args.workers} workers...")
+
+    result = successive_halving(
+        configs,
+        output_dir=args.output_dir,
+        splits_dir=SPLITS_DIR,
+        cache_dir=DATASET_CACHE_DIR,
+        feature_cache_dir=FEATURE_CACHE_DIR,
+        min_epochs=args.min_epochs,
+        max_epochs=args.max_epochs,
+        eta=args.eta,
+        head_epochs=args.head_epochs,
+        early_stopping_patience=EARLY_STOPPING_PATIENCE,
+        num_workers=args.workers
+    )
+
+    print("\nLeaderboard (* = accuracy/latency Pareto front):")
+    for entry in result["leaderboard"]:
+        marker = "*" if entry["pareto"] else " "
+        print(
+            f"{marker} trial {entry['trial']:3d}  "
+            f"val_accuracy={entry['val_accuracy']:.4f}  "
+            f"p50={entry['latency']['p50_ms']:.2f} ms  {entry['config']}"
+        )
+    print("Written to:", f"{args.output_dir}/leaderboard.json")
@@ -0,0 +1,129 @@
+# src/batching.py
+
+import asyncio
+import numpy as np
+
+
+class BatchScheduler:
+    """
+    Dynamic micro-batching for concurrent inference requests.
+
+    Images submitted by concurrent requests are queued and flushed as a
+    single batch when either `max_batch_size` images are waiting or the
+    oldest queued image has waited `max_wait_ms`. The forward pass runs
+    in an executor so the event loop keeps serving other connections.
+    """
+
+    def __init__(
+        self,
+        predict_fn,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor=None
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+
+        self._queue = None
+        self._worker = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        """
+        Starts the background flush loop on the running event loop.
+        """
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Stops the flush loop and fails any request still waiting.
+        """
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batch scheduler stopped"))
+
+    async def submit(self, image: np.ndarray) -> np.ndarray:
+        """
+        Queues a single preprocessed image (H, W, C) and waits for
+        its prediction vector.
+        """
+        if not self.running:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            # One bad batch must never end the loop: its requests fail
+            # and later ones are still served
+            try:
+                await self._flush(batch, loop)
+            except Exception as e:
+                self._fail(batch, e)
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _flush(self, batch: list, loop):
+        # Requests cancelled while queued (client disconnects) are dropped
+        batch = [(image, future) for image, future in batch if not future.done()]
+        if not batch:
+            return
+
+        try:
+            # Mismatched shapes / dtypes fail here, for this batch only
+            images = np.stack([image for image, _ in batch], axis=0)
+            preds = await loop.run_in_executor(
+                self.executor, self.predict_fn, images
+            )
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        for (_, future), pred in zip(batch, preds):
+            if not future.done():
+                future.set_result(pred)
@@ -0,0 +1,58 @@
+# src/benchmarking.py
+
+import resource
+import time
+import numpy as np
+
+
+def time_calls(fn, *args, repeats: int = 100, warmup: int = 5):
+    """
+    Calls fn(*args) repeatedly and returns per-call latencies in ms.
+    """
+    for _ in range(warmup):
+        fn(*args)
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    return latencies
+
+
+def latency_summary(latencies_ms: list) -> dict:
+    """
+    Summarises latency samples (ms) as mean / p50 / p90 / p99.
+    """
+    samples = np.asarray(latencies_ms, dtype=np.float64)
+
+    return {
+        "count": int(samples.size),
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p90_ms": round(float(np.percentile(samples, 90)), 3),
+        "p99_ms": round(float(np.percentile(samples, 99)), 3),
+    }
+
+
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process in MiB (Linux; 0.0 elsewhere).
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return 0.0
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process in MiB.
+    """
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
@@ -0,0 +1,399 @@
+# src/bulk_inference.py
+#
+# Offline scoring of large image collections: files are read and
+# decoded by a thread pool several batches ahead of the model, results
+# are appended to CSV / JSONL (or Parquet parts) after every batch, and
+# a restarted run skips every path already in the output.
+
+import csv
+import json
+import os
+from collections import deque
+
+import numpy as np
+
+from src.executors import create_executor
+from src.image_decode import allocate_batch, decode_image
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+RESULT_FIELDS = ("path", "predicted_class", "confidence", "error")
+
+# --------------------------------------------------
+# Models (any artifact, either backend)
+# --------------------------------------------------
+
+def load_artifact(
+    model_path: str,
+    class_names_path: str = "artifacts/class_names.json",
+    num_threads: int | None = None
+):
+    """
+    Loads a `.tflite`, `.keras`, `.npz` or legacy `.weights.h5` artifact
+    behind the common predict_batch API.
+
+    Returns (model, class_names); the model is already warmed up.
+    """
+    if model_path.endswith((".tflite", ".weights.h5")):
+        with open(class_names_path, "r", encoding="utf-8") as f:
+            class_names = json.load(f)
+
+    if model_path.endswith(".tflite"):
+        # TensorFlow itself is never imported when LiteRT is installed
+        from src.tflite_inference import TFLiteInferenceModel
+        model = TFLiteInferenceModel(model_path, num_threads=num_threads)
+
+    else:
+        import tensorflow as tf
+        from src.inference import InferenceModel, load_classifier
+
+        if num_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+
+        if model_path.endswith(".weights.h5"):
+            from src.config import IMG_SIZE
+            from src.model import build_base_model, build_classification_model
+
+            keras_model = build_classification_model(
+                img_size=IMG_SIZE,
+                num_classes=len(class_names),
+                base_model=build_base_model(IMG_SIZE, weights=None),
+                data_augmentation=None
+            )
+            keras_model.load_weights(model_path)
+        else:
+            keras_model, class_names = load_classifier(model_path)
+
+        model = InferenceModel(keras_model)
+
+    model.warmup()
+    return model, class_names
+
+# --------------------------------------------------
+# Inputs
+# --------------------------------------------------
+
+def iter_image_files(root: str):
+    """
+    Yields image paths under `root` in a stable (sorted) order.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+def read_manifest(manifest_path: str):
+    """
+    Yields image paths from a manifest: one path per line (.txt), or a
+    CSV with a `path` column. Relative paths resolve against the
+    manifest's directory.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+        if manifest_path.endswith(".csv"):
+            paths = (row["path"] for row in csv.DictReader(f))
+        else:
+            paths = (line.strip() for line in f)
+
+        for path in paths:
+            if path and not path.startswith("#"):
+                yield os.path.join(base_dir, path)
+
+
+def iter_inputs(source: str):
+    return iter_image_files(source) if os.path.isdir(source) else read_manifest(source)
+
+# --------------------------------------------------
+# Parallel prefetching decode
+# --------------------------------------------------
+
+def _chunks(iterable, size: int):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _load_image(path: str, img_size: int, out: np.ndarray):
+    """
+    Reads and decodes one file into `out`; returns an error string on
+    failure (missing, truncated or non-image files) instead of raising.
+    """
+    try:
+        with open(path, "rb") as f:
+            decode_image(f.read(), img_size, out=out)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def prefetch_batches(
+    paths,
+    batch_size: int,
+    img_size: int,
+    dtype=np.float32,
+    workers: int = 4,
+    prefetch: int = 4
+):
+    """
+    Yields (paths, images, errors) batches, decoded by `workers`
+    threads up to `prefetch` batches ahead of the consumer.
+
+    `images` holds only the decodable files, in the order of the
+    matching `paths`; `errors` maps every other path to its error.
+    PIL releases the GIL while decoding, so threads scale.
+    """
+    with create_executor("thread", workers, "decode") as pool:
+
+        def submit(chunk):
+            batch = allocate_batch(len(chunk), img_size, dtype)
+            futures = [
+                pool.submit(_load_image, path, img_size, batch[i])
+                for i, path in enumerate(chunk)
+            ]
+            return chunk, batch, futures
+
+        pending = deque()
+        chunks = _chunks(paths, batch_size)
+
+        for chunk in chunks:
+            pending.append(submit(chunk))
+            if len(pending) < prefetch:
+                continue
+
+            yield _collect(*pending.popleft())
+
+        while pending:
+            yield _collect(*pending.popleft())
+
+
+def _collect(chunk: list, batch: np.ndarray, futures: list):
+    errors = {}
+    ok = []
+    for i, (path, future) in enumerate(zip(chunk, futures)):
+        error = future.result()
+        if error is None:
+            ok.append(i)
+        else:
+            errors[path] = error
+
+    if len(ok) < len(chunk):
+        batch = batch[ok]
+    return [chunk[i] for i in ok], batch, errors
+
+# --------------------------------------------------
+# Result writers (append + resume)
+# --------------------------------------------------
+
+def _truncate_partial_line(path: str):
+    """
+    Drops a half-written last line left by a killed run.
+    """
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class CSVResultWriter:
+    def __init__(self, path: str):
+        self.path = path
+
+    def completed_paths(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        _truncate_partial_line(self.path)
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            return {row["path"] for row in csv.DictReader(f)}
+
+    def __enter__(self):
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+        if new_file:
+            self._writer.writeheader()
+        return self
+
+    def write(self, rows: list):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class JSONLResultWriter:
+    def __init__(self, path: str):
+        self.path = path
+
+    def completed_paths(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        _truncate_partial_line(self.path)
+        with open(self.path, "r", encoding="utf-8") as f:
+            return {json.loads(line)["path"] for line in f if line.strip()}
+
+    def __enter__(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def write(self, rows: list):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class ParquetResultWriter:
+    """
+    Parquet files cannot be appended to, so `path` is a directory of
+    part files, one written every `rows_per_part` rows (requires pyarrow).
+    Rows still buffered are lost if the run is killed, so parts are
+    kept small.
+    """
+
+    def __init__(self, path: str, rows_per_part: int = 1000):
+        self.path = path
+        self.rows_per_part = rows_per_part
+        self._buffer = []
+
+    def _parts(self) -> list:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            name for name in os.listdir(self.path)
+            if name.startswith("part-") and name.endswith(".parquet")
+        )
+
+    def completed_paths(self) -> set:
+        import pyarrow.parquet as pq
+
+        done = set()
+        for name in self._parts():
+            table = pq.read_table(os.path.join(self.path, name), columns=["path"])
+            done.update(table.column("path").to_pylist())
+        return done
+
+    def __enter__(self):
+        os.makedirs(self.path, exist_ok=True)
+        self._next_part = len(self._parts())
+        return self
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._buffer:
+            return
+
+        schema = pa.schema([
+            ("path", pa.string()),
+            ("predicted_class", pa.string()),
+            ("confidence", pa.float64()),
+            ("error", pa.string()),
+        ])
+        table = pa.Table.from_pylist(self._buffer, schema=schema)
+        part_path = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+
+        # Written under a temporary name so a killed run leaves no partial part
+        pq.write_table(table, f"{part_path}.tmp")
+        os.replace(f"{part_path}.tmp", part_path)
+
+        self._next_part += 1
+        self._buffer = []
+
+    def write(self, rows: list):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.rows_per_part:
+            self._flush()
+
+    def __exit__(self, *exc):
+        self._flush()
+
+
+def create_writer(output_path: str, output_format: str | None = None):
+    """
+    Picks the writer from `output_format` or the output extension.
+    """
+    if output_format is None:
+        ext = os.path.splitext(output_path)[1].lower()
+        output_format = {".csv": "csv", ".jsonl": "jsonl"}.get(ext, "parquet")
+
+    if output_format == "csv":
+        return CSVResultWriter(output_path)
+    if output_format == "jsonl":
+        return JSONLResultWriter(output_path)
+    if output_format == "parquet":
+        return ParquetResultWriter(output_path)
+
+    raise ValueError(f"Unknown output format: {output_format} (use csv, jsonl or parquet)")
+
+# --------------------------------------------------
+# Scoring loop
+# --------------------------------------------------
+
+def score_images(
+    model,
+    class_names: list,
+    paths,
+    writer,
+    batch_size: int = 64,
+    workers: int = 4,
+    prefetch: int = 4,
+    progress=None
+) -> dict:
+    """
+    Scores every path not already in the writer's output and appends
+    one row per image (unreadable images get an `error` instead of a
+    prediction). Returns run statistics.
+    """
+    done = writer.completed_paths()
+    stats = {"skipped": 0, "scored": 0, "failed": 0}
+
+    # Only inputs of this run count as skipped, not every row on disk
+    def pending(paths):
+        for path in paths:
+            if path in done:
+                stats["skipped"] += 1
+            else:
+                yield path
+
+    todo = pending(paths)
+
+    with writer:
+        for batch_paths, images, errors in prefetch_batches(
+            todo, batch_size, model.img_size, model.input_dtype, workers, prefetch
+        ):
+            rows = [
+                {"path": path, "predicted_class": None, "confidence": None, "error": error}
+                for path, error in errors.items()
+            ]
+
+            if batch_paths:
+                probs = model.predict_batch(images)
+                indices = np.argmax(probs, axis=1)
+                rows += [
+                    {
+                        "path": path,
+                        "predicted_class": class_names[int(index)],
+                        "confidence": round(float(p[index]), 6),
+                        "error": None,
+                    }
+                    for path, p, index in zip(batch_paths, probs, indices)
+                ]
+
+            writer.write(rows)
+            stats["scored"] += len(batch_paths)
+            stats["failed"] += len(errors)
+
+            if progress is not None:
+                progress(len(rows))
+
+    return stats
@@ -0,0 +1,89 @@
+# src/checkpointing.py
+
+import os
+import tensorflow as tf
+from tensorflow import keras
+
+
+class PhaseCheckpointer:
+    """
+    Periodic checkpoints for one training phase ("initial" or
+    "finetune"): model weights, optimizer state, the next epoch to run
+    and whether the phase has finished.
+
+    Saves are asynchronous by default: the checkpoint is copied to host
+    memory and written by a background thread while training continues.
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        phase: str,
+        model: keras.Model,
+        optimizer=None,
+        max_to_keep: int = 2,
+        async_save: bool = True
+    ):
+        self.phase = phase
+        self.directory = os.path.join(checkpoint_dir, phase)
+
+        self.epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self.completed = tf.Variable(False, trainable=False)
+
+        tracked = {"model": model, "epoch": self.epoch, "completed": self.completed}
+        if optimizer is not None:
+            # Slot variables must exist before they can be restored into
+            optimizer.build(model.trainable_variables)
+            tracked["optimizer"] = optimizer
+
+        self.checkpoint = tf.train.Checkpoint(**tracked)
+        self.manager = tf.train.CheckpointManager(
+            self.checkpoint, self.directory, max_to_keep=max_to_keep
+        )
+        self.options = tf.train.CheckpointOptions(
+            experimental_enable_async_checkpoint=async_save
+        )
+
+    @property
+    def is_completed(self) -> bool:
+        return bool(self.completed.numpy())
+
+    def restore(self) -> int:
+        """
+        Restores the latest checkpoint, if any.
+
+        Returns the epoch to resume from (0 when starting fresh).
+        """
+        latest = self.manager.latest_checkpoint
+        if latest is None:
+            return 0
+
+        self.checkpoint.restore(latest).expect_partial()
+        return int(self.epoch.numpy())
+
+    def save(self, epoch: int, completed: bool = False):
+        self.epoch.assign(epoch)
+        self.completed.assign(completed)
+        self.manager.save(checkpoint_number=epoch, options=self.options)
+
+    def sync(self):
+        """
+        Blocks until pending asynchronous writes are on disk.
+        """
+        self.checkpoint.sync()
+
+    def callback(self, save_every: int = 1):
+        return _CheckpointCallback(self, save_every)
+
+
+class _CheckpointCallback(keras.callbacks.Callback):
+
+    def __init__(self, checkpointer: PhaseCheckpointer, save_every: int):
+        super().__init__()
+        self.checkpointer = checkpointer
+        self.save_every = save_every
+
+    def on_epoch_end(self, epoch, logs=None):
+        # `epoch` is 0-based; store the next epoch to run
+        if (epoch + 1) % self.save_every == 0:
+            self.checkpointer.save(epoch + 1)
@@ -0,0 +1,275 @@
+# src/compression.py
+#
+# Magnitude pruning and weight clustering applied by callbacks during a
+# short fine-tune, directly on the Keras layers (tfmot's wrappers do not
+# support Keras 3). Nothing wraps the layers, so there is nothing to
+# strip: the result is a plain model whose kernels are sparse and use at
+# most `num_clusters` distinct values, saved as palette indices.
+
+import json
+import numpy as np
+from tensorflow import keras
+from tensorflow.keras import layers
+
+
+def _kernel(layer):
+    if isinstance(layer, layers.DepthwiseConv2D):
+        return layer.depthwise_kernel
+    return layer.kernel
+
+
+def kernel_layers(model: keras.Model, structure: str = "unstructured") -> list:
+    """
+    Conv / Dense layers whose kernels get compressed, including those
+    nested in the backbone. Channel pruning only touches Conv2D layers
+    (removing Dense units would remove classes).
+    """
+    types = (layers.Conv2D,) if structure == "channel" else (
+        layers.Conv2D, layers.DepthwiseConv2D, layers.Dense
+    )
+
+    found = []
+    for layer in model.layers:
+        if isinstance(layer, keras.Model):
+            found += kernel_layers(layer, structure)
+        elif isinstance(layer, types):
+            found.append(layer)
+    return found
+
+
+# --------------------------------------------------
+# Pruning
+# --------------------------------------------------
+
+def polynomial_sparsity(
+    step: int,
+    initial_sparsity: float,
+    final_sparsity: float,
+    begin_step: int,
+    end_step: int
+) -> float:
+    """
+    Sparsity ramp used by tfmot's PolynomialDecay (power 3): prunes fast
+    early, then slowly while the network recovers.
+    """
+    progress = min(max((step - begin_step) / max(end_step - begin_step, 1), 0.0), 1.0)
+    return final_sparsity + (initial_sparsity - final_sparsity) * (1.0 - progress) ** 3
+
+
+def magnitude_mask(kernel: np.ndarray, sparsity: float, structure: str) -> np.ndarray:
+    """
+    Zeroes the smallest-magnitude weights (unstructured) or the output
+    channels with the smallest L1 norm (channel).
+    """
+    if structure == "channel":
+        scores = np.abs(kernel).reshape(-1, kernel.shape[-1]).sum(axis=0)
+        num_pruned = int(sparsity * scores.size)
+        mask = np.ones(scores.size, dtype=kernel.dtype)
+        mask[np.argsort(scores)[:num_pruned]] = 0
+        return np.broadcast_to(mask, kernel.shape).copy()
+
+    num_pruned = int(sparsity * kernel.size)
+    mask = np.ones(kernel.size, dtype=kernel.dtype)
+    mask[np.argsort(np.abs(kernel), axis=None)[:num_pruned]] = 0
+    return mask.reshape(kernel.shape)
+
+
+class PruningCallback(keras.callbacks.Callback):
+    """
+    Recomputes magnitude masks every `frequency` steps along the
+    polynomial schedule and re-applies them after every step, so
+    pruned weights stay at zero while the rest fine-tune.
+    """
+
+    def __init__(
+        self,
+        target_layers: list,
+        final_sparsity: float,
+        end_step: int,
+        initial_sparsity: float = 0.0,
+        begin_step: int = 0,
+        frequency: int = 100,
+        structure: str = "unstructured"
+    ):
+        super().__init__()
+        self.target_layers = target_layers
+        self.final_sparsity = final_sparsity
+        self.initial_sparsity = initial_sparsity
+        self.begin_step = begin_step
+        self.end_step = end_step
+        self.frequency = frequency
+        self.structure = structure
+        self.step = 0
+        self.masks = [None] * len(target_layers)
+
+    def _apply(self):
+        for layer, mask in zip(self.target_layers, self.masks):
+            if mask is not None:
+                kernel = _kernel(layer)
+                kernel.assign(kernel.numpy() * mask)
+
+    def on_train_batch_end(self, batch, logs=None):
+        in_schedule = self.begin_step <= self.step <= self.end_step
+        if in_schedule and (
+            (self.step - self.begin_step) % self.frequency == 0
+            or self.step == self.end_step
+        ):
+            sparsity = polynomial_sparsity(
+                self.step, self.initial_sparsity, self.final_sparsity,
+                self.begin_step, self.end_step
+            )
+            self.masks = [
+                magnitude_mask(_kernel(layer).numpy(), sparsity, self.structure)
+                for layer in self.target_layers
+            ]
+
+        self._apply()
+        self.step += 1
+
+    def on_train_end(self, logs=None):
+        # Runs after EarlyStopping may have restored older weights
+        self._apply()
+
+
+# --------------------------------------------------
+# Clustering
+# --------------------------------------------------
+
+def cluster_kernel(
+    kernel: np.ndarray,
+    num_clusters: int,
+    max_samples: int = 100_000,
+    seed: int = 0
+):
+    """
+    1-D k-means over the non-zero weights. Returns (centroids,
+    assignments); centroid 0 is reserved for pruned (zero) weights so
+    sparsity survives clustering.
+    """
+    # Training-only dependency: serving never clusters
+    from sklearn.cluster import KMeans
+
+    flat = kernel.ravel()
+    nonzero = flat != 0
+    assignments = np.zeros(flat.size, dtype=np.int64)
+    values = flat[nonzero].reshape(-1, 1)
+
+    k = min(num_clusters - 1, len(np.unique(values)))
+    if k < 1:
+        return np.zeros(1, dtype=kernel.dtype), assignments.reshape(kernel.shape)
+
+    # Fit on a sample, assign every weight
+    sample = values
+    if len(values) > max_samples:
+        rng = np.random.default_rng(seed)
+        sample = values[rng.choice(len(values), max_samples, replace=False)]
+
+    kmeans = KMeans(n_clusters=k, n_init=1, random_state=seed).fit(sample)
+
+    centroids = np.concatenate([[0.0], kmeans.cluster_centers_.ravel()]).astype(kernel.dtype)
+    assignments[nonzero] = kmeans.predict(values) + 1
+    return centroids, assignments.reshape(kernel.shape)
+
+
+class ClusteringCallback(keras.callbacks.Callback):
+    """
+    Clusters every target kernel when training starts, then keeps the
+    weights tied: after each step a cluster's centroid becomes the mean
+    of its members (the averaged update tfmot applies to shared
+    centroids) and every weight is snapped back to its centroid.
+    """
+
+    def __init__(self, target_layers: list, num_clusters: int = 16):
+        super().__init__()
+        self.target_layers = target_layers
+        self.num_clusters = num_clusters
+        self.assignments = []
+
+    def on_train_begin(self, logs=None):
+        self.assignments = []
+        for layer in self.target_layers:
+            kernel = _kernel(layer)
+            centroids, assignments = cluster_kernel(kernel.numpy(), self.num_clusters)
+            kernel.assign(centroids[assignments])
+            self.assignments.append(assignments)
+
+    def _snap(self):
+        for layer, assignments in zip(self.target_layers, self.assignments):
+            kernel = _kernel(layer)
+            flat, index = kernel.numpy().ravel(), assignments.ravel()
+
+            counts = np.bincount(index, minlength=index.max() + 1)
+            sums = np.bincount(index, weights=flat, minlength=counts.size)
+            centroids = sums / np.maximum(counts, 1)
+            centroids[0] = 0.0
+
+            kernel.assign(centroids[assignments].astype(flat.dtype))
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._snap()
+
+    def on_train_end(self, logs=None):
+        self._snap()
+
+
+# --------------------------------------------------
+# Compressed artifact
+# --------------------------------------------------
+
+def model_sparsity(model: keras.Model) -> float:
+    kernels = [_kernel(layer).numpy() for layer in kernel_layers(model)]
+    zeros = sum(int((k == 0).sum()) for k in kernels)
+    return zeros / max(sum(k.size for k in kernels), 1)
+
+
+def save_compressed(
+    model: keras.Model,
+    path: str,
+    class_names: list,
+    max_palette: int = 256
+) -> str:
+    """
+    Writes architecture + weights + class names to one compressed .npz.
+
+    Weights with at most `max_palette` distinct values (the clustered
+    kernels) are stored as uint8 indices into a float32 palette; zeros
+    from pruning make the indices compress further.
+    """
+    arrays = {
+        "architecture": np.frombuffer(model.to_json().encode(), dtype=np.uint8),
+        "class_names": np.frombuffer(json.dumps(class_names).encode(), dtype=np.uint8),
+    }
+
+    for i, weight in enumerate(model.weights):
+        value = np.asarray(weight.numpy())
+        if value.ndim >= 2:
+            palette, indices = np.unique(value, return_inverse=True)
+            if len(palette) <= max_palette:
+                arrays[f"w{i}_palette"] = palette.astype(np.float32)
+                arrays[f"w{i}_indices"] = indices.reshape(value.shape).astype(np.uint8)
+                continue
+        arrays[f"w{i}"] = value
+
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+def load_compressed(path: str):
+    """
+    Loads an artifact written by `save_compressed`.
+
+    Returns (model, class_names).
+    """
+    with np.load(path) as data:
+        model = keras.models.model_from_json(data["architecture"].tobytes().decode())
+        class_names = json.loads(data["class_names"].tobytes().decode())
+
+        values = []
+        for i in range(len(model.weights)):
+            if f"w{i}" in data:
+                values.append(data[f"w{i}"])
+            else:
+                values.append(data[f"w{i}_palette"][data[f"w{i}_indices"]])
+
+    model.set_weights(values)
+    return model, class_names
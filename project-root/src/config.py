@@ -1,5 +1,7 @@
 # src/config.py
 
+import os
+
 # Image & dataset
 IMG_SIZE = 160
 BATCH_SIZE = 32
@@ -10,5 +12,81 @@ EPOCHS = 50
 EARLY_STOPPING_PATIENCE = 3
 FINE_TUNE_AT = 100
 
+# Stratified hold-out splits, written once as file manifests
+VAL_FRACTION = 0.15
+TEST_FRACTION = 0.15
+SPLIT_SEED = 42
+# Evaluation runs without gradients, so it can use much larger batches
+EVAL_BATCH_SIZE = 128
+
+# Fold [0, 255] -> [-1, 1] normalization into the model graph so
+# clients and the API can feed uint8 images
+FOLD_NORMALIZATION = False
+
+# Augmentation policy for the tf.data pipeline:
+# "none", "light", "standard" or "strong"
+AUGMENTATION_POLICY = "standard"
+
 # Paths
 DEFAULT_MODEL_DIR = "artifacts"
+MODEL_PATH = os.getenv("MODEL_PATH", "artifacts/cotton_disease_classifier.keras")
+SPLITS_DIR = "data/splits"
+DATASET_CACHE_DIR = "data/cache/tfrecords"
+DATASET_CACHE_SHARDS = 8
+FEATURE_CACHE_DIR = "data/cache/features"
+CHECKPOINT_DIR = "artifacts/checkpoints"
+CHECKPOINT_EVERY_EPOCHS = 1
+CHECKPOINT_ASYNC = True
+
+# Train the frozen-backbone phase on cached GlobalAveragePooling2D
+# features instead of running MobileNetV2 every epoch
+USE_FEATURE_CACHE = True
+
+# Mixed precision: None (float32), "mixed_bfloat16", "mixed_float16",
+# or "auto" (bfloat16 on CPUs with AVX512-BF16/AMX, float16 on GPUs)
+MIXED_PRECISION = None
+# XLA-compile train steps ("auto" keeps the Keras default)
+JIT_COMPILE = "auto"
+
+# Distilled student (distill_runner.py); MODEL_VARIANT=student serves it
+STUDENT_MODEL_PATH = os.getenv(
+    "STUDENT_MODEL_PATH", "artifacts/cotton_disease_student_a0.5_128.keras"
+)
+MODEL_VARIANT = os.getenv("MODEL_VARIANT", "teacher")
+
+# Name of the class-names entry embedded in `.keras` archives
+MODEL_CLASS_NAMES_ENTRY = "class_names.json"
+
+# Serving (overridable through environment variables on the host)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "16"))
+MAX_BATCH_WAIT_MS = float(os.getenv("MAX_BATCH_WAIT_MS", "5"))
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", str(os.cpu_count() or 1)))
+PDF_EXECUTOR = os.getenv("PDF_EXECUTOR", "thread")   # "thread" or "process"
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "1"))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "64"))
+MAX_IMAGES_PER_BATCH = int(os.getenv("MAX_IMAGES_PER_BATCH", "100"))
+MAX_ZIP_ENTRY_BYTES = 20 * 1024 * 1024
+
+# Prediction cache (PREDICTION_CACHE_DB="" keeps it in memory only)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "1024"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+PREDICTION_CACHE_DB = os.getenv("PREDICTION_CACHE_DB", "")
+
+# On-disk cache of rendered PDF reports (PDF_CACHE_DIR="" disables it);
+# a janitor enforces the size / age limits in the background
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "")
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", "50"))
+PDF_CACHE_MAX_AGE = float(os.getenv("PDF_CACHE_MAX_AGE", "86400"))
+PDF_CACHE_JANITOR_INTERVAL = float(os.getenv("PDF_CACHE_JANITOR_INTERVAL", "60"))
+
+# Inference backend: "keras" (traced Keras model) or "tflite"
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras")
+TFLITE_MODEL_PATH = os.getenv(
+    "TFLITE_MODEL_PATH", "artifacts/cotton_disease_int8.tflite"
+)
+TFLITE_THREADS = int(os.getenv("TFLITE_THREADS", str(os.cpu_count() or 1)))
+
+# TFLite export
+CALIBRATION_SAMPLES = 100
+# Held-out test images scored for the Keras vs TFLite drift report
+DRIFT_EVAL_SAMPLES = 1000
@@ -2,61 +2,162 @@
 
 import os
 import tensorflow as tf
-from tensorflow.keras.preprocessing import image_dataset_from_directory
+
+from src.preprocessing import load_image_tf, normalize_tf, get_data_augmentation
 
 AUTOTUNE = tf.data.AUTOTUNE
 
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+
+
+def list_image_files(data_dir: str):
+    """
+    Lists (file_paths, labels, class_names) for a directory laid out
+    as data_dir/<class_name>/<image>.
+
+    Class names are sorted alphabetically, matching the order of
+    `image_dataset_from_directory` used to train earlier models.
+    """
+
+    if not os.path.exists(data_dir):
+        raise FileNotFoundError(f"Dataset directory not found: {data_dir}")
+
+    class_names = sorted(
+        d for d in os.listdir(data_dir)
+        if os.path.isdir(os.path.join(data_dir, d))
+    )
+
+    file_paths, labels = [], []
+    for label, class_name in enumerate(class_names):
+        class_dir = os.path.join(data_dir, class_name)
+        for root, _, files in sorted(os.walk(class_dir)):
+            for filename in sorted(files):
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    file_paths.append(os.path.join(root, filename))
+                    labels.append(label)
+
+    return file_paths, labels, class_names
+
+
+def load_file_dataset(
+    file_paths: list,
+    labels: list,
+    img_size: int,
+    batch_size: int,
+    shuffle: bool = True,
+    seed: int | None = None
+):
+    """
+    Builds a batched (uint8 image, label) dataset from explicit file
+    lists (e.g. one split manifest, see src.splits).
+    """
+
+    dataset = tf.data.Dataset.from_tensor_slices((file_paths, labels))
+
+    if shuffle:
+        dataset = dataset.shuffle(
+            len(file_paths), seed=seed, reshuffle_each_iteration=True
+        )
+
+    dataset = dataset.map(
+        lambda path, label: (load_image_tf(path, img_size), label),
+        num_parallel_calls=AUTOTUNE
+    )
+    return dataset.batch(batch_size)
+
 
 def load_image_dataset(
     data_dir: str,
     img_size: int,
     batch_size: int,
-    shuffle: bool = True
+    shuffle: bool = True,
+    seed: int | None = None
 ):
     """
     Loads image dataset from directory.
 
-    Images are loaded as uint8 [0, 255].
-    Preprocessing is applied later in the pipeline.
+    Images are loaded as uint8 [0, 255] by the shared decoder in
+    `src.preprocessing`, so training sees exactly what the API sees.
+    Normalization is applied later in the pipeline.
     """
 
-    if not os.path.exists(data_dir):
-        raise FileNotFoundError(f"Dataset directory not found: {data_dir}")
-
-    dataset = image_dataset_from_directory(
-        data_dir,
-        labels="inferred",
-        label_mode="int",
-        image_size=(img_size, img_size),
-        batch_size=batch_size,
-        shuffle=shuffle,
-        interpolation="nearest"
+    file_paths, labels, class_names = list_image_files(data_dir)
+    dataset = load_file_dataset(
+        file_paths, labels, img_size, batch_size, shuffle=shuffle, seed=seed
     )
 
-    return dataset, dataset.class_names
+    return dataset, class_names
 
 
 def _normalize(image, label):
     """
     Normalizes images to [-1, 1].
 
-    This MUST match inference preprocessing exactly.
+    Shares its constants with inference preprocessing (src.image_decode).
+    """
+    return normalize_tf(image), label
+
+
+def augment_dataset(
+    dataset: tf.data.Dataset,
+    policy: str = "standard",
+    keep_uint8: bool = False
+):
     """
-    image = tf.cast(image, tf.float32)
-    image = image / 127.5 - 1.0
-    return image, label
+    Vectorized augmentation on whole batches as a parallel tf.data
+    stage, so it overlaps with the training step instead of running
+    inside the model graph.
+
+    Output is float32 [0, 255], or uint8 with keep_uint8=True (for
+    models with in-graph normalization).
+    """
+
+    augmentation = get_data_augmentation(policy)
+    if augmentation is None:
+        return dataset
 
+    def augment(images, labels):
+        images = augmentation(tf.cast(images, tf.float32), training=True)
+        if keep_uint8:
+            images = tf.saturate_cast(tf.round(images), tf.uint8)
+        return images, labels
 
-def prepare_dataset(dataset: tf.data.Dataset, training: bool = True):
+    return dataset.map(augment, num_parallel_calls=AUTOTUNE)
+
+
+def prepare_dataset(
+    dataset: tf.data.Dataset,
+    training: bool = True,
+    normalize: bool = True,
+    augmentation_policy: str = "none",
+    cache: bool = False,
+    shuffle_seed: int | None = None
+):
     """
-    Applies normalization and performance optimizations.
+    Applies augmentation (training only), normalization and performance
+    optimizations.
+
+    Pass normalize=False for models built with include_normalization=True.
+    cache=True keeps the decoded, normalized batches in memory after the
+    first pass (for the fixed validation/test sets).
+    Distributed training must pass the same shuffle_seed on every worker
+    when the dataset is sharded by element (see src.distributed).
     """
 
+    if training and augmentation_policy != "none":
+        dataset = augment_dataset(
+            dataset, augmentation_policy, keep_uint8=not normalize
+        )
+
     # Apply normalization (ONCE)
-    dataset = dataset.map(_normalize, num_parallel_calls=AUTOTUNE)
+    if normalize:
+        dataset = dataset.map(_normalize, num_parallel_calls=AUTOTUNE)
+
+    if cache:
+        dataset = dataset.cache()
 
     if training:
-        dataset = dataset.shuffle(buffer_size=1000)
+        dataset = dataset.shuffle(buffer_size=1000, seed=shuffle_seed)
 
     dataset = dataset.prefetch(AUTOTUNE)
     return dataset
@@ -0,0 +1,168 @@
+# src/dataset_cache.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+
+from src.data_loader import list_image_files, AUTOTUNE
+from src.image_decode import decode_image
+
+MANIFEST_NAME = "manifest.json"
+
+
+def dataset_fingerprint(file_paths: list, labels: list, img_size: int) -> str:
+    """
+    Identifies a dataset by file names, sizes, mtimes, labels and the
+    decode size; any change produces a new fingerprint.
+    """
+    digest = hashlib.sha256(str(img_size).encode())
+    for path, label in zip(file_paths, labels):
+        stat = os.stat(path)
+        digest.update(f"{path}|{stat.st_size}|{int(stat.st_mtime)}|{label}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _decode_file(path: str, img_size: int) -> bytes:
+    with open(path, "rb") as f:
+        out = np.empty((img_size, img_size, 3), dtype=np.uint8)
+        return decode_image(f.read(), img_size, out=out).tobytes()
+
+
+def _example(image_raw: bytes, label: int) -> bytes:
+    return tf.train.Example(features=tf.train.Features(feature={
+        "image": tf.train.Feature(bytes_list=tf.train.BytesList(value=[image_raw])),
+        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[label])),
+    })).SerializeToString()
+
+
+def build_tfrecord_cache(
+    data_dir: str,
+    output_dir: str,
+    img_size: int,
+    num_shards: int = 8,
+    num_workers: int | None = None,
+    files: tuple | None = None
+) -> dict:
+    """
+    Decodes and resizes every image ONCE (with the shared decoder) and
+    writes them as uint8 tensors to sharded TFRecord files.
+
+    `files` = (file_paths, labels, class_names) caches an explicit file
+    list (one split) instead of everything under data_dir.
+
+    Returns the manifest, also written to output_dir/manifest.json.
+    """
+
+    if files is None:
+        files = list_image_files(data_dir)
+    file_paths, labels, class_names = files
+    fingerprint = dataset_fingerprint(file_paths, labels, img_size)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("fingerprint") == fingerprint:
+            return manifest
+
+    os.makedirs(output_dir, exist_ok=True)
+    num_shards = max(1, min(num_shards, len(file_paths)))
+    shard_names = [
+        f"images-{i:05d}-of-{num_shards:05d}.tfrecord" for i in range(num_shards)
+    ]
+    writers = [
+        tf.io.TFRecordWriter(os.path.join(output_dir, name)) for name in shard_names
+    ]
+
+    # Round-robin assignment keeps every class spread over all shards
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        decoded = pool.map(lambda p: _decode_file(p, img_size), file_paths)
+        for i, (image_raw, label) in enumerate(zip(decoded, labels)):
+            writers[i % num_shards].write(_example(image_raw, label))
+
+    for writer in writers:
+        writer.close()
+
+    manifest = {
+        "fingerprint": fingerprint,
+        "img_size": img_size,
+        "class_names": class_names,
+        "num_examples": len(file_paths),
+        "shards": shard_names,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def load_manifest(cache_dir: str) -> dict:
+    with open(os.path.join(cache_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_cached_dataset(
+    cache_dir: str,
+    batch_size: int,
+    shuffle: bool = True,
+    seed: int | None = None,
+    num_input_shards: int = 1,
+    shard_index: int = 0,
+    cache: bool = True,
+    deterministic: bool | None = None
+):
+    """
+    Drop-in replacement for `load_image_dataset` reading the TFRecord
+    cache: parallel interleave over shards, then `cache()` so epochs
+    after the first never touch the files again.
+
+    num_input_shards / shard_index select a deterministic subset of the
+    shard files (e.g. one per distributed worker).
+
+    Returns (dataset, class_names), images as uint8 [0, 255].
+    """
+
+    manifest = load_manifest(cache_dir)
+    img_size = manifest["img_size"]
+    shard_paths = [os.path.join(cache_dir, name) for name in manifest["shards"]]
+
+    files = tf.data.Dataset.from_tensor_slices(shard_paths)
+    if num_input_shards > 1:
+        files = files.shard(num_input_shards, shard_index)
+
+    dataset = files.interleave(
+        tf.data.TFRecordDataset,
+        cycle_length=AUTOTUNE,
+        num_parallel_calls=AUTOTUNE,
+        deterministic=deterministic
+    )
+
+    feature_spec = {
+        "image": tf.io.FixedLenFeature([], tf.string),
+        "label": tf.io.FixedLenFeature([], tf.int64),
+    }
+
+    def parse(record):
+        example = tf.io.parse_single_example(record, feature_spec)
+        image = tf.io.decode_raw(example["image"], tf.uint8)
+        image = tf.reshape(image, (img_size, img_size, 3))
+        return image, tf.cast(example["label"], tf.int32)
+
+    dataset = dataset.map(parse, num_parallel_calls=AUTOTUNE)
+
+    if cache:
+        dataset = dataset.cache()
+
+    if shuffle:
+        dataset = dataset.shuffle(
+            manifest["num_examples"], seed=seed, reshuffle_each_iteration=True
+        )
+
+    dataset = dataset.batch(batch_size)
+
+    return dataset, manifest["class_names"]
+
@@ -0,0 +1,203 @@
+# src/distillation.py
+#
+# Offline knowledge distillation: the teacher labels every split image
+# ONCE (at its own input size, cached as .npy), then a smaller student
+# trains on its own decode of the same files against a mix of the hard
+# label and the teacher's temperature-softened probabilities.
+
+import os
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from src.data_loader import AUTOTUNE, prepare_dataset
+from src.dataset_cache import dataset_fingerprint
+from src.inference import InferenceModel, predict_files
+from src.model import build_base_model, build_classification_model, enable_fine_tuning
+from src.preprocessing import load_image_tf
+from src.splits import load_split
+from src.train import compile_model, recompile_for_finetuning, train_model
+
+_EPSILON = 1e-7
+
+
+@keras.saving.register_keras_serializable(package="cotton")
+class DistillationLoss(keras.losses.Loss):
+    """
+    y_true packs [label, teacher probabilities...] per example.
+
+    loss = hard_weight * CE(label, student)
+         + (1 - hard_weight) * T^2 * KL(teacher_T || student_T)
+
+    Both models end in softmax; softmax(log(p) / T) equals
+    softmax(logits / T), so temperature is applied to log-probabilities.
+    """
+
+    def __init__(
+        self,
+        temperature: float = 4.0,
+        hard_weight: float = 0.1,
+        name: str = "distillation_loss",
+        **kwargs
+    ):
+        super().__init__(name=name, **kwargs)
+        self.temperature = temperature
+        self.hard_weight = hard_weight
+
+    def call(self, y_true, y_pred):
+        y_pred = tf.cast(y_pred, tf.float32)
+        labels = tf.cast(y_true[:, 0], tf.int32)
+        teacher = tf.cast(y_true[:, 1:], tf.float32)
+
+        hard = keras.losses.sparse_categorical_crossentropy(labels, y_pred)
+
+        teacher_log = tf.math.log(tf.clip_by_value(teacher, _EPSILON, 1.0))
+        student_log = tf.math.log(tf.clip_by_value(y_pred, _EPSILON, 1.0))
+        teacher_log_soft = tf.nn.log_softmax(teacher_log / self.temperature)
+        student_log_soft = tf.nn.log_softmax(student_log / self.temperature)
+
+        soft = tf.reduce_sum(
+            tf.exp(teacher_log_soft) * (teacher_log_soft - student_log_soft),
+            axis=-1
+        )
+
+        return (
+            self.hard_weight * hard
+            + (1.0 - self.hard_weight) * self.temperature ** 2 * soft
+        )
+
+    def get_config(self):
+        config = super().get_config()
+        config.update(temperature=self.temperature, hard_weight=self.hard_weight)
+        return config
+
+
+@keras.saving.register_keras_serializable(package="cotton")
+def distillation_accuracy(y_true, y_pred):
+    """
+    Accuracy against the hard label packed in y_true[:, 0].
+    """
+    labels = tf.cast(y_true[:, 0], tf.int64)
+    return tf.cast(tf.equal(tf.argmax(y_pred, axis=-1), labels), tf.float32)
+
+
+def get_or_compute_teacher_targets(
+    teacher: keras.Model,
+    teacher_path: str,
+    splits_dir: str,
+    split: str,
+    cache_dir: str
+):
+    """
+    Returns (file_paths, labels, teacher_probs) for one split; the
+    teacher's probabilities are computed once per teacher artifact.
+    """
+
+    file_paths, labels, _ = load_split(splits_dir, split)
+
+    teacher_size = int(teacher.inputs[0].shape[1])
+    fingerprint = dataset_fingerprint(file_paths, labels, teacher_size)
+    artifact = f"{os.path.basename(teacher_path)}-{int(os.path.getmtime(teacher_path))}"
+    path = os.path.join(cache_dir, "teacher", f"{split}-{fingerprint}-{artifact}.npy")
+
+    if not os.path.exists(path):
+        probs = predict_files(InferenceModel(teacher), file_paths)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, probs.astype(np.float32))
+
+    return file_paths, labels, np.load(path)
+
+
+def distillation_dataset(
+    file_paths: list,
+    labels: list,
+    teacher_probs: np.ndarray,
+    img_size: int,
+    batch_size: int,
+    training: bool,
+    normalize: bool = True,
+    augmentation_policy: str = "none"
+):
+    """
+    (student image, [label, teacher probs]) batches; images come from
+    the shared decoder at the STUDENT's input size.
+    """
+
+    targets = np.concatenate(
+        [np.asarray(labels, dtype=np.float32)[:, None], teacher_probs], axis=1
+    )
+
+    dataset = tf.data.Dataset.from_tensor_slices((file_paths, targets))
+    if training:
+        dataset = dataset.shuffle(len(file_paths), reshuffle_each_iteration=True)
+
+    dataset = dataset.map(
+        lambda path, target: (load_image_tf(path, img_size), target),
+        num_parallel_calls=AUTOTUNE
+    ).batch(batch_size)
+
+    return prepare_dataset(
+        dataset,
+        training=training,
+        normalize=normalize,
+        augmentation_policy=augmentation_policy,
+        cache=not training
+    )
+
+
+def train_student(
+    teacher: keras.Model,
+    teacher_path: str,
+    splits_dir: str,
+    cache_dir: str,
+    num_classes: int,
+    alpha: float,
+    img_size: int,
+    learning_rate: float,
+    batch_size: int,
+    eval_batch_size: int,
+    epochs: int,
+    early_stopping_patience: int,
+    fine_tune_at: int,
+    temperature: float = 4.0,
+    hard_weight: float = 0.1,
+    augmentation_policy: str = "standard",
+    include_normalization: bool = False
+):
+    """
+    Two-phase student training (frozen backbone, then fine-tuning),
+    like train_runner, with the distillation loss in both phases.
+    """
+
+    train = get_or_compute_teacher_targets(teacher, teacher_path, splits_dir, "train", cache_dir)
+    val = get_or_compute_teacher_targets(teacher, teacher_path, splits_dir, "val", cache_dir)
+
+    normalize = not include_normalization
+    train_ds = distillation_dataset(
+        *train, img_size, batch_size, training=True,
+        normalize=normalize, augmentation_policy=augmentation_policy
+    )
+    val_ds = distillation_dataset(
+        *val, img_size, eval_batch_size, training=False, normalize=normalize
+    )
+
+    base_model = build_base_model(img_size, alpha=alpha)
+    student = build_classification_model(
+        img_size=img_size,
+        num_classes=num_classes,
+        base_model=base_model,
+        include_normalization=include_normalization
+    )
+
+    loss = DistillationLoss(temperature=temperature, hard_weight=hard_weight)
+
+    compile_model(student, learning_rate, loss=loss, metrics=[distillation_accuracy])
+    train_model(student, train_ds, epochs, early_stopping_patience, val_ds=val_ds)
+
+    enable_fine_tuning(base_model, fine_tune_at)
+    recompile_for_finetuning(
+        student, learning_rate / 10, loss=loss, metrics=[distillation_accuracy]
+    )
+    train_model(student, train_ds, epochs, early_stopping_patience, val_ds=val_ds)
+
+    return student
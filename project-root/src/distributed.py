@@ -0,0 +1,199 @@
+# src/distributed.py
+
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+
+import tensorflow as tf
+
+from src.data_loader import prepare_dataset
+from src.config import EVAL_BATCH_SIZE, SPLIT_SEED
+from src.splits import get_or_create_splits, load_split_dataset
+from src.model import build_base_model, build_classification_model, enable_fine_tuning
+from src.train import compile_model, recompile_for_finetuning, train_model
+
+STRATEGIES = ("default", "mirrored", "multi_worker")
+
+
+def configure_cpu_devices(num_devices: int):
+    """
+    Splits the host CPU into `num_devices` logical devices so
+    MirroredStrategy can run one replica per device.
+    Must be called before TensorFlow initializes its devices.
+    """
+    cpu = tf.config.list_physical_devices("CPU")[0]
+    tf.config.set_logical_device_configuration(
+        cpu, [tf.config.LogicalDeviceConfiguration() for _ in range(num_devices)]
+    )
+
+
+def create_strategy(kind: str = "default", num_cpu_devices: int = 1):
+    """
+    - default: no distribution
+    - mirrored: synchronous replicas on local GPUs, or on
+      `num_cpu_devices` logical CPU devices when there is no GPU
+    - multi_worker: one replica per process, cluster read from TF_CONFIG
+    """
+
+    if kind == "default":
+        return tf.distribute.get_strategy()
+
+    if kind == "mirrored":
+        gpus = tf.config.list_physical_devices("GPU")
+        if gpus:
+            return tf.distribute.MirroredStrategy()
+
+        if num_cpu_devices > 1:
+            configure_cpu_devices(num_cpu_devices)
+        devices = [d.name for d in tf.config.list_logical_devices("CPU")]
+
+        # NCCL (the default all-reduce) is GPU-only
+        return tf.distribute.MirroredStrategy(
+            devices=devices,
+            cross_device_ops=tf.distribute.ReductionToOneDevice()
+        )
+
+    if kind == "multi_worker":
+        return tf.distribute.MultiWorkerMirroredStrategy()
+
+    raise ValueError(f"Unknown strategy: {kind} (use {STRATEGIES})")
+
+
+def is_chief(strategy) -> bool:
+    resolver = getattr(strategy, "cluster_resolver", None)
+    if resolver is None or resolver.task_type is None:
+        return True
+    return resolver.task_type == "chief" or (
+        resolver.task_type == "worker" and resolver.task_id == 0
+    )
+
+
+@contextlib.contextmanager
+def worker_output_dir(output_dir: str, strategy):
+    """
+    Every worker must take part in saving, but only the chief's files
+    are kept; the others write to temporary directories that are
+    removed on exit.
+    """
+    if is_chief(strategy):
+        yield output_dir
+        return
+
+    prefix = f"worker{strategy.cluster_resolver.task_id}-"
+    with tempfile.TemporaryDirectory(prefix=prefix) as tmp_dir:
+        yield tmp_dir
+
+
+def shard_dataset(dataset: tf.data.Dataset, policy: str = "DATA"):
+    """
+    Sets the auto-shard policy used when the dataset is distributed
+    across workers (DATA: by element; FILE / AUTO: by input file).
+    """
+    options = tf.data.Options()
+    options.experimental_distribute.auto_shard_policy = getattr(
+        tf.data.experimental.AutoShardPolicy, policy
+    )
+    return dataset.with_options(options)
+
+
+def train_distributed(
+    strategy,
+    data_dir: str,
+    splits_dir: str,
+    cache_dir: str,
+    img_size: int,
+    per_replica_batch_size: int,
+    learning_rate: float,
+    epochs: int,
+    early_stopping_patience: int,
+    fine_tune_at: int,
+    augmentation_policy: str = "none",
+    shard_policy: str = "DATA",
+    shuffle_seed: int = SPLIT_SEED
+):
+    """
+    Two-phase training (frozen backbone, then fine-tuning) under a
+    tf.distribute strategy. The global batch size scales with the
+    number of replicas; the learning rate is kept per-example.
+    Early stopping watches val_loss on the validation split.
+
+    Batches are sharded by element (DATA) by default: sharding the
+    fixed number of TFRecord cache files by FILE gives workers uneven
+    shares unless the file count is a multiple of the worker count, and
+    uneven batches make MultiWorkerMirroredStrategy fail or hang. Every
+    shuffle before the shard point uses `shuffle_seed`, so all workers
+    see the same permutation (each epoch) and their shards are disjoint.
+
+    Returns (model, class_names).
+    """
+
+    global_batch_size = per_replica_batch_size * strategy.num_replicas_in_sync
+
+    get_or_create_splits(data_dir, splits_dir)
+
+    train_ds, class_names, _ = load_split_dataset(
+        splits_dir, "train", img_size, global_batch_size,
+        shuffle=True, cache_dir=cache_dir, seed=shuffle_seed
+    )
+    train_ds = prepare_dataset(
+        train_ds, augmentation_policy=augmentation_policy, shuffle_seed=shuffle_seed
+    )
+    train_ds = shard_dataset(train_ds, shard_policy)
+
+    val_ds, _, _ = load_split_dataset(
+        splits_dir, "val", img_size, EVAL_BATCH_SIZE,
+        shuffle=False, cache_dir=cache_dir
+    )
+    val_ds = prepare_dataset(val_ds, training=False, cache=True)
+    val_ds = shard_dataset(val_ds, shard_policy)
+
+    with strategy.scope():
+        base_model = build_base_model(img_size)
+        model = build_classification_model(
+            img_size=img_size,
+            num_classes=len(class_names),
+            base_model=base_model
+        )
+        compile_model(model, learning_rate)
+
+    train_model(model, train_ds, epochs, early_stopping_patience, val_ds=val_ds)
+
+    with strategy.scope():
+        enable_fine_tuning(base_model, fine_tune_at)
+        recompile_for_finetuning(model, learning_rate / 10)
+
+    train_model(model, train_ds, epochs, early_stopping_patience, val_ds=val_ds)
+
+    return model, class_names
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def launch_local_workers(num_workers: int, argv: list) -> int:
+    """
+    Spawns `num_workers` processes running `python <argv>` on this host,
+    each with a TF_CONFIG describing a local MultiWorkerMirroredStrategy
+    cluster. Returns the first non-zero exit code, or 0.
+    """
+
+    cluster = {"worker": [f"localhost:{_free_port()}" for _ in range(num_workers)]}
+
+    processes = []
+    for index in range(num_workers):
+        env = dict(os.environ)
+        env["TF_CONFIG"] = json.dumps({
+            "cluster": cluster,
+            "task": {"type": "worker", "index": index}
+        })
+        processes.append(subprocess.Popen([sys.executable, *argv], env=env))
+
+    exit_codes = [process.wait() for process in processes]
+    return next((code for code in exit_codes if code != 0), 0)
@@ -0,0 +1,188 @@
+# src/evaluation.py
+#
+# Held-out accuracy and performance measurements for any artifact
+# loaded with `src.bulk_inference.load_artifact` (Keras or TFLite).
+# Results are plain dicts so they serialize straight to JSON.
+
+import time
+
+import numpy as np
+
+from src.benchmarking import latency_summary, time_calls
+from src.bulk_inference import prefetch_batches
+from src.image_decode import decode_batch
+
+# --------------------------------------------------
+# Accuracy
+# --------------------------------------------------
+
+def predict_paths(
+    model,
+    paths: list,
+    batch_size: int = 64,
+    workers: int = 4
+) -> tuple:
+    """
+    Class probabilities (N, num_classes) for `paths`, and the
+    end-to-end (read + decode + inference) images/sec.
+    """
+    outputs = []
+    start = time.perf_counter()
+
+    for batch_paths, images, errors in prefetch_batches(
+        paths, batch_size, model.img_size, model.input_dtype, workers
+    ):
+        if errors:
+            path, error = next(iter(errors.items()))
+            raise ValueError(f"Cannot evaluate {path}: {error}")
+        outputs.append(model.predict_batch(images))
+
+    elapsed = time.perf_counter() - start
+    return np.concatenate(outputs, axis=0), len(paths) / elapsed
+
+
+def confusion_matrix(labels, predictions, num_classes: int) -> np.ndarray:
+    """
+    Rows are true classes, columns predicted classes.
+    """
+    matrix = np.zeros((num_classes, num_classes), dtype=np.int64)
+    np.add.at(matrix, (np.asarray(labels), np.asarray(predictions)), 1)
+    return matrix
+
+
+def classification_metrics(matrix: np.ndarray, class_names: list) -> dict:
+    """
+    Accuracy plus per-class and macro / weighted precision, recall
+    and F1 from a confusion matrix.
+    """
+    true_positives = np.diag(matrix).astype(np.float64)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.nan_to_num(true_positives / predicted)
+        recall = np.nan_to_num(true_positives / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    per_class = {
+        name: {
+            "precision": round(float(precision[i]), 4),
+            "recall": round(float(recall[i]), 4),
+            "f1": round(float(f1[i]), 4),
+            "support": int(support[i]),
+        }
+        for i, name in enumerate(class_names)
+    }
+
+    weights = support / max(support.sum(), 1)
+    return {
+        "accuracy": round(float(true_positives.sum() / max(matrix.sum(), 1)), 4),
+        "macro": {
+            "precision": round(float(precision.mean()), 4),
+            "recall": round(float(recall.mean()), 4),
+            "f1": round(float(f1.mean()), 4),
+        },
+        "weighted": {
+            "precision": round(float(precision @ weights), 4),
+            "recall": round(float(recall @ weights), 4),
+            "f1": round(float(f1 @ weights), 4),
+        },
+        "per_class": per_class,
+        "confusion_matrix": matrix.tolist(),
+    }
+
+
+def evaluate(model, class_names: list, paths: list, labels: list, batch_size: int = 64) -> dict:
+    probs, images_per_sec = predict_paths(model, paths, batch_size)
+    matrix = confusion_matrix(labels, np.argmax(probs, axis=1), len(class_names))
+
+    report = classification_metrics(matrix, class_names)
+    report["end_to_end_images_per_sec"] = round(images_per_sec, 2)
+    return report
+
+# --------------------------------------------------
+# Speed
+# --------------------------------------------------
+
+def sample_images(model, paths: list, count: int) -> np.ndarray:
+    """
+    Decodes `count` real images (cycling through `paths`) at the
+    model's input size and dtype.
+    """
+    encoded = []
+    for i in range(count):
+        with open(paths[i % len(paths)], "rb") as f:
+            encoded.append(f.read())
+    return decode_batch(encoded, model.img_size, model.input_dtype)
+
+
+def single_image_latency(model, image: np.ndarray, repeats: int = 200) -> dict:
+    return latency_summary(time_calls(model.predict_batch, image[None], repeats=repeats))
+
+
+def batch_throughput(model, images: np.ndarray, batch_sizes: tuple, min_images: int = 512) -> dict:
+    """
+    Model-only images/sec per batch size, each timed over at least
+    `min_images` images.
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(images, (batch_size, *images.shape[1:]))
+        repeats = max(min_images // batch_size, 10)
+        latencies = time_calls(model.predict_batch, batch, repeats=repeats, warmup=3)
+
+        summary = latency_summary(latencies)
+        summary["images_per_sec"] = round(batch_size * 1000.0 / summary["mean_ms"], 2)
+        results[str(batch_size)] = summary
+    return results
+
+# --------------------------------------------------
+# Run-to-run comparison
+# --------------------------------------------------
+
+def _relative_change(old: float, new: float) -> float | None:
+    return round((new - old) / old, 4) if old else None
+
+
+def compare_runs(baseline: dict, current: dict) -> dict:
+    """
+    Relative change of the speed numbers for every (artifact, threads)
+    run present in both reports (positive is better for throughput,
+    worse for latency, load time and memory), plus the absolute change
+    of accuracy and macro F1 per artifact.
+    """
+    baseline_runs = {(r["artifact"], r["threads"]): r for r in baseline["runs"]}
+    changes = {}
+
+    for run in current["runs"]:
+        old = baseline_runs.get((run["artifact"], run["threads"]))
+        if old is None:
+            continue
+
+        row = {
+            "load_seconds": _relative_change(old["load_seconds"], run["load_seconds"]),
+            "peak_rss_mb": _relative_change(old["peak_rss_mb"], run["peak_rss_mb"]),
+            "latency_p50_ms": _relative_change(
+                old["latency_batch1"]["p50_ms"], run["latency_batch1"]["p50_ms"]
+            ),
+            "latency_p99_ms": _relative_change(
+                old["latency_batch1"]["p99_ms"], run["latency_batch1"]["p99_ms"]
+            ),
+        }
+        for batch_size, summary in run["throughput"].items():
+            if batch_size in old["throughput"]:
+                row[f"images_per_sec_bs{batch_size}"] = _relative_change(
+                    old["throughput"][batch_size]["images_per_sec"],
+                    summary["images_per_sec"]
+                )
+        changes[f"{run['artifact']}@{run['threads']}"] = row
+
+    for artifact, evaluation in current.get("evaluations", {}).items():
+        old = baseline.get("evaluations", {}).get(artifact)
+        if old is not None:
+            changes[artifact] = {
+                "accuracy_delta": round(evaluation["accuracy"] - old["accuracy"], 4),
+                "macro_f1_delta": round(evaluation["macro"]["f1"] - old["macro"]["f1"], 4),
+            }
+
+    return changes
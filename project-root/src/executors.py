@@ -0,0 +1,105 @@
+# src/executors.py
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+class ServerBusyError(Exception):
+    """
+    Raised when the server already handles its maximum number of requests.
+    """
+
+
+def create_executor(
+    kind: str,
+    max_workers: int,
+    name: str = "worker",
+    initializer=None,
+    initargs: tuple = ()
+):
+    """
+    Creates a thread or process pool.
+
+    Process pools use the "spawn" start method: forking a process that
+    already initialised TensorFlow can deadlock the child.
+    `initializer(*initargs)` runs once in every worker before any task.
+    """
+
+    if kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name,
+            initializer=initializer,
+            initargs=initargs
+        )
+
+    if kind == "process":
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs
+        )
+
+    raise ValueError(f"Unknown executor kind: {kind} (use 'thread' or 'process')")
+
+
+class ExecutorLayer:
+    """
+    Executors for CPU-bound work so the event loop only handles I/O.
+
+    - inference: image decode/preprocessing and forward passes
+      (PIL and TensorFlow release the GIL, so threads scale)
+    - pdf: ReportLab rendering (pure Python, a process pool avoids the GIL)
+    """
+
+    def __init__(
+        self,
+        inference_workers: int,
+        pdf_kind: str = "thread",
+        pdf_workers: int = 1
+    ):
+        self.inference = create_executor("thread", inference_workers, "inference")
+        self.pdf = create_executor(pdf_kind, pdf_workers, "pdf")
+
+    async def run_inference(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.inference, fn, *args)
+
+    async def run_pdf(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pdf, fn, *args)
+
+    def shutdown(self, wait: bool = True):
+        self.inference.shutdown(wait=wait)
+        self.pdf.shutdown(wait=wait)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of requests doing CPU work at the same time.
+
+    Requests above the limit are rejected immediately with
+    ServerBusyError instead of piling up behind the executors.
+    Must only be used from the event loop thread.
+    """
+
+    def __init__(self, max_concurrent: int):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+
+    def __enter__(self):
+        if self.in_flight >= self.max_concurrent:
+            raise ServerBusyError(
+                f"Too many concurrent requests (limit {self.max_concurrent})"
+            )
+        self.in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        return False
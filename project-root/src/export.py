@@ -0,0 +1,137 @@
+# src/export.py
+
+import os
+import tempfile
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from src.data_loader import prepare_dataset
+from src.splits import load_split_dataset
+from src.tflite_inference import TFLiteInferenceModel
+
+QUANTIZATION_MODES = ("float16", "int8")
+
+
+def load_split_images(
+    splits_dir: str,
+    split: str,
+    img_size: int,
+    num_samples: int,
+    normalize: bool = True,
+    seed: int | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Loads a shuffled sample of at most `num_samples` images and labels
+    from one split manifest (see src.splits), with the same
+    preprocessing as training: normalized to [-1, 1], or raw uint8
+    pixels with normalize=False (folded-normalization models).
+    """
+    dataset, _, _ = load_split_dataset(
+        splits_dir, split, img_size, batch_size=32, shuffle=True, seed=seed
+    )
+    dataset = prepare_dataset(dataset, training=False, normalize=normalize)
+
+    images, labels = [], []
+    for batch_images, batch_labels in dataset.unbatch().take(num_samples).batch(32):
+        images.append(batch_images.numpy())
+        labels.append(batch_labels.numpy())
+
+    return np.concatenate(images), np.concatenate(labels)
+
+
+def to_model_input(images: np.ndarray, input_dtype) -> np.ndarray:
+    """
+    Converts normalized [-1, 1] images to raw uint8 pixels for models
+    with normalization folded into the graph; otherwise a no-op.
+    """
+    if np.dtype(input_dtype) == np.uint8 and images.dtype != np.uint8:
+        return np.clip(np.round((images + 1.0) * 127.5), 0, 255).astype(np.uint8)
+    return images
+
+
+def export_tflite(
+    model: keras.Model,
+    output_path: str,
+    quantization: str = "float16",
+    calibration_images: np.ndarray | None = None
+) -> str:
+    """
+    Converts the classifier to a post-training-quantized TFLite model.
+
+    - float16: float16 weights, float32 inputs/outputs
+    - int8: full-integer model (weights and activations), int8
+      inputs/outputs; requires calibration images. Models with folded
+      normalization keep their raw uint8 pixel input.
+    """
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(
+            f"Unknown quantization: {quantization} (use {QUANTIZATION_MODES})"
+        )
+
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        model.export(saved_model_dir)
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        else:
+            if calibration_images is None:
+                raise ValueError("int8 quantization requires calibration images")
+
+            folded = model.inputs[0].dtype == "uint8"
+            samples = to_model_input(calibration_images, np.uint8 if folded else np.float32)
+
+            def representative_dataset():
+                for image in samples:
+                    yield [image[np.newaxis]]
+
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS_INT8
+            ]
+            if not folded:
+                # A uint8 graph input is already integer and stays raw pixels
+                converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+
+        tflite_model = converter.convert()
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(tflite_model)
+
+    return output_path
+
+
+def measure_drift(
+    reference_probs: np.ndarray,
+    tflite_path: str,
+    images: np.ndarray,
+    labels: np.ndarray,
+    batch_size: int = 32
+) -> dict:
+    """
+    Compares a TFLite model against reference (Keras) probabilities.
+    `images` may be normalized or raw; they are converted to whatever
+    the TFLite model expects.
+    """
+    tflite_model = TFLiteInferenceModel(tflite_path)
+    images = to_model_input(images, tflite_model.input_dtype)
+
+    probs = np.concatenate([
+        tflite_model.predict_batch(images[i:i + batch_size])
+        for i in range(0, len(images), batch_size)
+    ])
+
+    return {
+        "size_mb": round(os.path.getsize(tflite_path) / 1e6, 3),
+        "accuracy": float(np.mean(np.argmax(probs, axis=1) == labels)),
+        "top1_agreement": float(
+            np.mean(np.argmax(probs, axis=1) == np.argmax(reference_probs, axis=1))
+        ),
+        "mean_abs_prob_diff": float(np.mean(np.abs(probs - reference_probs))),
+        "max_abs_prob_diff": float(np.max(np.abs(probs - reference_probs))),
+    }
@@ -0,0 +1,141 @@
+# src/feature_cache.py
+
+import hashlib
+import json
+import os
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from src.config import EVAL_BATCH_SIZE
+from src.train import compile_model, train_model
+
+
+def _layer_of_type(model: keras.Model, layer_type):
+    matches = [layer for layer in model.layers if isinstance(layer, layer_type)]
+    if not matches:
+        raise ValueError(f"Model has no {layer_type.__name__} layer")
+    return matches[-1]
+
+
+def backbone_key(base_model: keras.Model, img_size: int) -> str:
+    """
+    Identifies the frozen backbone: architecture, input size, dtype
+    policy and a checksum of its first weights (ImageNet vs other
+    initialisations).
+    """
+    checksum = hashlib.sha256(base_model.weights[0].numpy().tobytes()).hexdigest()
+    policy = keras.mixed_precision.global_policy().name
+    return f"{base_model.name}-{img_size}-{policy}-{checksum[:8]}"
+
+
+def build_feature_extractor(model: keras.Model) -> keras.Model:
+    """
+    Classifier up to GlobalAveragePooling2D (includes any in-graph
+    normalization, so it accepts the same inputs as the classifier).
+    """
+    pooling = _layer_of_type(model, layers.GlobalAveragePooling2D)
+    return keras.Model(model.inputs, pooling.output, name="feature_extractor")
+
+
+def build_head_model(model: keras.Model) -> keras.Model:
+    """
+    Dropout + Dense head on pooled features. The layers are SHARED with
+    the classifier, so training the head updates the classifier.
+    """
+    pooling = _layer_of_type(model, layers.GlobalAveragePooling2D)
+    dropout = _layer_of_type(model, layers.Dropout)
+    dense = _layer_of_type(model, layers.Dense)
+
+    inputs = keras.Input(shape=pooling.output.shape[1:])
+    outputs = dense(dropout(inputs))
+    return keras.Model(inputs, outputs, name="classification_head")
+
+
+def get_or_compute_features(
+    model: keras.Model,
+    base_model: keras.Model,
+    dataset: tf.data.Dataset,
+    cache_dir: str,
+    fingerprint: str
+):
+    """
+    Returns (features, labels) as memory-mapped arrays, computing them
+    with one backbone pass over `dataset` if not cached yet.
+
+    The dataset must be unshuffled and unaugmented: features are
+    reused across epochs and runs.
+    """
+
+    img_size = int(model.inputs[0].shape[1])
+    key = f"{fingerprint}-{backbone_key(base_model, img_size)}"
+    entry_dir = os.path.join(cache_dir, key)
+    features_path = os.path.join(entry_dir, "features.npy")
+    labels_path = os.path.join(entry_dir, "labels.npy")
+
+    if not os.path.exists(labels_path):
+        extractor = build_feature_extractor(model)
+
+        features, labels = [], []
+        for images, batch_labels in dataset:
+            features.append(extractor(images, training=False).numpy())
+            labels.append(batch_labels.numpy())
+
+        os.makedirs(entry_dir, exist_ok=True)
+        np.save(features_path, np.concatenate(features).astype(np.float32))
+
+        # labels.npy is written last: its presence marks a complete entry
+        np.save(labels_path, np.concatenate(labels))
+        with open(os.path.join(entry_dir, "info.json"), "w") as f:
+            json.dump({"fingerprint": fingerprint, "backbone": base_model.name}, f)
+
+    return (
+        np.load(features_path, mmap_mode="r"),
+        np.load(labels_path, mmap_mode="r")
+    )
+
+
+def train_head_on_features(
+    model: keras.Model,
+    features: np.ndarray,
+    labels: np.ndarray,
+    learning_rate: float,
+    batch_size: int,
+    epochs: int,
+    early_stopping_patience: int,
+    jit_compile="auto",
+    val_features: np.ndarray | None = None,
+    val_labels: np.ndarray | None = None
+):
+    """
+    Frozen-backbone training phase on cached features. Equivalent to
+    training the classifier with its backbone frozen (and without
+    augmentation), minus the backbone forward pass on every step.
+
+    Validation features (same cache, val split) enable val_loss early
+    stopping.
+    """
+
+    head = compile_model(build_head_model(model), learning_rate, jit_compile)
+
+    head_ds = (
+        tf.data.Dataset.from_tensor_slices((np.asarray(features), np.asarray(labels)))
+        .shuffle(len(labels))
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+    val_ds = None
+    if val_features is not None:
+        val_ds = (
+            tf.data.Dataset.from_tensor_slices(
+                (np.asarray(val_features), np.asarray(val_labels))
+            )
+            .batch(EVAL_BATCH_SIZE)
+            .cache()
+        )
+
+    return train_model(
+        head, head_ds, epochs, early_stopping_patience, val_ds=val_ds
+    )
@@ -0,0 +1,361 @@
+# src/hparam_search.py
+#
+# Successive-halving hyperparameter search. Trials run in a spawn
+# process pool; every rung trains the surviving trials for more
+# fine-tuning epochs (resuming from their checkpoints) and keeps the
+# best 1/eta by validation loss.
+#
+# The TensorFlow-side imports live inside the worker functions; each
+# spawned worker sets its thread pools in the pool initializer, before
+# any op runs (TensorFlow rejects changes after initialization).
+
+import json
+import math
+import os
+import random
+
+import numpy as np
+
+from src.executors import create_executor
+
+SEARCH_SPACE = {
+    "learning_rate": [3e-5, 1e-4, 3e-4, 1e-3],
+    "batch_size": [16, 32, 64],
+    "dropout_rate": [0.1, 0.2, 0.3, 0.5],
+    "fine_tune_at": [80, 100, 120],
+    "img_size": [128, 160],
+}
+
+
+def sample_configs(space: dict, num_trials: int, seed: int = 0) -> list:
+    """
+    Random search over a grid: `num_trials` distinct configurations.
+    """
+    rng = random.Random(seed)
+    total = math.prod(len(values) for values in space.values())
+
+    configs = []
+    while len(configs) < min(num_trials, total):
+        config = {name: rng.choice(values) for name, values in space.items()}
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def rung_budgets(min_epochs: int, max_epochs: int, eta: int) -> list:
+    """
+    Cumulative fine-tuning epochs per rung: min, min*eta, ... max.
+    """
+    budgets = [min_epochs]
+    while budgets[-1] * eta < max_epochs:
+        budgets.append(budgets[-1] * eta)
+    if budgets[-1] < max_epochs:
+        budgets.append(max_epochs)
+    return budgets
+
+
+def _configure_worker_threads(num_threads: int):
+    """
+    Pool initializer: runs in every worker before its first task.
+    """
+    import tensorflow as tf
+
+    # Concurrent trials share the host: keep each on its own slice
+    tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _trial_dataset(splits_dir, split, img_size, batch_size, cache_dir, training):
+    from src.config import AUGMENTATION_POLICY
+    from src.data_loader import prepare_dataset
+    from src.splits import load_split_dataset
+
+    dataset, class_names, fingerprint = load_split_dataset(
+        splits_dir, split, img_size, batch_size, shuffle=training, cache_dir=cache_dir
+    )
+    dataset = prepare_dataset(
+        dataset,
+        training=training,
+        augmentation_policy=AUGMENTATION_POLICY if training else "none",
+        cache=not training
+    )
+    return dataset, class_names, fingerprint
+
+
+def prepare_features(img_size: int, splits_dir: str, cache_dir: str, feature_cache_dir: str):
+    """
+    Computes the cached backbone features of the train/val splits at
+    one input size, so trials only ever read them.
+    """
+    from src.config import EVAL_BATCH_SIZE
+    from src.feature_cache import get_or_compute_features
+    from src.model import build_base_model, build_classification_model
+
+    base_model = build_base_model(img_size)
+
+    for split in ("train", "val"):
+        dataset, class_names, fingerprint = _trial_dataset(
+            splits_dir, split, img_size, EVAL_BATCH_SIZE, cache_dir, training=False
+        )
+        model = build_classification_model(img_size, len(class_names), base_model)
+        get_or_compute_features(model, base_model, dataset, feature_cache_dir, fingerprint)
+
+
+def run_trial(
+    config: dict,
+    epochs: int,
+    trial_dir: str,
+    splits_dir: str,
+    cache_dir: str,
+    feature_cache_dir: str,
+    head_epochs: int,
+    early_stopping_patience: int
+) -> dict:
+    """
+    Trains one configuration up to `epochs` cumulative fine-tuning
+    epochs. Runs in a worker process.
+
+    The frozen-backbone phase trains the head on cached features; the
+    fine-tuning phase resumes from the trial's checkpoint, so promoting
+    a trial to the next rung only pays for the extra epochs.
+    """
+
+    from src.checkpointing import PhaseCheckpointer
+    from src.config import EVAL_BATCH_SIZE
+    from src.feature_cache import get_or_compute_features, train_head_on_features
+    from src.model import build_base_model, build_classification_model, enable_fine_tuning
+    from src.train import recompile_for_finetuning, train_model
+
+    img_size = config["img_size"]
+
+    train_ds, class_names, train_fingerprint = _trial_dataset(
+        splits_dir, "train", img_size, config["batch_size"], cache_dir, training=True
+    )
+    val_ds, _, val_fingerprint = _trial_dataset(
+        splits_dir, "val", img_size, EVAL_BATCH_SIZE, cache_dir, training=False
+    )
+
+    base_model = build_base_model(img_size)
+    model = build_classification_model(
+        img_size,
+        len(class_names),
+        base_model,
+        dropout_rate=config["dropout_rate"]
+    )
+
+    initial_ckpt = PhaseCheckpointer(trial_dir, "initial", model, async_save=False)
+    initial_ckpt.restore()
+
+    if not initial_ckpt.is_completed:
+        # Cache hits after prepare_features; the datasets are never read
+        feature_ds, _, _ = _trial_dataset(
+            splits_dir, "train", img_size, EVAL_BATCH_SIZE, cache_dir, training=False
+        )
+        features, labels = get_or_compute_features(
+            model, base_model, feature_ds, feature_cache_dir, train_fingerprint
+        )
+        val_features, val_labels = get_or_compute_features(
+            model, base_model, val_ds, feature_cache_dir, val_fingerprint
+        )
+        train_head_on_features(
+            model,
+            features,
+            labels,
+            learning_rate=config["learning_rate"],
+            batch_size=config["batch_size"],
+            epochs=head_epochs,
+            early_stopping_patience=early_stopping_patience,
+            val_features=val_features,
+            val_labels=val_labels
+        )
+        initial_ckpt.save(head_epochs, completed=True)
+
+    enable_fine_tuning(base_model, config["fine_tune_at"])
+    recompile_for_finetuning(model, config["learning_rate"] / 10)
+
+    finetune_ckpt = PhaseCheckpointer(
+        trial_dir, "finetune", model, model.optimizer, async_save=False
+    )
+    start_epoch = finetune_ckpt.restore()
+
+    if start_epoch < epochs:
+        train_model(
+            model,
+            train_ds,
+            epochs=epochs,
+            early_stopping_patience=early_stopping_patience,
+            initial_epoch=start_epoch,
+            val_ds=val_ds
+        )
+        finetune_ckpt.save(epochs)
+
+    val_loss, val_accuracy = model.evaluate(val_ds, verbose=0)
+    return {
+        "config": config,
+        "epochs": epochs,
+        "val_loss": float(val_loss),
+        "val_accuracy": float(val_accuracy),
+    }
+
+
+def measure_latencies(configs: list, splits_dir: str) -> list:
+    """
+    Single-image inference latency of each configuration's architecture,
+    timed one after another in an otherwise idle worker (weights do not
+    affect latency, so nothing is restored).
+    """
+    from src.benchmarking import latency_summary, time_calls
+    from src.inference import InferenceModel
+    from src.model import build_base_model, build_classification_model
+    from src.splits import load_split
+
+    num_classes = len(load_split(splits_dir, "train")[2])
+
+    latencies = []
+    for config in configs:
+        img_size = config["img_size"]
+        model = build_classification_model(
+            img_size,
+            num_classes,
+            build_base_model(img_size, weights=None),
+            dropout_rate=config["dropout_rate"]
+        )
+        inference_model = InferenceModel(model, batch_buckets=(1,))
+        image = np.zeros((1, *inference_model.input_shape), dtype=inference_model.input_dtype)
+        latencies.append(latency_summary(
+            time_calls(inference_model.predict_batch, image, repeats=50)
+        ))
+    return latencies
+
+
+def pareto_front(results: list) -> list:
+    """
+    Indices of results not dominated on (higher val_accuracy, lower
+    p50 latency).
+    """
+    front = []
+    for i, a in enumerate(results):
+        dominated = any(
+            b["val_accuracy"] >= a["val_accuracy"]
+            and b["latency"]["p50_ms"] <= a["latency"]["p50_ms"]
+            and (
+                b["val_accuracy"] > a["val_accuracy"]
+                or b["latency"]["p50_ms"] < a["latency"]["p50_ms"]
+            )
+            for j, b in enumerate(results) if j != i
+        )
+        if not dominated:
+            front.append(i)
+    return front
+
+
+def successive_halving(
+    configs: list,
+    output_dir: str,
+    splits_dir: str,
+    cache_dir: str,
+    feature_cache_dir: str,
+    min_epochs: int = 1,
+    max_epochs: int = 9,
+    eta: int = 3,
+    head_epochs: int = 10,
+    early_stopping_patience: int = 3,
+    num_workers: int = 2
+) -> dict:
+    """
+    Runs the search and writes output_dir/leaderboard.json.
+
+    Trials that survive the last rung are measured for single-image
+    inference latency once training is over (serially, so trials do not
+    compete for cores); the leaderboard marks the accuracy/latency
+    Pareto front.
+    """
+
+    budgets = rung_budgets(min_epochs, max_epochs, eta)
+    num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+    trial_dirs = [os.path.join(output_dir, f"trial-{i:03d}") for i in range(len(configs))]
+
+    history = []
+    alive = list(range(len(configs)))
+
+    with create_executor(
+        "process",
+        num_workers,
+        "trial",
+        initializer=_configure_worker_threads,
+        initargs=(num_threads,)
+    ) as pool:
+        # One backbone pass per input size, before trials compete for it
+        img_sizes = sorted({config["img_size"] for config in configs})
+        for future in [
+            pool.submit(prepare_features, size, splits_dir, cache_dir, feature_cache_dir)
+            for size in img_sizes
+        ]:
+            future.result()
+
+        for rung, epochs in enumerate(budgets):
+            last_rung = rung == len(budgets) - 1
+            futures = {
+                trial: pool.submit(
+                    run_trial,
+                    configs[trial],
+                    epochs,
+                    trial_dirs[trial],
+                    splits_dir,
+                    cache_dir,
+                    feature_cache_dir,
+                    head_epochs,
+                    early_stopping_patience
+                )
+                for trial in alive
+            }
+
+            rung_results = {trial: future.result() for trial, future in futures.items()}
+            for trial, result in rung_results.items():
+                history.append({"trial": trial, "rung": rung, **result})
+                print(
+                    f"rung {rung} trial {trial}: epochs={epochs} "
+                    f"val_loss={result['val_loss']:.4f} "
+                    f"val_accuracy={result['val_accuracy']:.4f}"
+                )
+
+            if not last_rung:
+                ranked = sorted(alive, key=lambda t: rung_results[t]["val_loss"])
+                alive = ranked[:max(1, len(alive) // eta)]
+
+    finalists = [
+        {key: value for key, value in entry.items() if key != "rung"}
+        for entry in history if entry["rung"] == len(budgets) - 1
+    ]
+
+    # The trial pool has drained: one worker with the whole host
+    with create_executor(
+        "process",
+        1,
+        "latency",
+        initializer=_configure_worker_threads,
+        initargs=(os.cpu_count() or 1,)
+    ) as pool:
+        latencies = pool.submit(
+            measure_latencies, [entry["config"] for entry in finalists], splits_dir
+        ).result()
+
+    for entry, latency in zip(finalists, latencies):
+        entry["latency"] = latency
+    finalists.sort(key=lambda entry: -entry["val_accuracy"])
+    front = pareto_front(finalists)
+    for i, entry in enumerate(finalists):
+        entry["pareto"] = i in front
+
+    leaderboard = {
+        "budgets": budgets,
+        "eta": eta,
+        "leaderboard": finalists,
+        "history": history,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "leaderboard.json"), "w", encoding="utf-8") as f:
+        json.dump(leaderboard, f, indent=2)
+
+    return leaderboard
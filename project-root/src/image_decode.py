@@ -0,0 +1,97 @@
+# src/image_decode.py
+
+import io
+import numpy as np
+from PIL import Image, ImageOps
+
+# Same normalization used in training: [0, 255] -> [-1, 1]
+NORMALIZE_SCALE = np.float32(1.0 / 127.5)
+NORMALIZE_OFFSET = np.float32(-1.0)
+
+
+def _open_resized(image_bytes: bytes, img_size: int) -> Image.Image:
+    image = Image.open(io.BytesIO(image_bytes))
+
+    # libjpeg scales by 1/2, 1/4 or 1/8 during the DCT, so a 12MP
+    # photo is never materialized at full size
+    if image.format == "JPEG":
+        image.draft("RGB", (img_size, img_size))
+
+    # Phones store rotated photos with an EXIF orientation tag
+    image = ImageOps.exif_transpose(image)
+
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if image.size != (img_size, img_size):
+        image = image.resize((img_size, img_size), Image.Resampling.BICUBIC)
+
+    return image
+
+
+def normalize_into(pixels: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    out = pixels / 127.5 - 1, computed in place in `out` (float32).
+    """
+    np.multiply(pixels, NORMALIZE_SCALE, out=out, casting="unsafe")
+    np.add(out, NORMALIZE_OFFSET, out=out)
+    return out
+
+
+def decode_pixels(image_bytes: bytes, img_size: int) -> np.ndarray:
+    """
+    Decodes, orients and resizes one image to uint8 (img_size, img_size, 3).
+    """
+    return np.asarray(_open_resized(image_bytes, img_size))
+
+
+def store_pixels(pixels: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Writes decoded pixels into `out`: normalized to [-1, 1] for float32,
+    copied as-is for uint8.
+    """
+    if out.dtype == np.uint8:
+        out[...] = pixels
+        return out
+
+    return normalize_into(pixels, out)
+
+
+def decode_image(
+    image_bytes: bytes,
+    img_size: int,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Decodes, orients and resizes one image to (img_size, img_size, 3).
+
+    The result is written straight into `out` (e.g. one row of a batch
+    buffer) without intermediate copies. A float32 `out` (the default)
+    receives pixels normalized to [-1, 1]; a uint8 `out` receives raw
+    pixels for models with normalization folded into the graph.
+    """
+
+    pixels = decode_pixels(image_bytes, img_size)
+
+    if out is None:
+        out = np.empty((img_size, img_size, 3), dtype=np.float32)
+
+    return store_pixels(pixels, out)
+
+
+def allocate_batch(
+    batch_size: int,
+    img_size: int,
+    dtype=np.float32
+) -> np.ndarray:
+    return np.empty((batch_size, img_size, img_size, 3), dtype=dtype)
+
+
+def decode_batch(images: list, img_size: int, dtype=np.float32) -> np.ndarray:
+    """
+    Decodes a list of encoded images into one preallocated batch.
+    """
+    batch = allocate_batch(len(images), img_size, dtype)
+    for i, image_bytes in enumerate(images):
+        decode_image(image_bytes, img_size, out=batch[i])
+    return batch
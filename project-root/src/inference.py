@@ -1,26 +1,152 @@
 # src/inference.py
 
+import json
+import zipfile
 import numpy as np
 import tensorflow as tf
-from PIL import Image
 
+from src.config import MODEL_CLASS_NAMES_ENTRY
+from src.image_decode import allocate_batch, decode_batch, decode_image
 
-def load_image(image_path: str, img_size: int):
-    img = Image.open(image_path).convert("RGB")
-    img = img.resize((img_size, img_size))
-    img = np.array(img, dtype=np.float32)
-    img = np.expand_dims(img, axis=0)
-    return img
+DEFAULT_BATCH_BUCKETS = (1, 4, 8, 16, 32)
+
+
+class InferenceModel:
+    """
+    Traced forward pass for a trained classifier.
+
+    `model.predict` builds a data adapter and runs callbacks on every
+    call. Here the model is traced once per batch-size bucket with a
+    fixed input signature; incoming batches are zero-padded up to the
+    nearest bucket so no call ever retraces.
+    """
+
+    def __init__(
+        self,
+        model: tf.keras.Model,
+        batch_buckets: tuple = DEFAULT_BATCH_BUCKETS
+    ):
+        self.model = model
+        self.batch_buckets = tuple(sorted(set(batch_buckets)))
+
+        input_spec = model.inputs[0]
+        self.input_shape = tuple(input_spec.shape[1:])
+        self.img_size = self.input_shape[0]
+
+        # float32 ([-1, 1]) or uint8 (normalization folded into the graph)
+        self.input_dtype = np.dtype(tf.as_dtype(input_spec.dtype).as_numpy_dtype)
+        tf_dtype = tf.as_dtype(self.input_dtype)
+
+        forward = tf.function(lambda x: model(x, training=False))
+
+        self._concrete = {
+            bucket: forward.get_concrete_function(
+                tf.TensorSpec((bucket, *self.input_shape), tf_dtype)
+            )
+            for bucket in self.batch_buckets
+        }
+
+    def warmup(self):
+        """
+        Runs every bucket once so the first real request is not slow.
+        """
+        for bucket in self.batch_buckets:
+            zeros = np.zeros((bucket, *self.input_shape), dtype=self.input_dtype)
+            self._concrete[bucket](tf.constant(zeros))
+
+    def _bucket_for(self, batch_size: int) -> int:
+        for bucket in self.batch_buckets:
+            if batch_size <= bucket:
+                return bucket
+        return self.batch_buckets[-1]
+
+    def predict_batch(self, images: np.ndarray) -> np.ndarray:
+        """
+        Returns class probabilities of shape (N, num_classes).
+        """
+        images = np.asarray(images, dtype=self.input_dtype)
+        if len(images) == 0:
+            return np.zeros((0, self.model.outputs[0].shape[-1]), dtype=np.float32)
+
+        max_bucket = self.batch_buckets[-1]
+
+        outputs = []
+        for start in range(0, len(images), max_bucket):
+            chunk = images[start:start + max_bucket]
+            n = len(chunk)
+            bucket = self._bucket_for(n)
+
+            if n < bucket:
+                pad = np.zeros((bucket - n, *chunk.shape[1:]), dtype=chunk.dtype)
+                chunk = np.concatenate([chunk, pad], axis=0)
+
+            preds = self._concrete[bucket](tf.constant(chunk))
+            outputs.append(preds.numpy()[:n])
+
+        return np.concatenate(outputs, axis=0)
+
+
+def load_classifier(model_path: str):
+    """
+    Loads a `.keras` archive written by `save_full_model`, or a
+    compressed `.npz` artifact from `src.compression`.
+
+    Returns (model, class_names).
+    """
+    if model_path.endswith(".npz"):
+        from src.compression import load_compressed
+        return load_compressed(model_path)
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+
+    with zipfile.ZipFile(model_path) as archive:
+        class_names = json.loads(archive.read(MODEL_CLASS_NAMES_ENTRY))
+
+    return model, class_names
+
+
+def load_image(image_path: str, img_size: int, dtype=np.float32):
+    """
+    Loads one image as a (1, H, W, 3) batch using the shared decoder.
+    """
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    batch = allocate_batch(1, img_size, dtype)
+    decode_image(image_bytes, img_size, out=batch[0])
+    return batch
+
+
+def predict_files(
+    model,
+    image_paths: list,
+    batch_size: int = 32
+) -> np.ndarray:
+    """
+    Class probabilities (N, num_classes) for image files, decoded in
+    batches with the shared decoder at the model's input size.
+    """
+    outputs = []
+    for start in range(0, len(image_paths), batch_size):
+        encoded = []
+        for path in image_paths[start:start + batch_size]:
+            with open(path, "rb") as f:
+                encoded.append(f.read())
+
+        images = decode_batch(encoded, model.img_size, model.input_dtype)
+        outputs.append(model.predict_batch(images))
+
+    return np.concatenate(outputs, axis=0)
 
 
 def predict_image(
-    model: tf.keras.Model,
+    model: InferenceModel,
     image_path: str,
     img_size: int,
     class_names: list
 ):
-    image = load_image(image_path, img_size)
-    preds = model.predict(image, verbose=0)
+    image = load_image(image_path, img_size, model.input_dtype)
+    preds = model.predict_batch(image)[0]
 
     class_index = int(np.argmax(preds))
     confidence = float(np.max(preds))
@@ -0,0 +1,514 @@
+# src/load_testing.py
+#
+# Self-contained HTTP load generator for the API (standard library
+# only). Requests go either straight to the ASGI app in this process or
+# over raw HTTP/1.1 keep-alive connections to a running uvicorn.
+# With a target rate the load is open-loop: latency is measured from
+# each request's scheduled send time, so a slow server cannot hide
+# its queueing delay by slowing the client down.
+
+import asyncio
+import bisect
+import mimetypes
+import os
+import random
+import time
+import uuid
+from collections import defaultdict
+
+from src.metrics import LATENCY_BUCKETS
+
+# Multipart field name expected by each endpoint
+UPLOAD_FIELDS = {
+    "/detect": "image",
+    "/predict": "file",
+    "/export/pdf": "file",
+}
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# --------------------------------------------------
+# Payloads
+# --------------------------------------------------
+
+def load_payloads(image_dir: str, limit: int = 200, seed: int = 0) -> list:
+    """
+    Up to `limit` (filename, content_type, bytes) uploads sampled from
+    the JPEG / PNG files under `image_dir`.
+    """
+    paths = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, filenames in os.walk(image_dir)
+        for name in filenames
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not paths:
+        raise ValueError(f"No JPEG or PNG images under {image_dir}")
+
+    random.Random(seed).shuffle(paths)
+
+    payloads = []
+    for path in paths[:limit]:
+        with open(path, "rb") as f:
+            content_type = mimetypes.guess_type(path)[0] or "image/jpeg"
+            payloads.append((os.path.basename(path), content_type, f.read()))
+    return payloads
+
+
+def encode_multipart(field: str, filename: str, content_type: str, data: bytes) -> tuple:
+    """
+    Returns (body, content_type_header) for a single-file upload.
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    body = head + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def parse_mix(mix: str) -> dict:
+    """
+    "/detect=3,/export/pdf=1" -> {"/detect": 0.75, "/export/pdf": 0.25}
+    """
+    weights = {}
+    for part in mix.split(","):
+        path, _, weight = part.strip().partition("=")
+        if path not in UPLOAD_FIELDS:
+            raise ValueError(f"Unknown endpoint {path} (use {', '.join(UPLOAD_FIELDS)})")
+        weights[path] = float(weight or 1)
+
+    total = sum(weights.values())
+    return {path: weight / total for path, weight in weights.items()}
+
+# --------------------------------------------------
+# Transports: request(method, path, headers, body) -> (status, body)
+# --------------------------------------------------
+
+class ASGITransport:
+    """
+    Calls the ASGI app directly (no sockets) and drives its lifespan,
+    so client and server share this process and event loop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.state = {}
+        self._lifespan = None
+
+    async def startup(self):
+        self._lifespan_in = asyncio.Queue()
+        self._lifespan_out = asyncio.Queue()
+        self._lifespan = asyncio.create_task(
+            self.app(
+                {"type": "lifespan", "state": self.state},
+                self._lifespan_in.get,
+                self._lifespan_out.put
+            )
+        )
+        await self._lifespan_in.put({"type": "lifespan.startup"})
+        message = await self._lifespan_out.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"App startup failed: {message}")
+
+    async def shutdown(self):
+        if self._lifespan is not None:
+            await self._lifespan_in.put({"type": "lifespan.shutdown"})
+            await self._lifespan_out.get()
+            await self._lifespan
+
+    async def request(self, method: str, path: str, headers: dict, body: bytes = b""):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (k.lower().encode(), v.encode())
+                for k, v in {**headers, "content-length": str(len(body))}.items()
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+            "state": dict(self.state),
+        }
+
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Client never disconnects mid-request
+            await asyncio.Event().wait()
+
+        status = [None]
+        chunks = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status[0], b"".join(chunks)
+
+
+class HTTPConnection:
+    """
+    One HTTP/1.1 keep-alive connection (Content-Length and chunked
+    responses), reopened transparently after the server closes it.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+    async def request(self, method: str, path: str, headers: dict, body: bytes = b""):
+        if self._writer is None or self._writer.is_closing():
+            await self._connect()
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+
+        try:
+            await self._writer.drain()
+            return await self._read_response()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            raise
+
+    async def _read_response(self):
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b"".join(chunks)
+        else:
+            body = await self._reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+
+class HTTPTransport:
+    """
+    Pool of keep-alive connections to a running server, at most one
+    request in flight per connection.
+    """
+
+    def __init__(self, host: str, port: int, max_connections: int):
+        self._all = [HTTPConnection(host, port) for _ in range(max_connections)]
+        self._idle = asyncio.Queue()
+        for connection in self._all:
+            self._idle.put_nowait(connection)
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        for connection in self._all:
+            await connection.close()
+
+    async def request(self, method: str, path: str, headers: dict, body: bytes = b""):
+        connection = await self._idle.get()
+        try:
+            return await connection.request(method, path, headers, body)
+        finally:
+            self._idle.put_nowait(connection)
+
+# --------------------------------------------------
+# Server-side resources
+# --------------------------------------------------
+
+def _children(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # Fields after the parenthesised command name
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _process_usage(pid: int) -> tuple:
+    """
+    (cpu_seconds, rss_mb) of one process from /proc.
+    """
+    with open(f"/proc/{pid}/stat", "r") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    rss_mb = 0.0
+    with open(f"/proc/{pid}/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_mb = int(line.split()[1]) / 1024.0
+    return cpu_seconds, rss_mb
+
+
+class ResourceSampler:
+    """
+    Samples CPU time and RSS of a server process and its children
+    (uvicorn --workers) from /proc every `interval` seconds (Linux).
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+
+    def sample(self) -> tuple:
+        cpu, rss = 0.0, 0.0
+        for pid in [self.pid, *_children(self.pid)]:
+            try:
+                pid_cpu, pid_rss = _process_usage(pid)
+            except OSError:
+                continue
+            cpu += pid_cpu
+            rss += pid_rss
+        return time.perf_counter(), cpu, rss
+
+    async def run(self):
+        while True:
+            self.samples.append(await asyncio.to_thread(self.sample))
+            await asyncio.sleep(self.interval)
+
+    def summary(self) -> dict:
+        if len(self.samples) < 2:
+            return {}
+
+        (t0, cpu0, _), (t1, cpu1, _) = self.samples[0], self.samples[-1]
+        rss = [s[2] for s in self.samples]
+        return {
+            "cpu_percent": round(100.0 * (cpu1 - cpu0) / (t1 - t0), 1),
+            "rss_mean_mb": round(sum(rss) / len(rss), 1),
+            "rss_peak_mb": round(max(rss), 1),
+            "processes": 1 + len(_children(self.pid)),
+        }
+
+
+def parse_prometheus(text: str) -> dict:
+    """
+    {"name{labels}": value} for every sample line of a /metrics scrape.
+    """
+    values = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name, _, value = line.rpartition(" ")
+        try:
+            values[name] = float(value)
+        except ValueError:
+            continue
+    return values
+
+
+def metrics_delta(before: dict, after: dict, prefixes: tuple = ("cotton_",)) -> dict:
+    """
+    Change of every server metric over the run (gauges: final value).
+    """
+    delta = {}
+    for name, value in after.items():
+        base = name.split("{", 1)[0]
+        if not base.startswith(prefixes) or base.endswith("_bucket"):
+            continue
+        if base.endswith(("_total", "_sum", "_count")):
+            delta[name] = round(value - before.get(name, 0.0), 6)
+        else:
+            delta[name] = value
+    return delta
+
+# --------------------------------------------------
+# Load generation
+# --------------------------------------------------
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = defaultdict(int)
+        self.exceptions = defaultdict(int)
+        self.bytes_sent = 0
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        total = len(latencies) + sum(self.exceptions.values())
+        failed = sum(n for code, n in self.statuses.items() if code >= 400)
+        failed += sum(self.exceptions.values())
+
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        for latency in latencies:
+            histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        def percentile(q):
+            if not latencies:
+                return None
+            index = min(int(q / 100.0 * len(latencies)), len(latencies) - 1)
+            return round(latencies[index] * 1000.0, 2)
+
+        return {
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "status_codes": {str(code): n for code, n in sorted(self.statuses.items())},
+            "exceptions": dict(self.exceptions),
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000.0, 2) if latencies else None,
+                "p50": percentile(50),
+                "p90": percentile(90),
+                "p99": percentile(99),
+                "max": round(latencies[-1] * 1000.0, 2) if latencies else None,
+            },
+            "latency_histogram": {
+                ("+Inf" if i == len(LATENCY_BUCKETS) else str(LATENCY_BUCKETS[i])): n
+                for i, n in enumerate(histogram)
+            },
+            "upload_mb": round(self.bytes_sent / 2**20, 2),
+        }
+
+
+async def wait_until_ready(transport, timeout: float = 300.0, interval: float = 1.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            status, _ = await transport.request("GET", "/ready", {})
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(interval)
+    raise TimeoutError("Server did not become ready")
+
+
+async def scrape_metrics(transport) -> dict:
+    try:
+        status, body = await transport.request("GET", "/metrics", {})
+    except OSError:
+        return {}
+    return parse_prometheus(body.decode()) if status == 200 else {}
+
+
+async def run_load(
+    transport,
+    payloads: list,
+    mix: dict,
+    concurrency: int,
+    duration: float,
+    rate: float | None = None,
+    seed: int = 0
+) -> dict:
+    """
+    Sends uploads for `duration` seconds.
+
+    Without `rate`, `concurrency` workers send back-to-back (closed
+    loop). With `rate` (requests/sec), arrivals follow a Poisson
+    process and at most `concurrency` requests are in flight; requests
+    waiting for a free slot count that wait in their latency.
+    """
+    rng = random.Random(seed)
+    paths, weights = list(mix), list(mix.values())
+    stats = defaultdict(EndpointStats)
+
+    async def send_one(scheduled: float):
+        path = rng.choices(paths, weights)[0]
+        filename, content_type, data = rng.choice(payloads)
+        body, multipart_type = encode_multipart(UPLOAD_FIELDS[path], filename, content_type, data)
+
+        endpoint = stats[path]
+        endpoint.bytes_sent += len(body)
+        try:
+            status, _ = await transport.request(
+                "POST", path, {"Content-Type": multipart_type}, body
+            )
+        except Exception as e:
+            endpoint.exceptions[type(e).__name__] += 1
+            return
+        endpoint.statuses[status] += 1
+        endpoint.latencies.append(time.perf_counter() - scheduled)
+
+    start = time.perf_counter()
+    end = start + duration
+
+    if rate is None:
+        async def worker():
+            while time.perf_counter() < end:
+                await send_one(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        slots = asyncio.Semaphore(concurrency)
+        tasks = []
+
+        async def scheduled_send(scheduled):
+            async with slots:
+                await send_one(scheduled)
+
+        next_arrival = start
+        while next_arrival < end:
+            await asyncio.sleep(max(next_arrival - time.perf_counter(), 0))
+            tasks.append(asyncio.create_task(scheduled_send(next_arrival)))
+            next_arrival += rng.expovariate(rate)
+
+        await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - start
+
+    overall = EndpointStats()
+    for endpoint in stats.values():
+        overall.latencies += endpoint.latencies
+        overall.bytes_sent += endpoint.bytes_sent
+        for code, n in endpoint.statuses.items():
+            overall.statuses[code] += n
+        for name, n in endpoint.exceptions.items():
+            overall.exceptions[name] += n
+
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "overall": overall.summary(elapsed),
+        "endpoints": {path: s.summary(elapsed) for path, s in sorted(stats.items())},
+    }
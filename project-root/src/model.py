@@ -3,17 +3,29 @@
 from tensorflow import keras
 from tensorflow.keras import layers
 
+from src.preprocessing import get_normalization_layer
 
-def build_base_model(img_size: int, trainable: bool = False):
+
+def build_base_model(
+    img_size: int,
+    trainable: bool = False,
+    weights: str | None = "imagenet",
+    alpha: float = 1.0
+):
     """
     Builds the MobileNetV2 base model.
     Expects input images already normalized to [-1, 1].
+
+    Pass weights=None when trained weights are loaded afterwards
+    (skips the ImageNet download). `alpha` is the width multiplier
+    (ImageNet weights exist for 0.35, 0.5, 0.75, 1.0, 1.3 and 1.4).
     """
 
     base_model = keras.applications.MobileNetV2(
         input_shape=(img_size, img_size, 3),
+        alpha=alpha,
         include_top=False,
-        weights="imagenet"
+        weights=weights
     )
 
     base_model.trainable = trainable
@@ -25,20 +37,26 @@ def build_classification_model(
     num_classes: int,
     base_model: keras.Model,
     data_augmentation: keras.Model | None = None,
-    dropout_rate: float = 0.2
+    dropout_rate: float = 0.2,
+    include_normalization: bool = False
 ):
     """
     Builds the full classification model.
 
     IMPORTANT:
-    - This model assumes inputs are already normalized to [-1, 1]
-    - No preprocessing happens inside the model
+    - By default the model assumes inputs are already normalized to [-1, 1]
+    - With include_normalization=True it takes raw uint8 [0, 255] images
+      and normalizes inside the graph (4x less input data to copy)
     """
 
     base_model.trainable = False
 
-    inputs = keras.Input(shape=(img_size, img_size, 3))
-    x = inputs
+    if include_normalization:
+        inputs = keras.Input(shape=(img_size, img_size, 3), dtype="uint8")
+        x = get_normalization_layer()(inputs)
+    else:
+        inputs = keras.Input(shape=(img_size, img_size, 3))
+        x = inputs
 
     # Optional augmentation (TRAINING ONLY)
     if data_augmentation is not None:
@@ -50,7 +68,9 @@ def build_classification_model(
     # Classification head
     x = layers.GlobalAveragePooling2D()(x)
     x = layers.Dropout(dropout_rate)(x)
-    outputs = layers.Dense(num_classes, activation="softmax")(x)
+
+    # Softmax always in float32 (numerically stable under mixed precision)
+    outputs = layers.Dense(num_classes, activation="softmax", dtype="float32")(x)
 
     model = keras.Model(
         inputs=inputs,
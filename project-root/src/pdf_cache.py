@@ -0,0 +1,146 @@
+# src/pdf_cache.py
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+
+class PDFDiskCache:
+    """
+    Bounded on-disk cache of rendered PDF reports.
+
+    Files are named by a hash of the cache key (image hash + model
+    version). Reads refresh a file's mtime, so eviction is least
+    recently used. Limits are enforced on every write (size) and by a
+    periodic janitor (age, and files left by other processes).
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.pdf")
+
+    def _scan(self):
+        """
+        Yields (path, size, mtime) for every cached PDF.
+        """
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pdf"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        data = None
+        try:
+            # Expired files are left for the janitor
+            if time.time() - os.path.getmtime(path) <= self.max_age:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+        except FileNotFoundError:
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        # Readers never see a partially written file
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            try:
+                self._total_bytes -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self.enforce_limits()
+
+    def enforce_limits(self) -> dict:
+        """
+        Deletes expired files, then the least recently used ones until
+        the cache fits in max_bytes.
+        """
+        with self._lock:
+            now = time.time()
+            files = sorted(self._scan(), key=lambda f: f[2])
+
+            kept, removed = [], 0
+            for path, size, mtime in files:
+                if now - mtime > self.max_age:
+                    removed += self._remove(path)
+                else:
+                    kept.append((path, size))
+
+            total = sum(size for _, size in kept)
+            for path, size in kept:
+                if total <= self.max_bytes:
+                    break
+                removed += self._remove(path)
+                total -= size
+
+            self._total_bytes = total
+            self.evictions += removed
+            return self._stats_locked()
+
+    def _remove(self, path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def _stats_locked(self) -> dict:
+        return {
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._stats_locked()
+
+
+async def run_janitor(cache: PDFDiskCache, interval_seconds: float):
+    """
+    Enforces the cache limits every `interval_seconds` until cancelled.
+    The directory scan runs in a thread, off the event loop.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(cache.enforce_limits)
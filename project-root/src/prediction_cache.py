@@ -0,0 +1,158 @@
+# src/prediction_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_cache_key(image_bytes: bytes, model_version: str) -> str:
+    """
+    Content hash of the raw upload, scoped to the model that scored it.
+    """
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    return f"{model_version}:{digest}"
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk store so cached predictions survive restarts.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS predictions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, key: str):
+        """
+        Returns (value, expires_at), or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM predictions WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: dict, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM predictions WHERE expires_at < ?", (time.time(),)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results with a TTL.
+
+    Entries live in memory (evicting the least recently used beyond
+    `max_entries`) and, when a backend is given, are also written to
+    disk; memory misses fall back to the backend.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        backend: SQLiteCacheBackend | None = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """
+        Returns a copy of the cached result, or None.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(value)
+                del self._entries[key]
+
+        stored = self.backend.get(key) if self.backend is not None else None
+
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = stored
+            self.hits += 1
+            self._store(key, value, expires_at)
+
+        return dict(value)
+
+    def set(self, key: str, value: dict):
+        expires_at = time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._store(key, dict(value), expires_at)
+
+        if self.backend is not None:
+            self.backend.set(key, value, expires_at)
+
+    def _store(self, key: str, value: dict, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def close(self):
+        if self.backend is not None:
+            self.backend.close()
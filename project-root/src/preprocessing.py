@@ -1,21 +1,114 @@
 # src/preprocessing.py
+#
+# Single source of truth for image preprocessing. Training (tf.data),
+# the API and offline inference all decode through
+# `src.image_decode.decode_image`, so the three paths are identical:
+# - NumPy batch path: decode_image / decode_batch (no TensorFlow needed)
+# - tf.data path:     load_image_tf (same decoder via tf.numpy_function)
+# - in-graph path:    get_normalization_layer (models taking uint8 input)
 
+import numpy as np
+import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers
 from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
 
+from src.image_decode import (
+    NORMALIZE_SCALE,
+    NORMALIZE_OFFSET,
+    decode_image,
+    decode_batch
+)
 
-def get_data_augmentation():
-    return keras.Sequential(
-        [
+
+AUGMENTATION_POLICIES = ("none", "light", "standard", "strong")
+
+
+def get_data_augmentation(policy: str = "standard"):
+    """
+    Batch-level augmentation layers, applied to [0, 255] float images.
+
+    Returns None for policy "none".
+    """
+    if policy == "none":
+        return None
+
+    if policy == "light":
+        augmentation = [
+            layers.RandomFlip("horizontal"),
+            layers.RandomRotation(0.1),
+        ]
+    elif policy == "standard":
+        augmentation = [
             layers.RandomFlip("horizontal"),
             layers.RandomRotation(0.2),
-            layers.RandomContrast(0.2),
+            layers.RandomContrast(0.2, value_range=(0, 255)),
             layers.RandomZoom(0.5, 0.2),
-        ],
-        name="data_augmentation"
-    )
+        ]
+    elif policy == "strong":
+        augmentation = [
+            layers.RandomFlip("horizontal_and_vertical"),
+            layers.RandomRotation(0.3),
+            layers.RandomContrast(0.3, value_range=(0, 255)),
+            layers.RandomBrightness(0.2, value_range=(0, 255)),
+            layers.RandomTranslation(0.1, 0.1),
+            layers.RandomZoom(0.5, 0.2),
+        ]
+    else:
+        raise ValueError(
+            f"Unknown augmentation policy: {policy} (use {AUGMENTATION_POLICIES})"
+        )
+
+    return keras.Sequential(augmentation, name="data_augmentation")
 
 
 def get_preprocess_input():
     return preprocess_input
+
+
+def get_normalization_layer():
+    """
+    [0, 255] -> [-1, 1] inside the model graph.
+    """
+    return layers.Rescaling(
+        scale=float(NORMALIZE_SCALE),
+        offset=float(NORMALIZE_OFFSET),
+        name="normalization"
+    )
+
+
+def normalize_tf(image):
+    """
+    tf.data counterpart of `src.image_decode.normalize_into`.
+    """
+    image = tf.cast(image, tf.float32)
+    return image * NORMALIZE_SCALE + NORMALIZE_OFFSET
+
+
+def _decode_uint8(image_bytes, img_size):
+    out = np.empty((img_size, img_size, 3), dtype=np.uint8)
+    return decode_image(bytes(image_bytes), int(img_size), out=out)
+
+
+def load_image_tf(path, img_size: int):
+    """
+    Reads and decodes one image file inside a tf.data pipeline.
+
+    Returns uint8 (img_size, img_size, 3), produced by the same decoder
+    the API uses.
+    """
+    image = tf.numpy_function(
+        _decode_uint8,
+        [tf.io.read_file(path), img_size],
+        tf.uint8,
+        stateful=False
+    )
+    image.set_shape((img_size, img_size, 3))
+    return image
+
+
+def preprocess_batch(images: list, img_size: int, dtype=np.float32) -> np.ndarray:
+    """
+    NumPy batch path: encoded images -> (N, H, W, 3) batch.
+    """
+    return decode_batch(images, img_size, dtype)
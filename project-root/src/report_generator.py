@@ -1,12 +1,17 @@
 # src/report_generator.py
 
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem, PageBreak
+)
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
+from xml.sax.saxutils import escape
+import io
 import os
+import threading
 
 
 FONT_PATH = "assets/fonts/NotoSansDevanagari-Regular.ttf"
@@ -105,3 +110,162 @@ def generate_disease_report_pdf(
     ))
 
     doc.build(elements)
+
+
+# --------------------------------------------------
+# Report engine (fonts/styles once, rendered in memory)
+# --------------------------------------------------
+
+class ReportEngine:
+    """
+    Renders the same Hindi report as `generate_disease_report_pdf`, but:
+    - registers the font and builds the styles ONCE
+    - renders into memory and returns the PDF bytes
+    - can put many reports into one multi-page PDF
+
+    Flowables are stateful while a document is being laid out, so every
+    report (including each page of a batch) builds fresh ones.
+    """
+
+    def __init__(self, font_path: str = FONT_PATH, font_name: str = FONT_NAME):
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(
+                f"Hindi font not found at {font_path}. "
+                "Please add NotoSansDevanagari-Regular.ttf"
+            )
+
+        if font_name not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont(font_name, font_path))
+
+        self.styles = getSampleStyleSheet()
+        for style in self.styles.byName.values():
+            style.fontName = font_name
+
+    def _bullets(self, items: list, empty_text: str):
+        if not items:
+            return Paragraph(empty_text, self.styles["Normal"])
+        return ListFlowable(
+            [ListItem(Paragraph(item, self.styles["Normal"])) for item in items],
+            bulletType="bullet"
+        )
+
+    def _report_elements(
+        self,
+        predicted_class: str,
+        confidence: float,
+        disease_info_hi: dict,
+        date_str: str,
+        filename: str | None = None
+    ) -> list:
+        styles = self.styles
+        normal = styles["Normal"]
+
+        elements = [
+            Paragraph("<b>कपास रोग पहचान रिपोर्ट</b>", styles["Title"]),
+            Spacer(1, 12),
+            Paragraph(f"तारीख: {date_str}", normal),
+        ]
+        if filename:
+            elements.append(Paragraph(f"फ़ाइल: {escape(filename)}", normal))
+        elements += [
+            Spacer(1, 12),
+            Paragraph(
+                f"<b>पहचाना गया रोग / कीट:</b> {disease_info_hi.get('नाम', predicted_class)}",
+                normal
+            ),
+            Paragraph(f"<b>विश्वसनीयता:</b> {confidence * 100:.2f}%", normal),
+            Spacer(1, 12),
+            Paragraph("<b>विवरण:</b>", styles["Heading3"]),
+            Paragraph(disease_info_hi.get("विवरण", ""), normal),
+            Spacer(1, 12),
+            Paragraph("<b>उपचार के कदम:</b>", styles["Heading3"]),
+            self._bullets(
+                disease_info_hi.get("उपचार_कदम", []),
+                "कोई विशेष उपचार आवश्यक नहीं।"
+            ),
+            Spacer(1, 12),
+            Paragraph("<b>अनुशंसित कीटनाशक / दवाएँ:</b>", styles["Heading3"]),
+            self._bullets(
+                disease_info_hi.get("अनुशंसित_कीटनाशक", []),
+                "कीटनाशक की आवश्यकता नहीं है।"
+            ),
+            Spacer(1, 16),
+            Paragraph(
+                "<b>महत्वपूर्ण सूचना:</b> यह जानकारी सामान्य मार्गदर्शन हेतु है। "
+                "किसी भी दवा का उपयोग करने से पहले नजदीकी कृषि अधिकारी से सलाह अवश्य लें।",
+                styles["Italic"]
+            ),
+        ]
+        return elements
+
+    def _build(self, elements: list) -> bytes:
+        buffer = io.BytesIO()
+        SimpleDocTemplate(buffer, pagesize=A4).build(elements)
+        return buffer.getvalue()
+
+    def render(
+        self,
+        predicted_class: str,
+        confidence: float,
+        disease_info_hi: dict
+    ) -> bytes:
+        """
+        One report as PDF bytes (confidence as a fraction, 0..1).
+        """
+        date_str = datetime.now().strftime("%d-%m-%Y %H:%M")
+        return self._build(
+            self._report_elements(predicted_class, confidence, disease_info_hi, date_str)
+        )
+
+    def render_batch(self, reports: list) -> bytes:
+        """
+        One page per report, in a single PDF. Each report is a dict with
+        predicted_class, confidence, disease_info_hi and optionally
+        filename.
+        """
+        date_str = datetime.now().strftime("%d-%m-%Y %H:%M")
+
+        elements = []
+        for i, report in enumerate(reports):
+            if i:
+                elements.append(PageBreak())
+            elements += self._report_elements(
+                report["predicted_class"],
+                report["confidence"],
+                report["disease_info_hi"],
+                date_str,
+                report.get("filename")
+            )
+        return self._build(elements)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_report_engine() -> ReportEngine:
+    """
+    Process-wide engine, created on first use (also inside PDF worker
+    processes).
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ReportEngine()
+    return _engine
+
+
+def render_report_pdf(
+    predicted_class: str,
+    confidence: float,
+    disease_info_hi: dict
+) -> bytes:
+    """
+    Picklable entry point for PDF executors (threads or processes).
+    """
+    return get_report_engine().render(predicted_class, confidence, disease_info_hi)
+
+
+def render_batch_report_pdf(reports: list) -> bytes:
+    return get_report_engine().render_batch(reports)
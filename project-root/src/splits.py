@@ -0,0 +1,145 @@
+# src/splits.py
+
+import json
+import os
+import random
+
+from src.data_loader import list_image_files, load_file_dataset
+from src.dataset_cache import dataset_fingerprint, load_cached_dataset, load_manifest, MANIFEST_NAME
+
+SPLITS = ("train", "val", "test")
+
+
+def create_stratified_splits(
+    file_paths: list,
+    labels: list,
+    val_fraction: float,
+    test_fraction: float,
+    seed: int
+) -> dict:
+    """
+    Splits every class separately so each split keeps the class
+    balance. Classes with fewer than 3 images go to training only.
+    Returns {"train": [(path, label)], "val": [...], "test": [...]}.
+    """
+    by_class = {}
+    for path, label in zip(file_paths, labels):
+        by_class.setdefault(label, []).append(path)
+
+    rng = random.Random(seed)
+    splits = {name: [] for name in SPLITS}
+
+    for label in sorted(by_class):
+        paths = sorted(by_class[label])
+        rng.shuffle(paths)
+
+        n_val = round(len(paths) * val_fraction)
+        n_test = round(len(paths) * test_fraction)
+
+        # Every held-out split gets at least one image of the class only
+        # when there are enough to also leave one for training
+        if len(paths) >= 3:
+            n_val = max(1, n_val) if val_fraction > 0 else 0
+            n_test = max(1, n_test) if test_fraction > 0 else 0
+
+        # Training always keeps at least one image
+        n_val = min(n_val, len(paths) - 1)
+        n_test = min(n_test, len(paths) - 1 - n_val)
+
+        splits["val"] += [(p, label) for p in paths[:n_val]]
+        splits["test"] += [(p, label) for p in paths[n_val:n_val + n_test]]
+        splits["train"] += [(p, label) for p in paths[n_val + n_test:]]
+
+    return splits
+
+
+def get_or_create_splits(
+    data_dir: str,
+    splits_dir: str,
+    val_fraction: float = 0.15,
+    test_fraction: float = 0.15,
+    seed: int = 42
+) -> list:
+    """
+    Writes stratified train/val/test file manifests ONCE; later runs
+    reuse them so the held-out images never leak into training.
+
+    Returns the class names.
+    """
+
+    meta_path = os.path.join(splits_dir, "splits.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)["class_names"]
+
+    file_paths, labels, class_names = list_image_files(data_dir)
+    splits = create_stratified_splits(
+        file_paths, labels, val_fraction, test_fraction, seed
+    )
+
+    os.makedirs(splits_dir, exist_ok=True)
+    for name, entries in splits.items():
+        with open(os.path.join(splits_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump([{"path": p, "label": label} for p, label in entries], f, indent=1)
+
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "data_dir": data_dir,
+            "class_names": class_names,
+            "seed": seed,
+            "val_fraction": val_fraction,
+            "test_fraction": test_fraction,
+            "counts": {name: len(entries) for name, entries in splits.items()},
+        }, f, indent=2)
+
+    return class_names
+
+
+def load_split(splits_dir: str, split: str):
+    """
+    Returns (file_paths, labels, class_names) for one split.
+    """
+    with open(os.path.join(splits_dir, "splits.json"), "r", encoding="utf-8") as f:
+        class_names = json.load(f)["class_names"]
+
+    with open(os.path.join(splits_dir, f"{split}.json"), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    return [e["path"] for e in entries], [e["label"] for e in entries], class_names
+
+
+def load_split_dataset(
+    splits_dir: str,
+    split: str,
+    img_size: int,
+    batch_size: int,
+    shuffle: bool = True,
+    cache_dir: str | None = None,
+    seed: int | None = None
+):
+    """
+    Loads one split, from its TFRecord cache (cache_dir/<split>) when
+    that was built from the same files, else from the image files.
+    `seed` fixes the shuffle order (identical on every worker).
+
+    Returns (dataset, class_names, fingerprint).
+    """
+
+    file_paths, labels, class_names = load_split(splits_dir, split)
+    fingerprint = dataset_fingerprint(file_paths, labels, img_size)
+
+    if cache_dir is not None:
+        split_cache = os.path.join(cache_dir, split)
+        if (
+            os.path.exists(os.path.join(split_cache, MANIFEST_NAME))
+            and load_manifest(split_cache)["fingerprint"] == fingerprint
+        ):
+            dataset, _ = load_cached_dataset(
+                split_cache, batch_size, shuffle=shuffle, seed=seed
+            )
+            return dataset, class_names, fingerprint
+
+    dataset = load_file_dataset(
+        file_paths, labels, img_size, batch_size, shuffle=shuffle, seed=seed
+    )
+    return dataset, class_names, fingerprint
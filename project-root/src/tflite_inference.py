@@ -0,0 +1,144 @@
+# src/tflite_inference.py
+
+import threading
+import numpy as np
+
+# Same buckets as src.inference, which is not imported here because it
+# loads TensorFlow
+DEFAULT_BATCH_BUCKETS = (1, 4, 8, 16, 32)
+
+
+def _interpreter_class():
+    """
+    Prefers the standalone LiteRT / tflite-runtime packages (no full
+    TensorFlow import) and falls back to tf.lite.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def _quantize(values: np.ndarray, details: dict) -> np.ndarray:
+    dtype = details["dtype"]
+    scale, zero_point = details["quantization"]
+
+    if not np.issubdtype(dtype, np.integer) or scale == 0:
+        return values.astype(dtype, copy=False)
+
+    info = np.iinfo(dtype)
+    q = np.round(values / scale + zero_point)
+    return np.clip(q, info.min, info.max).astype(dtype)
+
+
+def _dequantize(values: np.ndarray, details: dict) -> np.ndarray:
+    scale, zero_point = details["quantization"]
+
+    if not np.issubdtype(details["dtype"], np.integer) or scale == 0:
+        return values.astype(np.float32, copy=False)
+
+    return (values.astype(np.float32) - zero_point) * scale
+
+
+class TFLiteInferenceModel:
+    """
+    TFLite backend with the same predict_batch API as InferenceModel.
+
+    Inputs are float32 images normalized to [-1, 1] (quantized int8
+    models are quantized/dequantized at the interpreter boundary), or
+    raw uint8 images for models with normalization folded in.
+    Like InferenceModel, batches are zero-padded up to fixed buckets;
+    each bucket has its own interpreter, allocated once, so a change of
+    batch size never resizes tensors. An interpreter is not
+    thread-safe, so calls on the same bucket are serialized; use
+    `num_threads` for intra-op parallelism instead.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        num_threads: int | None = None,
+        batch_buckets: tuple = DEFAULT_BATCH_BUCKETS
+    ):
+        self.model_path = model_path
+        self.batch_buckets = tuple(sorted(set(batch_buckets)))
+
+        interpreter_class = _interpreter_class()
+        self._interpreters = {}
+        for bucket in self.batch_buckets:
+            interpreter = interpreter_class(model_path=model_path, num_threads=num_threads)
+            input_details = interpreter.get_input_details()[0]
+            interpreter.resize_tensor_input(
+                input_details["index"],
+                [bucket, *input_details["shape"][1:]]
+            )
+            interpreter.allocate_tensors()
+            self._interpreters[bucket] = (
+                interpreter,
+                interpreter.get_input_details()[0],
+                interpreter.get_output_details()[0],
+                threading.Lock()
+            )
+
+        _, self._input, self._output, _ = self._interpreters[self.batch_buckets[0]]
+        self.input_shape = tuple(int(d) for d in self._input["shape"][1:])
+        self.img_size = self.input_shape[0]
+
+        # Unquantized uint8 input means normalization lives in the graph
+        scale, _ = self._input["quantization"]
+        self.input_dtype = np.dtype(
+            np.uint8 if self._input["dtype"] == np.uint8 and scale == 0 else np.float32
+        )
+
+    def warmup(self):
+        """
+        Runs every bucket once so the first real request is not slow.
+        """
+        for bucket in self.batch_buckets:
+            self.predict_batch(np.zeros((bucket, *self.input_shape), dtype=self.input_dtype))
+
+    def _bucket_for(self, batch_size: int) -> int:
+        for bucket in self.batch_buckets:
+            if batch_size <= bucket:
+                return bucket
+        return self.batch_buckets[-1]
+
+    def predict_batch(self, images: np.ndarray) -> np.ndarray:
+        """
+        Returns class probabilities of shape (N, num_classes).
+        """
+        images = np.asarray(images, dtype=self.input_dtype)
+        if len(images) == 0:
+            return np.zeros((0, self._output["shape"][-1]), dtype=np.float32)
+
+        max_bucket = self.batch_buckets[-1]
+
+        outputs = []
+        for start in range(0, len(images), max_bucket):
+            chunk = images[start:start + max_bucket]
+            n = len(chunk)
+            bucket = self._bucket_for(n)
+
+            if n < bucket:
+                pad = np.zeros((bucket - n, *chunk.shape[1:]), dtype=chunk.dtype)
+                chunk = np.concatenate([chunk, pad], axis=0)
+
+            interpreter, input_details, output_details, lock = self._interpreters[bucket]
+            with lock:
+                interpreter.set_tensor(input_details["index"], _quantize(chunk, input_details))
+                interpreter.invoke()
+                preds = interpreter.get_tensor(output_details["index"])
+
+            outputs.append(_dequantize(preds, output_details)[:n])
+
+        return np.concatenate(outputs, axis=0)
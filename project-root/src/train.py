@@ -1,30 +1,85 @@
 # src/train.py
 
 import os
+import json
+import zipfile
+import tensorflow as tf
 from tensorflow import keras
 from tqdm.keras import TqdmCallback
 
+from src.config import MODEL_CLASS_NAMES_ENTRY
 
-def compile_model(model: keras.Model, learning_rate: float):
+
+def _cpu_supports_bfloat16() -> bool:
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def configure_precision(policy: str | None) -> str:
+    """
+    Sets the global Keras dtype policy. Must run BEFORE building models.
+
+    "auto" picks mixed_bfloat16 on CPUs with native bfloat16 support,
+    mixed_float16 on GPUs, and float32 otherwise.
+    """
+    if policy is None:
+        policy = "float32"
+    elif policy == "auto":
+        if tf.config.list_physical_devices("GPU"):
+            policy = "mixed_float16"
+        elif _cpu_supports_bfloat16():
+            policy = "mixed_bfloat16"
+        else:
+            policy = "float32"
+
+    keras.mixed_precision.set_global_policy(policy)
+    return policy
+
+
+def compile_model(
+    model: keras.Model,
+    learning_rate: float,
+    jit_compile="auto",
+    loss=None,
+    metrics=None
+):
     """
     Compiles model for initial training.
+
+    `loss` / `metrics` default to sparse cross-entropy and accuracy
+    (see src.distillation for the soft-target variant).
+
+    Under mixed_float16 Keras wraps the optimizer in a
+    LossScaleOptimizer automatically (dynamic loss scaling).
     """
     model.compile(
         optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
-        loss=keras.losses.SparseCategoricalCrossentropy(),
-        metrics=["accuracy"]
+        loss=loss or keras.losses.SparseCategoricalCrossentropy(),
+        metrics=metrics or ["accuracy"],
+        jit_compile=jit_compile
     )
     return model
 
 
-def recompile_for_finetuning(model: keras.Model, learning_rate: float):
+def recompile_for_finetuning(
+    model: keras.Model,
+    learning_rate: float,
+    jit_compile="auto",
+    loss=None,
+    metrics=None
+):
     """
     Recompiles model for fine-tuning with lower learning rate.
     """
     model.compile(
         optimizer=keras.optimizers.RMSprop(learning_rate=learning_rate),
-        loss=keras.losses.SparseCategoricalCrossentropy(),
-        metrics=["accuracy"]
+        loss=loss or keras.losses.SparseCategoricalCrossentropy(),
+        metrics=metrics or ["accuracy"],
+        jit_compile=jit_compile
     )
     return model
 
@@ -33,25 +88,37 @@ def train_model(
     model: keras.Model,
     train_ds,
     epochs: int,
-    early_stopping_patience: int
+    early_stopping_patience: int,
+    callbacks: list | None = None,
+    initial_epoch: int = 0,
+    val_ds=None
 ):
     """
     Trains the model on the given dataset.
     Assumes dataset is already preprocessed and shuffled.
+
+    With `val_ds`, early stopping watches val_loss and restores the
+    weights of the best validation epoch; otherwise it falls back to
+    the training loss.
+
+    `initial_epoch` resumes an interrupted run (see src.checkpointing).
     """
 
     callbacks = [
         keras.callbacks.EarlyStopping(
-            monitor="loss",          # training-only (no val set yet)
+            monitor="val_loss" if val_ds is not None else "loss",
             patience=early_stopping_patience,
             restore_best_weights=True
         ),
-        TqdmCallback(verbose=0)
+        TqdmCallback(verbose=0),
+        *(callbacks or [])
     ]
 
     history = model.fit(
         train_ds,
+        validation_data=val_ds,
         epochs=epochs,
+        initial_epoch=initial_epoch,
         callbacks=callbacks,
         verbose=0
     )
@@ -75,3 +142,25 @@ def save_model_weights(
     path = os.path.join(save_dir, filename)
     model.save_weights(path)
     return path
+
+
+def save_full_model(
+    model: keras.Model,
+    save_dir: str,
+    filename: str,
+    class_names: list
+):
+    """
+    Saves architecture + weights as one `.keras` archive with the class
+    names embedded, so serving never rebuilds MobileNetV2 or downloads
+    ImageNet weights.
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    path = os.path.join(save_dir, filename)
+    model.save(path)
+
+    # Keras ignores unknown archive entries when loading
+    with zipfile.ZipFile(path, "a") as archive:
+        archive.writestr(MODEL_CLASS_NAMES_ENTRY, json.dumps(class_names))
+
+    return path
@@ -1,25 +1,46 @@
 # train_runner.py
 
 import json
+import os
 from src.config import (
     IMG_SIZE,
     BATCH_SIZE,
     LEARNING_RATE,
     EPOCHS,
     EARLY_STOPPING_PATIENCE,
-    FINE_TUNE_AT
+    FINE_TUNE_AT,
+    FOLD_NORMALIZATION,
+    DATASET_CACHE_DIR,
+    FEATURE_CACHE_DIR,
+    USE_FEATURE_CACHE,
+    MIXED_PRECISION,
+    JIT_COMPILE,
+    AUGMENTATION_POLICY,
+    CHECKPOINT_DIR,
+    CHECKPOINT_EVERY_EPOCHS,
+    CHECKPOINT_ASYNC,
+    SPLITS_DIR,
+    VAL_FRACTION,
+    TEST_FRACTION,
+    SPLIT_SEED,
+    EVAL_BATCH_SIZE
 )
-from src.data_loader import load_image_dataset, prepare_dataset
+from src.data_loader import prepare_dataset
+from src.splits import get_or_create_splits, load_split_dataset
+from src.feature_cache import get_or_compute_features, train_head_on_features
+from src.checkpointing import PhaseCheckpointer
 from src.model import (
     build_base_model,
     build_classification_model,
     enable_fine_tuning
 )
 from src.train import (
+    configure_precision,
     compile_model,
     recompile_for_finetuning,
     train_model,
-    save_model_weights
+    save_model_weights,
+    save_full_model
 )
 
 # --------------------------------------------------
@@ -34,14 +55,53 @@ ARTIFACTS_DIR = "artifacts"
 # --------------------------------------------------
 
 print("Loading dataset...")
-train_ds, class_names = load_image_dataset(
+
+# Stratified train/val/test manifests are written on the first run and
+# reused afterwards, so held-out images never leak into training
+get_or_create_splits(
     DATA_DIR,
+    SPLITS_DIR,
+    val_fraction=VAL_FRACTION,
+    test_fraction=TEST_FRACTION,
+    seed=SPLIT_SEED
+)
+
+# Pre-decoded TFRecords (python build_dataset_cache.py) skip JPEG
+# decoding on every epoch; falls back to the image files otherwise
+train_ds, class_names, dataset_fingerprint = load_split_dataset(
+    SPLITS_DIR,
+    "train",
     IMG_SIZE,
     BATCH_SIZE,
-    shuffle=True
+    shuffle=True,
+    cache_dir=DATASET_CACHE_DIR
 )
 
-train_ds = prepare_dataset(train_ds, training=True)
+# Augmentation runs as a parallel tf.data stage; the model graph
+# stays augmentation-free for inference
+train_ds = prepare_dataset(
+    train_ds,
+    training=True,
+    normalize=not FOLD_NORMALIZATION,
+    augmentation_policy=AUGMENTATION_POLICY
+)
+
+# Validation: fixed order, large batches, kept in memory after the
+# first epoch
+val_ds, _, val_fingerprint = load_split_dataset(
+    SPLITS_DIR,
+    "val",
+    IMG_SIZE,
+    EVAL_BATCH_SIZE,
+    shuffle=False,
+    cache_dir=DATASET_CACHE_DIR
+)
+val_ds = prepare_dataset(
+    val_ds,
+    training=False,
+    normalize=not FOLD_NORMALIZATION,
+    cache=True
+)
 
 print("Class order (CRITICAL):", class_names)
 
@@ -51,50 +111,173 @@ print("Class order (CRITICAL):", class_names)
 
 print("Building model...")
 
+# Dtype policy must be set before any layer is created
+print("Precision policy:", configure_precision(MIXED_PRECISION))
+
 base_model = build_base_model(IMG_SIZE)
 
 model = build_classification_model(
     img_size=IMG_SIZE,
     num_classes=len(class_names),
     base_model=base_model,
-    data_augmentation=None
+    data_augmentation=None,
+    include_normalization=FOLD_NORMALIZATION
 )
 
+# --------------------------------------------------
+# Checkpoints (resume automatically after a killed run)
+# --------------------------------------------------
+
+# Scoped by dataset fingerprint so a changed dataset starts fresh;
+# delete the directory to force retraining from scratch
+run_checkpoint_dir = os.path.join(CHECKPOINT_DIR, dataset_fingerprint)
+print("Checkpoints:", run_checkpoint_dir)
+
 # --------------------------------------------------
 # Initial training
 # --------------------------------------------------
 
-print("Starting initial training...")
+if USE_FEATURE_CACHE:
+    # Cached-feature training is fast: checkpoint the phase only on
+    # completion (model weights; the head optimizer is not resumed)
+    initial_ckpt = PhaseCheckpointer(
+        run_checkpoint_dir, "initial", model, async_save=CHECKPOINT_ASYNC
+    )
+else:
+    model = compile_model(model, LEARNING_RATE, jit_compile=JIT_COMPILE)
+    initial_ckpt = PhaseCheckpointer(
+        run_checkpoint_dir, "initial", model, model.optimizer,
+        async_save=CHECKPOINT_ASYNC
+    )
 
-model = compile_model(model, LEARNING_RATE)
+initial_epoch = initial_ckpt.restore()
 
-history = train_model(
-    model,
-    train_ds,
-    epochs=EPOCHS,
-    early_stopping_patience=EARLY_STOPPING_PATIENCE
-)
+if initial_ckpt.is_completed:
+    print("Initial training already completed (restored from checkpoint).")
+
+elif USE_FEATURE_CACHE:
+    print("Starting initial training...")
+
+    # Backbone is frozen in this phase: embed every image once, then
+    # train only the Dense head on the cached embeddings
+    feature_ds, _, _ = load_split_dataset(
+        SPLITS_DIR,
+        "train",
+        IMG_SIZE,
+        EVAL_BATCH_SIZE,
+        shuffle=False,
+        cache_dir=DATASET_CACHE_DIR
+    )
+    feature_ds = prepare_dataset(
+        feature_ds,
+        training=False,
+        normalize=not FOLD_NORMALIZATION
+    )
+
+    features, labels = get_or_compute_features(
+        model,
+        base_model,
+        feature_ds,
+        FEATURE_CACHE_DIR,
+        dataset_fingerprint
+    )
+    val_features, val_labels = get_or_compute_features(
+        model,
+        base_model,
+        val_ds,
+        FEATURE_CACHE_DIR,
+        val_fingerprint
+    )
+
+    history = train_head_on_features(
+        model,
+        features,
+        labels,
+        learning_rate=LEARNING_RATE,
+        batch_size=BATCH_SIZE,
+        epochs=EPOCHS,
+        early_stopping_patience=EARLY_STOPPING_PATIENCE,
+        jit_compile=JIT_COMPILE,
+        val_features=val_features,
+        val_labels=val_labels
+    )
+    initial_ckpt.save(EPOCHS, completed=True)
+
+else:
+    print(f"Starting initial training at epoch {initial_epoch}...")
+
+    history = train_model(
+        model,
+        train_ds,
+        epochs=EPOCHS,
+        early_stopping_patience=EARLY_STOPPING_PATIENCE,
+        callbacks=[initial_ckpt.callback(CHECKPOINT_EVERY_EPOCHS)],
+        initial_epoch=initial_epoch,
+        val_ds=val_ds
+    )
+    initial_ckpt.save(EPOCHS, completed=True)
 
 # --------------------------------------------------
 # Fine-tuning (OPTIONAL BUT RECOMMENDED)
 # --------------------------------------------------
 
-print("Starting fine-tuning...")
-
 enable_fine_tuning(base_model, FINE_TUNE_AT)
 
 model = recompile_for_finetuning(
     model,
-    LEARNING_RATE / 10
+    LEARNING_RATE / 10,
+    jit_compile=JIT_COMPILE
 )
 
-history_finetune = train_model(
-    model,
-    train_ds,
-    epochs=EPOCHS,
-    early_stopping_patience=EARLY_STOPPING_PATIENCE
+finetune_ckpt = PhaseCheckpointer(
+    run_checkpoint_dir, "finetune", model, model.optimizer,
+    async_save=CHECKPOINT_ASYNC
+)
+finetune_epoch = finetune_ckpt.restore()
+
+if finetune_ckpt.is_completed:
+    print("Fine-tuning already completed (restored from checkpoint).")
+else:
+    print(f"Starting fine-tuning at epoch {finetune_epoch}...")
+
+    history_finetune = train_model(
+        model,
+        train_ds,
+        epochs=EPOCHS,
+        early_stopping_patience=EARLY_STOPPING_PATIENCE,
+        callbacks=[finetune_ckpt.callback(CHECKPOINT_EVERY_EPOCHS)],
+        initial_epoch=finetune_epoch,
+        val_ds=val_ds
+    )
+    finetune_ckpt.save(EPOCHS, completed=True)
+
+# Make sure background checkpoint writes have finished
+initial_ckpt.sync()
+finetune_ckpt.sync()
+
+# --------------------------------------------------
+# Held-out evaluation
+# --------------------------------------------------
+
+test_ds, _, _ = load_split_dataset(
+    SPLITS_DIR,
+    "test",
+    IMG_SIZE,
+    EVAL_BATCH_SIZE,
+    shuffle=False,
+    cache_dir=DATASET_CACHE_DIR
+)
+test_ds = prepare_dataset(
+    test_ds,
+    training=False,
+    normalize=not FOLD_NORMALIZATION
 )
 
+val_loss, val_accuracy = model.evaluate(val_ds, verbose=0)
+test_loss, test_accuracy = model.evaluate(test_ds, verbose=0)
+print(f"Validation: loss={val_loss:.4f} accuracy={val_accuracy:.4f}")
+print(f"Test:       loss={test_loss:.4f} accuracy={test_accuracy:.4f}")
+
 # --------------------------------------------------
 # Save artifacts
 # --------------------------------------------------
@@ -110,6 +293,15 @@ weights_path = save_model_weights(
 with open(f"{ARTIFACTS_DIR}/class_names.json", "w") as f:
     json.dump(class_names, f)
 
+# Self-contained artifact used by the API (no rebuild, no ImageNet fetch)
+model_path = save_full_model(
+    model,
+    ARTIFACTS_DIR,
+    "cotton_disease_classifier.keras",
+    class_names
+)
+
 print("Training complete.")
 print("Weights saved at:", weights_path)
+print("Full model saved at:", model_path)
 print("Class names saved.")